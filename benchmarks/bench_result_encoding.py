@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark pg_query result encodings: payload bytes and encode time per format.
+
+Usage (from local-mcp repo root):
+  PYTHONPATH=. python benchmarks/bench_result_encoding.py [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from src.postgres.encoding import encode_rows
+
+FORMATS = ("json", "columns", "csv", "jsonl")
+
+
+def _narrow(n: int = 1000) -> list[dict]:
+    return [{"id": i, "status": "active" if i % 3 else "disabled", "count": i * 7} for i in range(n)]
+
+
+def _wide(n: int = 200, width: int = 40) -> list[dict]:
+    return [{f"column_{c:02d}": (i * c if c % 2 else f"value-{i}-{c}") for c in range(width)} for i in range(n)]
+
+
+def _typed(n: int = 500) -> list[dict]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": uuid.UUID(int=i),
+            "created_at": start + timedelta(minutes=i),
+            "amount": Decimal(i) / 100,
+            "currency": "THB",
+            "merchant_id": i % 50,
+            "note": None,
+        }
+        for i in range(n)
+    ]
+
+
+def _text_heavy(n: int = 200) -> list[dict]:
+    return [{"id": i, "payload": "lorem ipsum dolor sit amet " * 20, "tag": f"t{i % 10}"} for i in range(n)]
+
+
+SHAPES = {
+    "narrow (3 cols x 1000)": _narrow,
+    "wide (40 cols x 200)": _wide,
+    "typed (6 cols x 500)": _typed,
+    "text-heavy (3 cols x 200)": _text_heavy,
+}
+
+
+def _time_ms(rows: list[dict], fmt: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode_rows(rows, fmt)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="encode runs per shape/format")
+    args = parser.parse_args()
+
+    print(f"{'shape':<28}{'format':<10}{'bytes':>10}{'vs json':>9}{'median ms':>11}")
+    for shape, build in SHAPES.items():
+        rows = build()
+        baseline = len(encode_rows(rows, "json").encode())
+        for fmt in FORMATS:
+            size = len(encode_rows(rows, fmt).encode())
+            print(
+                f"{shape:<28}{fmt:<10}{size:>10}{size / baseline:>8.2f}x"
+                f"{_time_ms(rows, fmt, args.repeat):>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
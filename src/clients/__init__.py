@@ -3,7 +3,7 @@ from src.clients.elasticsearch import ElasticsearchClient
 from src.clients.kafka import KafkaClient
 from src.clients.obsidian import ObsidianClient
 from src.clients.observability import LokiClient, TempoClient
-from src.clients.postgres import PostgresClient
+from src.clients.postgres import PostgresClient, PostgresPoolManager
 from src.clients.redis import RedisClient
 
 __all__ = [
@@ -15,6 +15,7 @@ __all__ = [
     "LokiClient",
     "ObsidianClient",
     "PostgresClient",
+    "PostgresPoolManager",
     "RedisClient",
     "TempoClient",
 ]
@@ -1,44 +1,678 @@
-import asyncpg
+import asyncio
+import gzip
+import itertools
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
 from urllib.parse import urlparse
 
+import asyncpg
+
+from src.config import PostgresHostSettings
+from src.postgres.catalog import SchemaCache, SchemaSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PoolEntry:
+    pool: asyncpg.Pool
+    max_size: int
+    # None for pools of prewarmed hosts, which are kept open however long they sit idle.
+    idle_timeout_s: float | None
+    last_used: float
+    acquires: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+    connect_s: float = 0.0
+    probes: int = 0
+    probe_failures: int = 0
+    last_probe_s: float | None = None
+
+
+def _in_use(pool: asyncpg.Pool) -> int:
+    return pool.get_size() - pool.get_idle_size()
+
+
+async def _read_capped(
+    conn: asyncpg.Connection, query: str, args: tuple, max_rows: int, max_bytes: int
+) -> tuple[list[dict], str | None]:
+    rows: list[dict] = []
+    size = 0
+    truncated_reason = None
+    cursor = conn.cursor(query, *args, prefetch=min(max_rows + 1, 100))
+    async for record in cursor:
+        if len(rows) >= max_rows:
+            truncated_reason = "max_rows"
+            break
+        row = dict(record)
+        size += len(json.dumps(row, default=str))
+        if size > max_bytes:
+            truncated_reason = "max_bytes"
+            break
+        rows.append(row)
+    return rows, truncated_reason
+
+
+class PostgresPoolManager:
+    """
+    Shared owner of asyncpg pools for every PostgresClient.
+
+    Pools are keyed by (client name, database) and created single-flight, so
+    concurrent first calls for the same database await one pool instead of each
+    creating their own. The sum of every pool's max_size is capped at
+    `max_total_connections`; pools idle for longer than their host's idle timeout
+    are closed, and least-recently-used idle pools are evicted to make room when
+    the cap is reached. Pools of prewarmed hosts are exempt from the idle timeout,
+    both for the pool and for its connections, so they stay warm until the cap
+    forces them out. `maintain()` runs the idle eviction and a cheap liveness
+    probe of every pool on an interval, recycling the connections of pools that
+    fail it.
+    """
+
+    def __init__(self, max_total_connections: int = 50):
+        self._max_total = max_total_connections
+        self._entries: dict[tuple[str, str], _PoolEntry] = {}
+        self._pending: dict[tuple[str, str], asyncio.Future] = {}
+        self._reserved: dict[tuple[str, str], int] = {}
+
+    @property
+    def max_total_connections(self) -> int:
+        return self._max_total
+
+    def _committed(self) -> int:
+        return sum(e.max_size for e in self._entries.values()) + sum(self._reserved.values())
+
+    async def get_pool(
+        self,
+        key: tuple[str, str],
+        connect_kwargs: dict,
+        settings: PostgresHostSettings,
+    ) -> asyncpg.Pool:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+            return entry.pool
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._create(key, connect_kwargs, settings))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Shield so one caller going away does not abort creation for the others.
+        return await asyncio.shield(pending)
+
+    async def _create(
+        self,
+        key: tuple[str, str],
+        connect_kwargs: dict,
+        settings: PostgresHostSettings,
+    ) -> asyncpg.Pool:
+        await self.evict_idle()
+        wanted = settings.pool_max_size
+        if self._max_total - self._committed() < wanted:
+            await self._evict_lru(wanted - (self._max_total - self._committed()))
+        max_size = min(wanted, self._max_total - self._committed())
+        if max_size < max(settings.pool_min_size, 1):
+            raise RuntimeError(
+                f"PostgreSQL connection budget exhausted ({self._max_total} connections "
+                f"in use across all hosts); cannot open a pool for {key[0]}/{key[1]}."
+            )
+
+        self._reserved[key] = max_size
+        idle_timeout_s = None if settings.prewarm else settings.pool_idle_timeout_s
+        started = time.perf_counter()
+        try:
+            pool = await asyncpg.create_pool(
+                **connect_kwargs,
+                min_size=min(settings.pool_min_size, max_size),
+                max_size=max_size,
+                max_inactive_connection_lifetime=idle_timeout_s or 0,
+            )
+        finally:
+            self._reserved.pop(key, None)
+        self._entries[key] = _PoolEntry(
+            pool=pool,
+            max_size=max_size,
+            idle_timeout_s=idle_timeout_s,
+            last_used=time.monotonic(),
+            connect_s=time.perf_counter() - started,
+        )
+        return pool
+
+    async def _close_entry(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            await entry.pool.close()
+
+    async def evict_idle(self) -> list[tuple[str, str]]:
+        """Close pools with no checked-out connections that have outlived their idle timeout."""
+        now = time.monotonic()
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if entry.idle_timeout_s is not None
+            and now - entry.last_used > entry.idle_timeout_s
+            and _in_use(entry.pool) == 0
+        ]
+        for key in expired:
+            await self._close_entry(key)
+        return expired
+
+    async def _evict_lru(self, needed: int) -> None:
+        idle = sorted(
+            (entry.last_used, key)
+            for key, entry in self._entries.items()
+            if _in_use(entry.pool) == 0
+        )
+        freed = 0
+        for _, key in idle:
+            if freed >= needed:
+                break
+            freed += self._entries[key].max_size
+            await self._close_entry(key)
+
+    async def probe(self, timeout_s: float = 5.0) -> dict[tuple[str, str], float | None]:
+        """
+        Run `SELECT 1` on an idle connection of every pool.
+
+        Pools with no idle connection are skipped, since their connections are in
+        use. A pool whose probe fails or times out has all its connections expired
+        so the next acquire reconnects instead of handing out a dead socket. The
+        probe bypasses `record_acquire`, so it does not keep idle pools alive.
+
+        Returns:
+            {pool key: probe latency in seconds, or None if the probe failed}.
+        """
+        results: dict[tuple[str, str], float | None] = {}
+        for key, entry in list(self._entries.items()):
+            if entry.pool.get_idle_size() == 0:
+                continue
+            entry.probes += 1
+            started = time.perf_counter()
+            try:
+                async with entry.pool.acquire(timeout=timeout_s) as conn:
+                    await conn.fetchval("SELECT 1", timeout=timeout_s)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                entry.probe_failures += 1
+                entry.last_probe_s = None
+                await entry.pool.expire_connections()
+                results[key] = None
+                continue
+            entry.last_probe_s = time.perf_counter() - started
+            results[key] = entry.last_probe_s
+        return results
+
+    async def maintain(self, interval_s: float, timeout_s: float = 5.0) -> None:
+        """
+        Evict idle pools and probe the remaining ones every `interval_s` seconds, until cancelled.
+
+        A failing round is logged and skipped; the loop keeps going.
+        """
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await self.evict_idle()
+                await self.probe(timeout_s)
+            except Exception:
+                logger.exception("PostgreSQL pool maintenance round failed")
+
+    def record_acquire(self, key: tuple[str, str], wait_s: float) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.last_used = time.monotonic()
+        entry.acquires += 1
+        entry.total_wait_s += wait_s
+        entry.max_wait_s = max(entry.max_wait_s, wait_s)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        pools = []
+        for (name, db), entry in sorted(self._entries.items()):
+            pool = entry.pool
+            pools.append(
+                {
+                    "host": name,
+                    "db": db,
+                    "size": pool.get_size(),
+                    "idle": pool.get_idle_size(),
+                    "in_use": _in_use(pool),
+                    "min_size": pool.get_min_size(),
+                    "max_size": pool.get_max_size(),
+                    "acquires": entry.acquires,
+                    "avg_acquire_wait_ms": round(entry.total_wait_s / entry.acquires * 1000, 3)
+                    if entry.acquires
+                    else 0.0,
+                    "max_acquire_wait_ms": round(entry.max_wait_s * 1000, 3),
+                    "idle_for_s": round(now - entry.last_used, 1),
+                    "connect_ms": round(entry.connect_s * 1000, 3),
+                    "probes": entry.probes,
+                    "probe_failures": entry.probe_failures,
+                    "last_probe_ms": None
+                    if entry.last_probe_s is None
+                    else round(entry.last_probe_s * 1000, 3),
+                }
+            )
+        return {
+            "total_connections": sum(p["size"] for p in pools),
+            "reserved_connections": self._committed(),
+            "max_total_connections": self._max_total,
+            "pools": pools,
+        }
+
+    async def close(self, name: str | None = None) -> None:
+        """Close every pool, or only the pools owned by one client name."""
+        for key in [k for k in self._entries if name is None or k[0] == name]:
+            await self._close_entry(key)
+
+
+# Replication lag of a standby: zero when its WAL receiver is streaming and
+# everything received has been replayed, otherwise the age of the last replayed
+# transaction. A standby without a streaming receiver stops receiving WAL while
+# replay catches up, so it is reported as infinitely behind. Roles without
+# pg_read_all_stats see a NULL status and only get the replay-age estimate.
+# 0 on a primary.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN r.pid IS NULL OR r.status <> 'streaming' THEN 'Infinity'
+    WHEN r.status = 'streaming' AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+END::float8 AS lag_s
+FROM (SELECT 1) AS one
+LEFT JOIN pg_stat_wal_receiver r ON true
+"""
+
+# How long a measured replica lag is trusted before it is measured again, and
+# how long an unreachable replica is left alone before it is tried again.
+REPLICA_LAG_TTL_S = 5.0
+REPLICA_UNREACHABLE_BACKOFF_S = 30.0
+# Bounds the whole measurement: opening the replica pool, acquiring and querying.
+REPLICA_LAG_TIMEOUT_S = 2.0
+
 
 class PostgresClient:
-    """Async PostgreSQL client using asyncpg with fixed connection params."""
+    """
+    Async PostgreSQL client using asyncpg with fixed connection params.
 
-    def __init__(self, url: str):
+    With replica URLs, read-only transactions are spread round-robin over the
+    replicas whose replication lag is within the host's replica_max_lag_s and
+    fall back to the primary when none is; `primary=True` pins a read to the
+    primary. Lag is measured with pg_last_xact_replay_timestamp() and cached for
+    a few seconds. Writes always go to the primary.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        name: str = "",
+        settings: PostgresHostSettings | None = None,
+        pool_manager: PostgresPoolManager | None = None,
+        replica_urls: list[str] | None = None,
+    ):
         parsed = urlparse(url)
         self._host = parsed.hostname
         self._port = parsed.port or 5432
         self._user = parsed.username
         self._password = parsed.password
         self._default_database = parsed.path.lstrip('/') if parsed.path else 'postgres'
-        self._pools: dict[str, asyncpg.Pool] = {}
+        self._name = name or f"{self._user}@{self._host}:{self._port}"
+        self._settings = settings or PostgresHostSettings()
+        self._pool_manager = pool_manager or PostgresPoolManager()
+        self._schema_cache = SchemaCache(
+            self._settings.schema_cache_ttl_s, self._settings.schema_cache_max_age_s
+        )
+        # Outcome counters for read-only queries: completed, timeouts, cancellations,
+        # plus how many of them were served by a replica.
+        self.metrics: Counter[str] = Counter()
+        self._replicas = [
+            PostgresClient(
+                replica_url,
+                name=f"{self._name}/replica{i}",
+                settings=self._settings,
+                pool_manager=self._pool_manager,
+            )
+            for i, replica_url in enumerate(replica_urls or [], start=1)
+        ]
+        # Replica index -> (last measured lag, when it is due to be measured again).
+        self._replica_lag: dict[int, tuple[float, float]] = {}
+        self._replica_turn = itertools.count()
+
+    def _pool_key(self, database: str | None) -> tuple[str, str]:
+        return (self._name, database or self._default_database)
+
+    def _connect_kwargs(self, database: str | None) -> dict:
+        return {
+            "host": self._host,
+            "port": self._port,
+            "user": self._user,
+            "password": self._password,
+            "database": database or self._default_database,
+        }
 
     async def _get_pool(self, database: str | None = None) -> asyncpg.Pool:
-        db = database or self._default_database
-        if db not in self._pools:
-            self._pools[db] = await asyncpg.create_pool(
-                host=self._host,
-                port=self._port,
-                user=self._user,
-                password=self._password,
-                database=db,
-                min_size=1,
-                max_size=5
-            )
-        return self._pools[db]
+        return await self._pool_manager.get_pool(
+            self._pool_key(database), self._connect_kwargs(database), self._settings
+        )
 
-    async def fetch(self, database: str | None = None, query: str = "", *args) -> list[dict]:
+    @asynccontextmanager
+    async def _acquire(self, database: str | None = None):
+        """Check out a pooled connection, recording how long the acquire waited."""
         pool = await self._get_pool(database)
+        started = time.perf_counter()
         async with pool.acquire() as conn:
-            async with conn.transaction(readonly=True):
-                rows = await conn.fetch(query, *args)
+            self._pool_manager.record_acquire(self._pool_key(database), time.perf_counter() - started)
+            yield conn
+
+    async def _measure_lag(self, index: int, database: str | None) -> float:
+        async def measure() -> float:
+            async with self._replicas[index]._acquire(database) as conn:
+                return await conn.fetchval(REPLICA_LAG_SQL)
+
+        try:
+            lag = await asyncio.wait_for(measure(), REPLICA_LAG_TIMEOUT_S)
+            retry_in = REPLICA_LAG_TTL_S
+        except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError, RuntimeError):
+            lag = float("inf")
+            retry_in = REPLICA_UNREACHABLE_BACKOFF_S
+        self._replica_lag[index] = (lag, time.monotonic() + retry_in)
+        return lag
+
+    async def _reader(self, database: str | None = None) -> "PostgresClient":
+        """The replica to serve the next read, or this client if no replica is within the lag limit."""
+        if not self._replicas:
+            return self
+        now = time.monotonic()
+        stale = [
+            i
+            for i in range(len(self._replicas))
+            if now >= self._replica_lag.get(i, (0.0, float("-inf")))[1]
+        ]
+        if stale:
+            await asyncio.gather(*(self._measure_lag(i, database) for i in stale))
+        eligible = [
+            i
+            for i in range(len(self._replicas))
+            if self._replica_lag[i][0] <= self._settings.replica_max_lag_s
+        ]
+        if not eligible:
+            return self
+        return self._replicas[eligible[next(self._replica_turn) % len(eligible)]]
+
+    def replica_status(self) -> list[dict]:
+        """Last measured lag of every replica; lag_s is None until measured or while unreachable."""
+        status = []
+        for i, replica in enumerate(self._replicas):
+            lag = self._replica_lag.get(i, (None, 0.0))[0]
+            status.append(
+                {
+                    "replica": replica._name,
+                    "lag_s": None if lag is None or lag == float("inf") else round(lag, 3),
+                    "eligible": lag is not None and lag <= self._settings.replica_max_lag_s,
+                }
+            )
+        return status
+
+    @asynccontextmanager
+    async def _readonly(
+        self, database: str | None = None, timeout_ms: int | None = None, primary: bool = False
+    ):
+        """
+        Open a read-only transaction with a statement_timeout applied via SET LOCAL.
+
+        timeout_ms=None uses the host's default; 0 disables the timeout. Unless
+        primary=True the transaction may run on a replica. If the calling task is
+        cancelled while a query is in flight, asyncpg sends a cancel request for
+        the backend query before the cancellation propagates.
+        """
+        if timeout_ms is None:
+            timeout_ms = self._settings.statement_timeout_ms
+        reader = self if primary else await self._reader(database)
+        if reader is not self:
+            self.metrics["replica_reads"] += 1
+        try:
+            async with reader._acquire(database) as conn:
+                async with conn.transaction(readonly=True):
+                    if timeout_ms:
+                        await conn.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+                    yield conn
+        except asyncpg.QueryCanceledError as e:
+            if "statement timeout" not in str(e):
+                self.metrics["cancellations"] += 1
+                raise
+            self.metrics["timeouts"] += 1
+            raise TimeoutError(
+                f"Query exceeded the {timeout_ms} ms statement timeout and was cancelled."
+            ) from e
+        except asyncio.CancelledError:
+            self.metrics["cancellations"] += 1
+            raise
+        self.metrics["completed"] += 1
+
+    async def fetch(
+        self,
+        database: str | None = None,
+        query: str = "",
+        *args,
+        timeout_ms: int | None = None,
+        primary: bool = False,
+    ) -> list[dict]:
+        async with self._readonly(database, timeout_ms, primary) as conn:
+            rows = await conn.fetch(query, *args)
         return [dict(r) for r in rows]
 
+    async def fetch_capped(
+        self,
+        database: str | None = None,
+        query: str = "",
+        *args,
+        max_rows: int = 500,
+        max_bytes: int = 256_000,
+        timeout_ms: int | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Stream rows through a server-side cursor, stopping at a row or byte budget.
+
+        Rows are pulled in small batches inside the read-only transaction, so memory
+        stays bounded by the budget rather than by the size of the result set. The
+        byte budget is measured against each row's compact JSON encoding.
+
+        Returns:
+            (rows, truncated_reason) where truncated_reason is "max_rows",
+            "max_bytes", or None when the whole result fit.
+        """
+        async with self._readonly(database, timeout_ms) as conn:
+            return await _read_capped(conn, query, args, max_rows, max_bytes)
+
+    async def fetch_batch(
+        self,
+        database: str | None,
+        queries: list[str],
+        *,
+        max_rows: int = 500,
+        max_bytes: int = 256_000,
+        timeout_ms: int | None = None,
+        guard=None,
+    ) -> list[dict]:
+        """Run several queries in one read-only transaction on one pooled connection.
+
+        Each query runs inside its own savepoint under the same statement timeout
+        and row/byte budgets as fetch_capped, so a failing query is reported
+        without aborting the ones after it.
+
+        `guard`, if given, is awaited as `guard(explain, query)` for every query,
+        in order, before any of them runs; `explain(sql)` returns the plan read
+        on the batch's own connection. It returns the SQL to run, or raises
+        ValueError to refuse the query, which is then reported as its error.
+
+        Returns:
+            One entry per query, in order: {"rows", "truncated_reason", "elapsed_ms"}
+            or {"error", "elapsed_ms"}.
+        """
+        results: list[dict] = []
+        async with self._readonly(database, timeout_ms) as conn:
+
+            async def explain(sql: str) -> dict:
+                async with conn.transaction():
+                    plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}")
+                return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+            planned: list[str | Exception] = []
+            for query in queries:
+                try:
+                    planned.append(await guard(explain, query) if guard else query)
+                except (ValueError, asyncpg.PostgresError) as e:
+                    planned.append(e)
+
+            for query in planned:
+                started = time.perf_counter()
+                if isinstance(query, Exception):
+                    results.append({"error": f"{type(query).__name__}: {query}", "elapsed_ms": 0.0})
+                    continue
+                try:
+                    async with conn.transaction():
+                        rows, truncated_reason = await _read_capped(conn, query, (), max_rows, max_bytes)
+                    entry = {"rows": rows, "truncated_reason": truncated_reason}
+                except asyncpg.QueryCanceledError as e:
+                    if "statement timeout" not in str(e):
+                        raise
+                    self.metrics["timeouts"] += 1
+                    entry = {"error": "TimeoutError: statement timeout exceeded."}
+                except asyncpg.PostgresError as e:
+                    entry = {"error": f"{type(e).__name__}: {e}"}
+                entry["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                results.append(entry)
+        return results
+
+    async def explain(
+        self,
+        database: str | None = None,
+        query: str = "",
+        *args,
+        analyze: bool = False,
+        timeout_ms: int | None = None,
+    ) -> dict:
+        """Run EXPLAIN (FORMAT JSON, BUFFERS) in the read-only transaction and return the plan document.
+
+        With analyze=True the query is executed, still inside the read-only transaction.
+        """
+        options = "FORMAT JSON, BUFFERS, ANALYZE" if analyze else "FORMAT JSON, BUFFERS"
+        rows = await self.fetch(database, f"EXPLAIN ({options}) {query}", *args, timeout_ms=timeout_ms)
+        plan = rows[0]["QUERY PLAN"]
+        return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+    async def copy_to_file(
+        self,
+        database: str | None,
+        query: str,
+        path: str,
+        *args,
+        compress: bool = False,
+        timeout_ms: int | None = None,
+    ) -> tuple[int, int]:
+        """Stream `COPY (query) TO STDOUT` as CSV with a header line into a local file.
+
+        Chunks are written as they arrive, so memory stays constant however many
+        rows the query returns. A partially written file is removed on failure.
+
+        Returns:
+            (row count, uncompressed bytes received).
+        """
+        received = 0
+        try:
+            with (gzip.open if compress else open)(path, "wb") as f:
+
+                async def sink(chunk: bytes) -> None:
+                    nonlocal received
+                    received += len(chunk)
+                    f.write(chunk)
+
+                async with self._readonly(database, timeout_ms) as conn:
+                    status = await conn.copy_from_query(
+                        query, *args, output=sink, format="csv", header=True
+                    )
+        except BaseException:
+            Path(path).unlink(missing_ok=True)
+            raise
+        return int(status.split()[-1]), received
+
+    async def listen(
+        self,
+        database: str | None,
+        channel: str,
+        *,
+        duration_s: float,
+        max_messages: int,
+        max_payload_bytes: int,
+    ) -> tuple[list[dict], str]:
+        """Collect NOTIFY messages on a channel over a dedicated connection to the primary.
+
+        Listening stops after `duration_s` seconds or `max_messages` messages,
+        whichever comes first, and the connection is closed. Payloads longer than
+        `max_payload_bytes` (UTF-8) are cut and marked as truncated.
+
+        Returns:
+            (messages in arrival order, "duration" or "max_messages").
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_notify(_conn, pid: int, _channel: str, payload: str) -> None:
+            queue.put_nowait((pid, payload, datetime.now(timezone.utc).isoformat()))
+
+        messages: list[dict] = []
+        stopped = "duration"
+        conn = await asyncpg.connect(**self._connect_kwargs(database))
+        try:
+            await conn.add_listener(channel, on_notify)
+            deadline = time.monotonic() + duration_s
+            while True:
+                if len(messages) >= max_messages:
+                    stopped = "max_messages"
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pid, payload, received_at = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                encoded = payload.encode()
+                message = {"pid": pid, "received_at": received_at, "payload": payload}
+                if len(encoded) > max_payload_bytes:
+                    message["payload"] = encoded[:max_payload_bytes].decode(errors="ignore")
+                    message["truncated"] = True
+                messages.append(message)
+        finally:
+            await conn.close()
+        return messages, stopped
+
+    async def schema(self, database: str | None = None) -> SchemaSnapshot:
+        """Return the cached schema snapshot for a database, reloading it if DDL changed it."""
+        return await self._schema_cache.get(self, database or self._default_database)
+
+    async def prewarm(self, database: str | None = None) -> float:
+        """
+        Open the pool for a database ahead of the first query and check one connection.
+
+        Returns:
+            Seconds spent creating the pool (TCP, TLS and auth for its min_size
+            connections) plus one `SELECT 1` round trip.
+        """
+        started = time.perf_counter()
+        async with self._acquire(database) as conn:
+            await conn.fetchval("SELECT 1")
+        return time.perf_counter() - started
+
     async def execute(self, database: str | None = None, query: str = "", *args) -> str:
         pool = await self._get_pool(database)
         return await pool.execute(query, *args)
 
     async def close(self):
-        for pool in self._pools.values():
-            await pool.close()
+        for replica in self._replicas:
+            await replica.close()
+        await self._pool_manager.close(self._name)
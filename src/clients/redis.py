@@ -1,16 +1,142 @@
+import asyncio
+import json
+import time
+from typing import Any, Literal
+from urllib.parse import unquote, urlparse
+
 import redis.asyncio as redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import Sentinel
+
+RedisMode = Literal["standalone", "cluster", "sentinel"]
+REDIS_MODES = ("standalone", "cluster", "sentinel")
+
+# A SCAN cursor: an int for a single server, or {primary node name: cursor} in cluster mode.
+ScanCursor = int | dict[str, int]
+
+
+def _sentinel_master(urls: str, service_name: str) -> redis.Redis:
+    """
+    Client for the primary a set of sentinels currently reports for `service_name`.
+
+    `urls` is a comma-separated list of sentinel addresses, e.g.
+    "rediss://:secret@s1:26379/0,rediss://s2:26379". The credentials and scheme
+    of the first one are used both to query the sentinels and for the primary
+    connection, which also takes its database.
+    """
+    addresses = [urlparse(url.strip()) for url in urls.split(",") if url.strip()]
+    first = addresses[0]
+    auth: dict[str, Any] = {}
+    if first.username:
+        auth["username"] = unquote(first.username)
+    if first.password:
+        auth["password"] = unquote(first.password)
+    if first.scheme == "rediss":
+        auth["ssl"] = True
+    sentinel = Sentinel([(a.hostname, a.port or 26379) for a in addresses], sentinel_kwargs=dict(auth))
+    return sentinel.master_for(
+        service_name, db=int(first.path.lstrip("/") or 0), decode_responses=True, **auth
+    )
+
+
+def _capped(elements: list, max_bytes: int) -> tuple[list, bool]:
+    """Leading elements whose combined JSON size fits in max_bytes, and whether any were dropped."""
+    kept = []
+    size = 0
+    for element in elements:
+        size += len(json.dumps(element, default=str))
+        if size > max_bytes:
+            return kept, True
+        kept.append(element)
+    return kept, False
+
+
+def _utf8_prefix(raw: bytes) -> str:
+    """Decode a byte prefix of a value, dropping a multibyte character cut off at the end.
+
+    Values that are not UTF-8 at all (binary payloads) are decoded with replacement characters.
+    """
+    try:
+        return raw.decode()
+    except UnicodeDecodeError as e:
+        if e.reason == "unexpected end of data":
+            return _utf8_prefix(raw[: e.start])
+        return raw.decode(errors="replace")
+
+
+def _value_commands(pipe, key: str, type_: str, max_elements: int, max_bytes: int) -> int:
+    """Queue the length and value reads for one key; returns how many commands were queued."""
+    if type_ == "string":
+        pipe.strlen(key)
+        # Read undecoded: a byte range can end inside a multibyte character.
+        pipe.execute_command("GETRANGE", key, 0, max_bytes - 1, NEVER_DECODE=True)
+    elif type_ == "hash":
+        pipe.hlen(key)
+        pipe.hscan(key, 0, count=max_elements)
+    elif type_ == "list":
+        pipe.llen(key)
+        pipe.lrange(key, 0, max_elements - 1)
+    elif type_ == "set":
+        pipe.scard(key)
+        pipe.sscan(key, 0, count=max_elements)
+    elif type_ == "zset":
+        pipe.zcard(key)
+        pipe.zrange(key, 0, max_elements - 1, withscores=True)
+    elif type_ == "stream":
+        pipe.xlen(key)
+        pipe.xrange(key, count=max_elements)
+    else:
+        return 0
+    return 2
+
+
+def _value(type_: str, length: int, raw, max_elements: int, max_bytes: int) -> dict:
+    if type_ == "string":
+        return {"length": length, "value": _utf8_prefix(raw), "truncated": length > len(raw)}
+    if type_ in ("hash", "set"):
+        _, page = raw
+        elements = list(page.items()) if type_ == "hash" else sorted(page)
+    elif type_ == "zset":
+        elements = [[member, score] for member, score in raw]
+    elif type_ == "stream":
+        elements = [[entry_id, fields] for entry_id, fields in raw]
+    else:
+        elements = list(raw)
+    elements = elements[:max_elements]
+    kept, dropped = _capped(elements, max_bytes)
+    value = dict(kept) if type_ == "hash" else kept
+    return {"length": length, "value": value, "truncated": dropped or len(kept) < length}
 
 
 class RedisClient:
-    """Async Redis client."""
+    """Async Redis client for a single server, a Redis Cluster or a Sentinel-managed primary.
 
-    def __init__(self, url: str):
+    In cluster mode key commands, pipelined ones included, are routed to the
+    primary owning the key's hash slot, and SCAN visits every primary.
+    """
+
+    def __init__(self, url: str, mode: RedisMode = "standalone", sentinel_master: str = ""):
+        if mode not in REDIS_MODES:
+            raise ValueError(f"Unknown Redis mode '{mode}'. Expected one of: {', '.join(REDIS_MODES)}.")
+        if mode == "sentinel" and not sentinel_master:
+            raise ValueError("Sentinel mode needs the name of the monitored primary.")
         self._url = url
-        self._client: redis.Redis | None = None
+        self._mode = mode
+        self._sentinel_master = sentinel_master
+        self._client: redis.Redis | RedisCluster | None = None
+
+    @property
+    def mode(self) -> RedisMode:
+        return self._mode
 
-    def _get_client(self) -> redis.Redis:
+    def _get_client(self) -> redis.Redis | RedisCluster:
         if self._client is None:
-            self._client = redis.from_url(self._url, decode_responses=True)
+            if self._mode == "cluster":
+                self._client = RedisCluster.from_url(self._url, decode_responses=True)
+            elif self._mode == "sentinel":
+                self._client = _sentinel_master(self._url, self._sentinel_master)
+            else:
+                self._client = redis.from_url(self._url, decode_responses=True)
         return self._client
 
     async def get(self, key: str) -> str | None:
@@ -25,6 +151,188 @@ class RedisClient:
     async def keys(self, pattern: str = "*") -> list[str]:
         return await self._get_client().keys(pattern)
 
+    async def scan_page(
+        self, cursor: ScanCursor = 0, pattern: str = "*", count: int = 1000, type_: str | None = None
+    ) -> tuple[ScanCursor, list[str]]:
+        """One SCAN call: (next cursor, keys on this page).
+
+        In cluster mode each primary still being scanned gets one concurrent SCAN
+        call with its own cursor, so a page holds up to `count` keys per primary.
+        The merged cursor maps each unfinished primary to its cursor and is 0
+        once every primary is exhausted.
+        """
+        client = self._get_client()
+        if self._mode != "cluster":
+            return await client.scan(cursor=cursor, match=pattern, count=count, _type=type_)
+
+        await client.initialize()
+        pending = {node.name: 0 for node in client.get_primaries()} if cursor == 0 else cursor
+        nodes = {name: client.get_node(node_name=name) for name in pending}
+        missing = sorted(name for name, node in nodes.items() if node is None)
+        if missing:
+            raise ValueError(
+                f"Cluster nodes {', '.join(missing)} are no longer known (failover or resharding); "
+                "restart the scan."
+            )
+        pages = await asyncio.gather(
+            *(
+                client.scan(cursor=pending[name], match=pattern, count=count, _type=type_, target_nodes=node)
+                for name, node in nodes.items()
+            )
+        )
+        merged: dict[str, int] = {}
+        keys: list[str] = []
+        for name, (cursors, page) in zip(nodes, pages):
+            keys.extend(page)
+            if cursors[name]:
+                merged[name] = cursors[name]
+        return merged or 0, keys
+
+    async def key_meta(self, keys: list[str]) -> list[tuple[str | None, int | None, int | None]]:
+        """(TYPE, TTL, MEMORY USAGE) per key from one pipelined round trip; None where a command failed."""
+        pipe = self._get_client().pipeline(transaction=False)
+        for key in keys:
+            pipe.type(key)
+            pipe.ttl(key)
+            pipe.memory_usage(key)
+        results = await pipe.execute(raise_on_error=False)
+        results = [None if isinstance(r, Exception) else r for r in results]
+        return [tuple(results[i : i + 3]) for i in range(0, len(results), 3)]
+
+    async def scan_keys(
+        self,
+        pattern: str = "*",
+        *,
+        cursor: ScanCursor = 0,
+        count: int = 1000,
+        type_: str | None = None,
+        max_keys: int = 1000,
+        time_budget_s: float = 2.0,
+    ) -> tuple[list[str], ScanCursor, str | None]:
+        """Iterate keys with SCAN from `cursor` until the keyspace ends or a budget is reached.
+
+        Each SCAN call does a bounded amount of work on the server, so large
+        keyspaces never block it the way KEYS does. Whole SCAN pages are kept, so
+        the result may exceed `max_keys` by up to one page and the returned cursor
+        resumes exactly after it.
+
+        Returns:
+            (keys, next cursor — 0 once the scan is complete,
+            "max_keys" / "time_budget" or None if the scan completed).
+        """
+        deadline = time.monotonic() + time_budget_s
+        keys: list[str] = []
+        while True:
+            cursor, page = await self.scan_page(cursor, pattern, count, type_)
+            keys.extend(page)
+            if cursor == 0:
+                return keys, 0, None
+            if len(keys) >= max_keys:
+                return keys, cursor, "max_keys"
+            if time.monotonic() >= deadline:
+                return keys, cursor, "time_budget"
+
+    async def inspect(
+        self, keys: list[str], max_elements: int = 100, max_bytes: int = 4096
+    ) -> dict[str, dict]:
+        """Type, TTL, memory and a capped value for each key in two pipelined round trips.
+
+        The first pipeline reads TYPE, TTL and MEMORY USAGE for every key; the
+        second reads each key's length and value with the command for its type
+        (GETRANGE, HSCAN, LRANGE, SSCAN, ZRANGE WITHSCORES, XRANGE). Collections
+        are cut at `max_elements` elements and every value at roughly `max_bytes`
+        of JSON.
+        """
+        meta = await self.key_meta(keys)
+        results: dict[str, dict] = {}
+        queued: list[tuple[str, str, int]] = []
+        pipe = self._get_client().pipeline(transaction=False)
+        for key, (type_, ttl, memory) in zip(keys, meta):
+            if type_ in (None, "none"):
+                results[key] = {"type": "none"}
+                continue
+            results[key] = {"type": type_, "ttl": ttl, "memory_bytes": memory}
+            queued.append((key, type_, _value_commands(pipe, key, type_, max_elements, max_bytes)))
+        values = await pipe.execute(raise_on_error=False) if any(n for _, _, n in queued) else []
+
+        position = 0
+        for key, type_, count in queued:
+            if not count:
+                continue
+            length, raw = values[position : position + count]
+            position += count
+            if isinstance(length, Exception) or isinstance(raw, Exception):
+                error = length if isinstance(length, Exception) else raw
+                results[key]["error"] = f"{type(error).__name__}: {error}"
+                continue
+            results[key].update(_value(type_, length, raw, max_elements, max_bytes))
+        return results
+
+    async def _targets(self) -> list[tuple[str | None, dict[str, Any]]]:
+        """Nodes server-wide commands must run on: every primary in cluster mode, else just the server."""
+        client = self._get_client()
+        if self._mode != "cluster":
+            return [(None, {})]
+        await client.initialize()
+        return [(node.name, {"target_nodes": node}) for node in client.get_primaries()]
+
+    async def diagnostics(
+        self, sections: tuple[str, ...], info_sections: tuple[str, ...], slowlog_count: int = 128
+    ) -> dict[str | None, tuple[dict[str, Any], dict[str, str]]]:
+        """Raw INFO, SLOWLOG, LATENCY and CLIENT LIST output in at most two pipelined round trips.
+
+        `sections` picks any of "info", "slowlog", "latency" and "clients". The
+        second round trip reads LATENCY HISTORY for each event LATENCY LATEST
+        reported. A command refused by the server (an ACL, a managed service
+        renaming it) only fails its own section. In cluster mode every command
+        is sent to each primary; the cluster pipeline reaches them concurrently.
+
+        Returns:
+            {node name (None outside cluster mode): (raw output per section, error per failed section)}.
+        """
+        targets = await self._targets()
+        pipe = self._get_client().pipeline(transaction=False)
+        queued: list[tuple[str | None, str, str | None]] = []
+        for node, target in targets:
+            if "info" in sections:
+                for section in info_sections:
+                    pipe.info(section, **target)
+                    queued.append((node, "info", section))
+            if "slowlog" in sections:
+                pipe.slowlog_get(slowlog_count, **target)
+                queued.append((node, "slowlog", None))
+            if "latency" in sections:
+                pipe.execute_command("LATENCY LATEST", **target)
+                queued.append((node, "latency", None))
+            if "clients" in sections:
+                pipe.client_list(**target)
+                queued.append((node, "clients", None))
+        results = await pipe.execute(raise_on_error=False) if queued else []
+
+        nodes: dict[str | None, tuple[dict[str, Any], dict[str, str]]] = {node: ({}, {}) for node, _ in targets}
+        for (node, section, part), result in zip(queued, results):
+            raw, errors = nodes[node]
+            if isinstance(result, Exception):
+                errors[f"{section}.{part}" if part else section] = f"{type(result).__name__}: {result}"
+            elif section == "info":
+                raw.setdefault("info", {})[part] = result
+            elif section == "latency":
+                raw["latency"] = {"latest": result, "history": {}}
+            else:
+                raw[section] = result
+
+        history: list[tuple[str | None, str]] = []
+        pipe = self._get_client().pipeline(transaction=False)
+        for node, target in targets:
+            for row in nodes[node][0].get("latency", {}).get("latest", []):
+                pipe.execute_command("LATENCY HISTORY", row[0], **target)
+                history.append((node, row[0]))
+        if history:
+            for (node, event), result in zip(history, await pipe.execute(raise_on_error=False)):
+                if not isinstance(result, Exception):
+                    nodes[node][0]["latency"]["history"][event] = result
+        return nodes
+
     async def close(self):
         if self._client:
             await self._client.aclose()
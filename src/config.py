@@ -1,5 +1,6 @@
 import os
-from dataclasses import dataclass, field
+import tempfile
+from dataclasses import dataclass, field, fields
 
 from dotenv import load_dotenv
 
@@ -21,16 +22,9 @@ def _env_bool_map(prefix: str) -> dict[str, bool]:
     }
 
 
-def _postgres_host_urls() -> dict[str, dict[str, str]]:
-    """
-    Discover POSTGRES_URL_<HOST>_<ENV> env vars and build a {host: {environment: url}} map.
-
-    Open-ended: any <HOST> is accepted as long as the var ends with a known
-    environment suffix (_DEV, _QA, _UAT, _PROD), so new hosts can be added purely
-    via env vars without code changes.
-    """
+def _postgres_host_env_vars(prefix: str) -> dict[str, dict[str, str]]:
+    """Discover <prefix><HOST>_<ENV> env vars and build a {host: {environment: value}} map."""
     hosts: dict[str, dict[str, str]] = {}
-    prefix = "POSTGRES_URL_"
     for key, value in os.environ.items():
         if not value or not key.startswith(prefix):
             continue
@@ -45,6 +39,71 @@ def _postgres_host_urls() -> dict[str, dict[str, str]]:
     return hosts
 
 
+def _postgres_host_urls() -> dict[str, dict[str, str]]:
+    """
+    Discover POSTGRES_URL_<HOST>_<ENV> env vars and build a {host: {environment: url}} map.
+
+    Open-ended: any <HOST> is accepted as long as the var ends with a known
+    environment suffix (_DEV, _QA, _UAT, _PROD), so new hosts can be added purely
+    via env vars without code changes.
+    """
+    return _postgres_host_env_vars("POSTGRES_URL_")
+
+
+def _postgres_replica_urls() -> dict[str, dict[str, list[str]]]:
+    """Discover comma-separated POSTGRES_REPLICA_URLS_<HOST>_<ENV> vars as {host: {environment: [url, ...]}}."""
+    return {
+        host: {
+            env: [url.strip() for url in value.split(",") if url.strip()]
+            for env, value in env_values.items()
+        }
+        for host, env_values in _postgres_host_env_vars("POSTGRES_REPLICA_URLS_").items()
+    }
+
+
+@dataclass(frozen=True)
+class PostgresHostSettings:
+    """
+    Per-host PostgreSQL tuning.
+
+    Each field is read from POSTGRES_<FIELD>_<HOST> (e.g. POSTGRES_POOL_MAX_SIZE_MERCHANT),
+    falling back to POSTGRES_<FIELD> for every host, then to the default below.
+    """
+
+    pool_min_size: int = 1
+    pool_max_size: int = 5
+    pool_idle_timeout_s: float = 300.0
+    schema_cache_ttl_s: float = 300.0
+    schema_cache_max_age_s: float = 3600.0
+    statement_timeout_ms: int = 30_000
+    query_cache_ttl_s: float = 60.0
+    prewarm: bool = False
+    cost_guard_max_cost: float = 0.0
+    cost_guard_max_rows: int = 0
+    cost_guard_action: str = "reject"
+    replica_max_lag_s: float = 30.0
+
+
+def _coerce(raw: str, type_: type):
+    if type_ is bool:
+        return raw.lower() == "true"
+    return type_(raw)
+
+
+def _postgres_host_settings() -> dict[str, PostgresHostSettings]:
+    """Build {host: PostgresHostSettings} for every host discovered from POSTGRES_URL_* vars."""
+    settings: dict[str, PostgresHostSettings] = {}
+    for host in _postgres_host_urls():
+        overrides = {}
+        for setting in fields(PostgresHostSettings):
+            name = f"POSTGRES_{setting.name.upper()}"
+            raw = os.getenv(f"{name}_{host.upper()}") or os.getenv(name)
+            if raw:
+                overrides[setting.name] = _coerce(raw, setting.type)
+        settings[host] = PostgresHostSettings(**overrides)
+    return settings
+
+
 @dataclass
 class Config:
     atlassian_domain: str = os.getenv("ATLASSIAN_DOMAIN", "")
@@ -61,9 +120,28 @@ class Config:
 
     enable_postgres: bool = os.getenv("ENABLE_POSTGRES", "false").lower() == "true"
     postgres_host_urls: dict[str, dict[str, str]] = field(default_factory=_postgres_host_urls)
+    postgres_host_settings: dict[str, PostgresHostSettings] = field(
+        default_factory=_postgres_host_settings
+    )
+    postgres_replica_urls: dict[str, dict[str, list[str]]] = field(
+        default_factory=_postgres_replica_urls
+    )
+    postgres_max_total_connections: int = int(os.getenv("POSTGRES_MAX_TOTAL_CONNECTIONS", "50"))
+    postgres_query_cache_max_bytes: int = int(
+        os.getenv("POSTGRES_QUERY_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+    )
+    postgres_probe_interval_s: float = float(os.getenv("POSTGRES_PROBE_INTERVAL_S", "0"))
+    postgres_export_dir: str = os.getenv("POSTGRES_EXPORT_DIR") or os.path.join(
+        tempfile.gettempdir(), "local-mcp-exports"
+    )
 
     enable_redis: bool = os.getenv("ENABLE_REDIS", "false").lower() == "true"
     redis_urls: dict[str, str] = field(default_factory=lambda: _env_map("REDIS_URL"))
+    # standalone (default), cluster or sentinel; sentinel mode also needs the primary's name.
+    redis_modes: dict[str, str] = field(default_factory=lambda: _env_map("REDIS_MODE"))
+    redis_sentinel_masters: dict[str, str] = field(
+        default_factory=lambda: _env_map("REDIS_SENTINEL_MASTER")
+    )
 
     enable_kafka: bool = os.getenv("ENABLE_KAFKA", "false").lower() == "true"
     kafka_bootstrap_servers: dict[str, str] = field(
@@ -112,6 +190,10 @@ class Config:
     def bitbucket_base_url(self) -> str:
         return "https://api.bitbucket.org/2.0"
 
+    def postgres_settings(self, host: str) -> PostgresHostSettings:
+        """Return the tuning for a PostgreSQL host, or the defaults if none was configured."""
+        return self.postgres_host_settings.get(host) or PostgresHostSettings()
+
     def configured_environments(self, urls: dict[str, str]) -> list[str]:
         """Return environments that have a non-empty URL configured."""
         return [env for env, url in urls.items() if url]
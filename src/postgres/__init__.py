@@ -0,0 +1,34 @@
+from src.postgres.activity import blocking_tree, summarize_activity
+from src.postgres.catalog import SchemaCache, SchemaSnapshot
+from src.postgres.diff import diff_columns, diff_rows, diff_schemas
+from src.postgres.encoding import encode_rows, encode_value, to_columns
+from src.postgres.explain import seq_scan_relations, summarize_plan
+from src.postgres.guard import violations, with_limit
+from src.postgres.profile import profile_column
+from src.postgres.query_cache import QueryCache, normalize_sql
+from src.postgres.sampling import sample_percent, sample_sql
+from src.postgres.statements import rank_statements, statement_deltas
+
+__all__ = [
+    "QueryCache",
+    "SchemaCache",
+    "SchemaSnapshot",
+    "blocking_tree",
+    "diff_columns",
+    "diff_rows",
+    "diff_schemas",
+    "encode_rows",
+    "encode_value",
+    "normalize_sql",
+    "profile_column",
+    "rank_statements",
+    "sample_percent",
+    "sample_sql",
+    "seq_scan_relations",
+    "statement_deltas",
+    "summarize_activity",
+    "summarize_plan",
+    "to_columns",
+    "violations",
+    "with_limit",
+]
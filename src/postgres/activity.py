@@ -0,0 +1,106 @@
+"""Session activity and lock-blocking chains from pg_stat_activity and pg_locks."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+# Every client backend except our own, with the PIDs blocking it and the lock it
+# is waiting for. $1 caps the length of each query text.
+ACTIVITY_SQL = """
+SELECT
+    a.pid,
+    a.usename AS user,
+    a.application_name,
+    a.client_addr::text AS client_addr,
+    a.state,
+    a.wait_event_type,
+    a.wait_event,
+    extract(epoch FROM now() - a.xact_start)::float8 AS xact_age_s,
+    extract(epoch FROM now() - a.query_start)::float8 AS query_age_s,
+    left(a.query, $1) AS query,
+    pg_blocking_pids(a.pid) AS blocked_by,
+    (
+        SELECT l.locktype || ' ' || l.mode || COALESCE(' on ' || l.relation::regclass::text, '')
+        FROM pg_locks l
+        WHERE l.pid = a.pid AND NOT l.granted
+        LIMIT 1
+    ) AS waiting_for
+FROM pg_stat_activity a
+WHERE a.backend_type = 'client backend' AND a.pid <> pg_backend_pid()
+"""
+
+_SESSION_FIELDS = ("pid", "user", "application_name", "state", "wait_event", "xact_age_s", "query")
+
+
+def _session(row: dict) -> dict[str, Any]:
+    session = {key: row.get(key) for key in _SESSION_FIELDS}
+    if row.get("wait_event_type"):
+        session["wait_event"] = f"{row['wait_event_type']}:{row['wait_event']}"
+    if row.get("xact_age_s") is not None:
+        session["xact_age_s"] = round(row["xact_age_s"], 1)
+    if row.get("waiting_for"):
+        session["waiting_for"] = row["waiting_for"]
+    return {key: value for key, value in session.items() if value is not None}
+
+
+def blocking_tree(rows: list[dict]) -> list[dict[str, Any]]:
+    """
+    Nest blocked sessions under the sessions blocking them.
+
+    Roots are blockers that are not blocked themselves. A session blocked by
+    several PIDs appears under each of them; lock cycles (deadlocks about to be
+    broken) are cut where they close.
+    """
+    by_pid = {row["pid"]: row for row in rows}
+    blocked_by_pid: dict[int, list[int]] = {}
+    for row in rows:
+        for blocker in row.get("blocked_by") or []:
+            blocked_by_pid.setdefault(blocker, []).append(row["pid"])
+
+    reached: set[int] = set()
+
+    def build(pid: int, seen: frozenset[int]) -> dict[str, Any]:
+        reached.add(pid)
+        node = _session(by_pid[pid]) if pid in by_pid else {"pid": pid}
+        children = [
+            build(child, seen | {child})
+            for child in sorted(blocked_by_pid.get(pid, []))
+            if child not in seen
+        ]
+        if children:
+            node["blocked"] = children
+        return node
+
+    blocked = {row["pid"] for row in rows if row.get("blocked_by")}
+    tree = [build(pid, frozenset({pid})) for pid in sorted(blocked_by_pid) if pid not in blocked]
+    # Blockers that are themselves blocked and unreachable from a root form a cycle.
+    for pid in sorted(blocked_by_pid):
+        if pid not in reached:
+            tree.append(build(pid, frozenset({pid})))
+    return tree
+
+
+def summarize_activity(
+    rows: list[dict], long_running_s: float = 60.0, limit: int = 20
+) -> dict[str, Any]:
+    """Group sessions by state and wait event, list long transactions and build the blocking tree."""
+    long_running = sorted(
+        (row for row in rows if (row.get("xact_age_s") or 0) >= long_running_s),
+        key=lambda row: row["xact_age_s"],
+        reverse=True,
+    )
+    return {
+        "sessions": len(rows),
+        "by_state": dict(Counter(row.get("state") or "unknown" for row in rows).most_common()),
+        "by_wait_event": dict(
+            Counter(
+                f"{row['wait_event_type']}:{row['wait_event']}"
+                for row in rows
+                if row.get("wait_event_type")
+            ).most_common()
+        ),
+        "blocked_sessions": sum(1 for row in rows if row.get("blocked_by")),
+        "long_running_transactions": [_session(row) for row in long_running[:limit]],
+        "blocking_tree": blocking_tree(rows),
+    }
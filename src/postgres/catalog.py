@@ -0,0 +1,217 @@
+"""In-memory PostgreSQL schema cache built from one bulk catalog query."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+# Relation kinds listed by pg_list_tables: tables, partitioned tables, views,
+# materialized views and foreign tables.
+RELATION_KINDS = ("r", "p", "v", "m", "f")
+
+_USER_NAMESPACES = (
+    "n.nspname NOT IN ('pg_catalog', 'information_schema') AND n.nspname NOT LIKE 'pg_toast%'"
+)
+
+
+def _catalog_state(catalog: str, alias: str, relid: str) -> str:
+    """Row count and newest xmin of a per-relation catalog, limited to user relations."""
+    return f"""(
+        SELECT count(*)::text || ':' || COALESCE(max({alias}.xmin::text::bigint), 0)::text
+        FROM {catalog} {alias}
+        JOIN pg_class c ON c.oid = {alias}.{relid}
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE {_USER_NAMESPACES}
+    )"""
+
+
+# Changes whenever a relation is created, dropped, altered or rewritten: DDL
+# bumps the pg_class row's xmin and rewrites assign a new relfilenode. Column
+# renames, default and NOT NULL changes, binary-coercible type changes and new
+# constraints leave pg_class alone, so the newest xmin and row count of
+# pg_attribute, pg_attrdef and pg_constraint are folded in as well.
+FINGERPRINT_SQL = f"""
+SELECT md5(
+    COALESCE((
+        SELECT string_agg(
+            c.oid::text || ':' || c.xmin::text || ':' || c.relfilenode::text, ',' ORDER BY c.oid
+        )
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE {_USER_NAMESPACES}
+    ), '')
+    || '|' || {_catalog_state("pg_attribute", "a", "attrelid")}
+    || '|' || {_catalog_state("pg_attrdef", "d", "adrelid")}
+    || '|' || {_catalog_state("pg_constraint", "con", "conrelid")}
+) AS fingerprint
+"""
+
+CATALOG_SQL = f"""
+SELECT
+    n.nspname AS schema,
+    c.relname AS name,
+    c.relkind::text AS kind,
+    COALESCE((
+        SELECT json_agg(json_build_object(
+            'column_name', a.attname,
+            'data_type', format_type(a.atttypid, a.atttypmod),
+            'is_nullable', CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END,
+            'column_default', pg_get_expr(d.adbin, d.adrelid)
+        ) ORDER BY a.attnum)
+        FROM pg_attribute a
+        LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+        WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    ), '[]') AS columns,
+    COALESCE((
+        SELECT json_agg(json_build_object(
+            'indexname', ic.relname,
+            'indexdef', pg_get_indexdef(i.indexrelid)
+        ) ORDER BY ic.relname)
+        FROM pg_index i
+        JOIN pg_class ic ON ic.oid = i.indexrelid
+        WHERE i.indrelid = c.oid
+    ), '[]') AS indexes,
+    COALESCE((
+        SELECT json_agg(json_build_object(
+            'name', con.conname,
+            'type', con.contype::text,
+            'definition', pg_get_constraintdef(con.oid)
+        ) ORDER BY con.conname)
+        FROM pg_constraint con
+        WHERE con.conrelid = c.oid
+    ), '[]') AS constraints
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE c.relkind IN ({", ".join(f"'{kind}'" for kind in RELATION_KINDS)})
+  AND {_USER_NAMESPACES}
+"""
+
+
+def _json(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _column_definition(column: dict) -> str:
+    definition = column["data_type"]
+    if column["is_nullable"] == "NO":
+        definition += " NOT NULL"
+    if column["column_default"] is not None:
+        definition += f" DEFAULT {column['column_default']}"
+    return definition
+
+
+def _content_hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+@dataclass
+class SchemaSnapshot:
+    """Every user relation in one database, keyed by (schema, name)."""
+
+    fingerprint: str
+    relations: dict[tuple[str, str], dict[str, Any]]
+    checked_at: float = field(default_factory=time.monotonic)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_rows(cls, fingerprint: str, rows: list[dict]) -> SchemaSnapshot:
+        return cls(
+            fingerprint=fingerprint,
+            relations={
+                (row["schema"], row["name"]): {
+                    "kind": row["kind"],
+                    "columns": _json(row["columns"]),
+                    "indexes": _json(row["indexes"]),
+                    "constraints": _json(row["constraints"]),
+                }
+                for row in rows
+            },
+        )
+
+    def tables(self, schema: str) -> list[str]:
+        return sorted(name for s, name in self.relations if s == schema)
+
+    def columns(self, schema: str, table: str) -> list[dict]:
+        return self.relations.get((schema, table), {}).get("columns", [])
+
+    def indexes(self, schema: str, table: str) -> list[dict]:
+        return self.relations.get((schema, table), {}).get("indexes", [])
+
+    def export(self, schema: str) -> dict[str, Any]:
+        """
+        Compact, hashable description of every relation in a schema.
+
+        Columns, indexes and constraints are flattened to {name: definition}
+        strings, with foreign keys split out from the other constraints. Each
+        table and the schema as a whole carry a content hash, so two exports can
+        be compared table by table without looking at unchanged definitions.
+        """
+        tables = {}
+        for (s, name), relation in sorted(self.relations.items()):
+            if s != schema:
+                continue
+            constraints = relation.get("constraints", [])
+            table = {
+                "kind": relation["kind"],
+                "columns": {c["column_name"]: _column_definition(c) for c in relation["columns"]},
+                "indexes": {i["indexname"]: i["indexdef"] for i in relation["indexes"]},
+                "constraints": {
+                    c["name"]: c["definition"] for c in constraints if c["type"] != "f"
+                },
+                "foreign_keys": {
+                    c["name"]: c["definition"] for c in constraints if c["type"] == "f"
+                },
+            }
+            tables[name] = {"hash": _content_hash(table), **table}
+        return {
+            "schema": schema,
+            "hash": _content_hash({name: table["hash"] for name, table in tables.items()}),
+            "tables": tables,
+        }
+
+
+class SchemaCache:
+    """
+    Per-database schema snapshots for one PostgreSQL client.
+
+    A snapshot is served from memory for `ttl_s` seconds. After that the cheap
+    fingerprint query decides whether the snapshot is still current; only a
+    changed fingerprint triggers the bulk catalog reload. A snapshot older than
+    `max_age_s` is reloaded regardless, as a backstop for catalog changes the
+    fingerprint cannot see.
+    """
+
+    def __init__(self, ttl_s: float = 300.0, max_age_s: float = 3600.0):
+        self._ttl_s = ttl_s
+        self._max_age_s = max_age_s
+        self._snapshots: dict[str, SchemaSnapshot] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get(self, client, database: str) -> SchemaSnapshot:
+        snapshot = self._snapshots.get(database)
+        if snapshot is not None and time.monotonic() - snapshot.checked_at < self._ttl_s:
+            return snapshot
+
+        async with self._locks.setdefault(database, asyncio.Lock()):
+            snapshot = self._snapshots.get(database)
+            if snapshot is not None and time.monotonic() - snapshot.checked_at < self._ttl_s:
+                return snapshot
+
+            [row] = await client.fetch(database, FINGERPRINT_SQL)
+            fingerprint = row["fingerprint"]
+            if (
+                snapshot is not None
+                and snapshot.fingerprint == fingerprint
+                and time.monotonic() - snapshot.loaded_at < self._max_age_s
+            ):
+                snapshot.checked_at = time.monotonic()
+                return snapshot
+
+            rows = await client.fetch(database, CATALOG_SQL)
+            snapshot = SchemaSnapshot.from_rows(fingerprint, rows)
+            self._snapshots[database] = snapshot
+            return snapshot
@@ -0,0 +1,100 @@
+"""Compare PostgreSQL results gathered from several environments."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+def _row_key(row: dict) -> str:
+    return json.dumps(row, sort_keys=True, default=str)
+
+
+def diff_rows(results: dict[str, list[dict]]) -> dict[str, Any]:
+    """
+    Report rows that are not returned by every environment.
+
+    Rows are compared as whole values, so a row whose columns differ between two
+    environments shows up under both of them.
+    """
+    keys = {env: {_row_key(row) for row in rows} for env, rows in results.items()}
+    common = set.intersection(*keys.values()) if keys else set()
+    not_in_all = {
+        env: [row for row in rows if _row_key(row) not in common]
+        for env, rows in results.items()
+    }
+    not_in_all = {env: rows for env, rows in not_in_all.items() if rows}
+    return {
+        "identical": not not_in_all and len({len(rows) for rows in results.values()}) <= 1,
+        "row_counts": {env: len(rows) for env, rows in results.items()},
+        "rows_not_in_all": not_in_all,
+    }
+
+
+def diff_columns(results: dict[str, list[dict]]) -> dict[str, Any]:
+    """Report columns missing from some environments or defined differently between them."""
+    by_env = {
+        env: {column["column_name"]: column for column in columns}
+        for env, columns in results.items()
+    }
+    names = sorted({name for columns in by_env.values() for name in columns})
+    missing: dict[str, list[str]] = {}
+    changed: dict[str, dict[str, dict]] = {}
+    for name in names:
+        lacking = [env for env, columns in by_env.items() if name not in columns]
+        if lacking:
+            missing[name] = lacking
+            continue
+        definitions = {
+            env: {k: v for k, v in columns[name].items() if k != "column_name"}
+            for env, columns in by_env.items()
+        }
+        if len({_row_key(d) for d in definitions.values()}) > 1:
+            changed[name] = definitions
+    return {"identical": not missing and not changed, "missing": missing, "changed": changed}
+
+
+def _diff_mapping(left: dict[str, str], right: dict[str, str]) -> dict[str, Any]:
+    changes: dict[str, Any] = {}
+    only_left = {k: left[k] for k in sorted(left.keys() - right.keys())}
+    only_right = {k: right[k] for k in sorted(right.keys() - left.keys())}
+    different = {
+        k: {"left": left[k], "right": right[k]}
+        for k in sorted(left.keys() & right.keys())
+        if left[k] != right[k]
+    }
+    if only_left:
+        changes["only_in_left"] = only_left
+    if only_right:
+        changes["only_in_right"] = only_right
+    if different:
+        changes["different"] = different
+    return changes
+
+
+def diff_schemas(left: dict[str, Any], right: dict[str, Any]) -> dict[str, Any]:
+    """
+    Compare two schema exports (see SchemaSnapshot.export), reporting only differences.
+
+    Tables with equal content hashes are skipped without comparing their definitions.
+    """
+    left_tables, right_tables = left["tables"], right["tables"]
+    changed: dict[str, dict] = {}
+    for name in sorted(left_tables.keys() & right_tables.keys()):
+        a, b = left_tables[name], right_tables[name]
+        if a["hash"] == b["hash"]:
+            continue
+        changes: dict[str, Any] = {}
+        if a["kind"] != b["kind"]:
+            changes["kind"] = {"left": a["kind"], "right": b["kind"]}
+        for part in ("columns", "indexes", "constraints", "foreign_keys"):
+            part_changes = _diff_mapping(a[part], b[part])
+            if part_changes:
+                changes[part] = part_changes
+        changed[name] = changes
+    return {
+        "identical": left["hash"] == right["hash"],
+        "tables_only_in_left": sorted(left_tables.keys() - right_tables.keys()),
+        "tables_only_in_right": sorted(right_tables.keys() - left_tables.keys()),
+        "changed_tables": changed,
+    }
@@ -0,0 +1,50 @@
+"""Encode PostgreSQL result rows for tool output."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Literal
+
+ResultFormat = Literal["json", "columns", "csv", "jsonl"]
+
+
+def to_columns(rows: list[dict]) -> dict[str, list]:
+    """Column names once plus one value array per row."""
+    columns = list(rows[0]) if rows else []
+    return {"columns": columns, "rows": [list(row.values()) for row in rows]}
+
+
+def _csv(rows: list[dict]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if rows:
+        writer.writerow(rows[0])
+        writer.writerows(["" if v is None else v for v in row.values()] for row in rows)
+    return buffer.getvalue()
+
+
+def encode_rows(rows: list[dict], fmt: ResultFormat = "json") -> str:
+    """
+    Encode rows as indented JSON objects (json), compact column/row arrays
+    (columns), CSV with a header line (csv) or one compact object per line (jsonl).
+    """
+    if fmt == "json":
+        return json.dumps(rows, default=str, indent=2)
+    if fmt == "columns":
+        return json.dumps(to_columns(rows), default=str, separators=(",", ":"))
+    if fmt == "csv":
+        return _csv(rows)
+    if fmt == "jsonl":
+        return "".join(json.dumps(row, default=str, separators=(",", ":")) + "\n" for row in rows)
+    raise ValueError(f"Unknown format '{fmt}'. Use one of: json, columns, csv, jsonl.")
+
+
+def encode_value(rows: list[dict], fmt: ResultFormat) -> Any:
+    """Encoded rows as a value to embed in a larger JSON response."""
+    if fmt == "json":
+        return rows
+    if fmt == "columns":
+        return to_columns(rows)
+    return encode_rows(rows, fmt)
@@ -0,0 +1,146 @@
+"""Summarise PostgreSQL `EXPLAIN (FORMAT JSON)` plans into their hot spots."""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+# Estimated row counts for the relations a plan seq-scans, matched by name since
+# non-VERBOSE plans do not carry the schema.
+RELATION_ROWS_SQL = """
+SELECT relname, max(reltuples)::bigint AS reltuples
+FROM pg_class
+WHERE relname = ANY($1::text[]) AND relkind IN ('r', 'p', 'm')
+GROUP BY relname
+"""
+
+# An estimate is reported as a miss when actual and planned rows differ by this factor.
+ROW_MISS_FACTOR = 10
+
+Node = dict[str, Any]
+
+
+def _walk(node: Node, depth: int = 0) -> Iterator[tuple[Node, int]]:
+    yield node, depth
+    for child in node.get("Plans", []):
+        yield from _walk(child, depth + 1)
+
+
+def _loops(node: Node) -> int:
+    return node.get("Actual Loops") or 1
+
+
+def _self_cost(node: Node) -> float:
+    children = sum(child.get("Total Cost", 0.0) for child in node.get("Plans", []))
+    return max(node.get("Total Cost", 0.0) - children, 0.0)
+
+
+def _self_time_ms(node: Node) -> float | None:
+    if "Actual Total Time" not in node:
+        return None
+    total = node["Actual Total Time"] * _loops(node)
+    children = sum(
+        child.get("Actual Total Time", 0.0) * _loops(child) for child in node.get("Plans", [])
+    )
+    return max(total - children, 0.0)
+
+
+def _describe(node: Node, node_id: int, depth: int) -> dict[str, Any]:
+    self_time = _self_time_ms(node)
+    described = {
+        "id": node_id,
+        "depth": depth,
+        "node": node.get("Node Type"),
+        "relation": node.get("Relation Name"),
+        "index": node.get("Index Name"),
+        "total_cost": node.get("Total Cost"),
+        "self_cost": round(_self_cost(node), 2),
+        "plan_rows": node.get("Plan Rows"),
+        "actual_rows": node.get("Actual Rows"),
+        "loops": node.get("Actual Loops"),
+        "self_time_ms": None if self_time is None else round(self_time, 3),
+    }
+    return {key: value for key, value in described.items() if value is not None}
+
+
+def _spill(node: Node) -> str | None:
+    if node.get("Sort Space Type") == "Disk":
+        return f"sort spilled to disk ({node.get('Sort Space Used')} kB, {node.get('Sort Method')})"
+    if node.get("Hash Batches", 1) > 1:
+        return (
+            f"hash used {node['Hash Batches']} batches "
+            f"(planned {node.get('Original Hash Batches', 1)})"
+        )
+    if node.get("Temp Written Blocks", 0) > 0 and not node.get("Plans"):
+        return f"wrote {node['Temp Written Blocks']} temp blocks"
+    return None
+
+
+def seq_scan_relations(plan: Node) -> list[str]:
+    """Names of every relation the plan reads with a sequential scan."""
+    return sorted(
+        {
+            node["Relation Name"]
+            for node, _ in _walk(plan)
+            if node.get("Node Type") == "Seq Scan" and node.get("Relation Name")
+        }
+    )
+
+
+def summarize_plan(
+    explain: Node,
+    relation_rows: dict[str, int] | None = None,
+    top_n: int = 5,
+    large_table_rows: int = 100_000,
+) -> dict[str, Any]:
+    """
+    Reduce one EXPLAIN JSON document to the nodes worth looking at.
+
+    Args:
+        explain: The single element of the EXPLAIN (FORMAT JSON) array.
+        relation_rows: {relation name: pg_class.reltuples} for seq-scanned relations.
+        top_n: Number of costliest nodes to report.
+        large_table_rows: Seq scans over relations at least this large are flagged.
+    """
+    plan = explain["Plan"]
+    relation_rows = relation_rows or {}
+    analyzed = "Actual Total Time" in plan
+    nodes = [(node_id, node, depth) for node_id, (node, depth) in enumerate(_walk(plan))]
+
+    rank = _self_time_ms if analyzed else _self_cost
+    costliest = sorted(nodes, key=lambda item: rank(item[1]) or 0.0, reverse=True)[:top_n]
+
+    misses = []
+    spills = []
+    seq_scans = []
+    for node_id, node, depth in nodes:
+        if analyzed and "Actual Rows" in node:
+            planned = max(node.get("Plan Rows", 0), 1)
+            actual = max(node["Actual Rows"], 1)
+            if max(planned, actual) / min(planned, actual) >= ROW_MISS_FACTOR:
+                misses.append(
+                    {**_describe(node, node_id, depth), "misestimate": round(actual / planned, 3)}
+                )
+        spill = _spill(node)
+        if spill:
+            spills.append({**_describe(node, node_id, depth), "spill": spill})
+        relation = node.get("Relation Name")
+        if node.get("Node Type") == "Seq Scan" and relation_rows.get(relation, 0) >= large_table_rows:
+            seq_scans.append(
+                {**_describe(node, node_id, depth), "relation_rows": relation_rows[relation]}
+            )
+
+    summary: dict[str, Any] = {
+        "analyzed": analyzed,
+        "total_cost": plan.get("Total Cost"),
+        "plan_rows": plan.get("Plan Rows"),
+        "node_count": len(nodes),
+        "costliest_nodes": [_describe(node, node_id, depth) for node_id, node, depth in costliest],
+        "row_estimate_misses": misses,
+        "seq_scans_on_large_relations": seq_scans,
+        "spills": spills,
+    }
+    if analyzed:
+        summary["actual_rows"] = plan.get("Actual Rows")
+        summary["planning_time_ms"] = explain.get("Planning Time")
+        summary["execution_time_ms"] = explain.get("Execution Time")
+    return summary
@@ -0,0 +1,123 @@
+"""Pre-flight cost checks for ad-hoc queries against per-host thresholds."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Literal
+
+from src.postgres.explain import summarize_plan
+
+CostGuardAction = Literal["reject", "limit"]
+
+# How the guard treats a statement:
+#   query           - planned up front, and limited or refused if over a threshold
+#   explain_analyze - EXPLAIN ANALYZE executes its statement, so that statement is planned
+#   passthrough     - SHOW and plain EXPLAIN, which run nothing expensive
+#   unknown         - cannot be checked, so refused on guarded hosts
+GuardKind = Literal["query", "explain_analyze", "passthrough", "unknown"]
+
+UNCHECKABLE = (
+    "Query refused by the cost guard: only SELECT, WITH, TABLE, VALUES, SHOW and EXPLAIN "
+    "statements can be checked on this host."
+)
+
+_QUERY = re.compile(r"(select|with|table|values)\b", re.IGNORECASE)
+_SHOW = re.compile(r"show\b", re.IGNORECASE)
+_EXPLAIN = re.compile(r"explain\b", re.IGNORECASE)
+_LEGACY_OPTION = re.compile(r"(analy[sz]e|verbose)\b", re.IGNORECASE)
+
+
+def _skip_comments(sql: str) -> str:
+    """`sql` without leading whitespace, `--` line comments and (nested) `/* */` block comments."""
+    while True:
+        sql = sql.lstrip()
+        if sql.startswith("--"):
+            newline = sql.find("\n")
+            sql = "" if newline < 0 else sql[newline + 1 :]
+        elif sql.startswith("/*"):
+            depth, i = 1, 2
+            while depth and i < len(sql):
+                if sql.startswith("/*", i):
+                    depth, i = depth + 1, i + 2
+                elif sql.startswith("*/", i):
+                    depth, i = depth - 1, i + 2
+                else:
+                    i += 1
+            sql = sql[i:]
+        else:
+            return sql
+
+
+def _explain_analyze_target(rest: str) -> str | None:
+    """The statement an EXPLAIN (text after the keyword) executes, or None if it only plans."""
+    rest = _skip_comments(rest)
+    analyze = False
+    if rest.startswith("("):
+        close = rest.find(")")
+        if close < 0:
+            return None
+        for option in rest[1:close].split(","):
+            words = option.split()
+            if words and words[0].lower() in ("analyze", "analyse"):
+                analyze = len(words) == 1 or words[1].lower().strip("'") in ("true", "on", "1")
+        rest = rest[close + 1 :]
+    else:
+        while match := _LEGACY_OPTION.match(rest):
+            analyze = analyze or match.group(1).lower() != "verbose"
+            rest = _skip_comments(rest[match.end() :])
+    return rest if analyze else None
+
+
+def classify(sql: str) -> tuple[GuardKind, str]:
+    """
+    How the cost guard treats `sql`, and the statement to plan for it.
+
+    Leading comments and parentheses are looked through, so they cannot hide
+    a query from the guard. A parenthesised query is planned as a subquery,
+    since EXPLAIN does not accept one directly.
+    """
+    body = _skip_comments(sql)
+    head = body
+    while head.startswith("("):
+        head = _skip_comments(head[1:])
+    if _QUERY.match(head):
+        return "query", body if body is head else f"SELECT * FROM (\n{body.rstrip().rstrip(';')}\n) AS guarded"
+    if _SHOW.match(head) and body is head:
+        return "passthrough", sql
+    if _EXPLAIN.match(head) and body is head:
+        target = _explain_analyze_target(head[len("explain") :])
+        if target is None:
+            return "passthrough", sql
+        kind, plannable = classify(target)
+        if kind == "query":
+            return "explain_analyze", plannable
+    return "unknown", sql
+
+
+def with_limit(sql: str, limit: int) -> str:
+    """Wrap a query so it returns at most `limit` rows, letting the planner pick a fast-start plan."""
+    return f"SELECT * FROM (\n{sql.strip().rstrip(';')}\n) AS guarded LIMIT {int(limit)}"
+
+
+def violations(plan: dict[str, Any], max_cost: float, max_rows: int) -> list[str]:
+    """Thresholds the plan's estimated total cost and row count exceed; 0 disables a threshold."""
+    top = plan["Plan"]
+    found = []
+    if max_cost and top.get("Total Cost", 0.0) > max_cost:
+        found.append(f"estimated cost {top['Total Cost']:.0f} exceeds {max_cost:.0f}")
+    if max_rows and top.get("Plan Rows", 0) > max_rows:
+        found.append(f"estimated rows {top['Plan Rows']} exceed {max_rows}")
+    return found
+
+
+def rejection(plan: dict[str, Any], found: list[str]) -> dict[str, Any]:
+    """Error payload for a refused query: the violated thresholds and the plan's hot spots."""
+    summary = summarize_plan(plan, top_n=3)
+    return {
+        "error": "Query refused by the cost guard: " + "; ".join(found) + ".",
+        "plan": {
+            "total_cost": summary["total_cost"],
+            "plan_rows": summary["plan_rows"],
+            "costliest_nodes": summary["costliest_nodes"],
+        },
+    }
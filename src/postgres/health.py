@@ -0,0 +1,63 @@
+"""Table health indicators from pg_stat_user_tables, pg_statio_user_tables and sizes."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# One round trip: activity, I/O, sizes and never-used indexes for every matching table.
+TABLE_HEALTH_SQL = """
+SELECT
+    s.schemaname AS schema,
+    s.relname AS table,
+    s.n_live_tup,
+    s.n_dead_tup,
+    round(100.0 * s.n_dead_tup / NULLIF(s.n_live_tup + s.n_dead_tup, 0), 2)::float8 AS dead_pct,
+    GREATEST(s.last_vacuum, s.last_autovacuum) AS last_vacuum,
+    GREATEST(s.last_analyze, s.last_autoanalyze) AS last_analyze,
+    s.n_mod_since_analyze,
+    s.seq_scan,
+    s.seq_tup_read,
+    COALESCE(s.idx_scan, 0) AS idx_scan,
+    round(100.0 * io.heap_blks_hit / NULLIF(io.heap_blks_hit + io.heap_blks_read, 0), 2)::float8 AS heap_hit_pct,
+    round(100.0 * io.idx_blks_hit / NULLIF(io.idx_blks_hit + io.idx_blks_read, 0), 2)::float8 AS index_hit_pct,
+    pg_relation_size(s.relid) AS table_bytes,
+    pg_indexes_size(s.relid) AS index_bytes,
+    COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0) AS toast_bytes,
+    pg_total_relation_size(s.relid) AS total_bytes,
+    COALESCE((
+        SELECT json_agg(json_build_object(
+            'index', i.indexrelname,
+            'bytes', pg_relation_size(i.indexrelid)
+        ) ORDER BY pg_relation_size(i.indexrelid) DESC)
+        FROM pg_stat_user_indexes i
+        JOIN pg_index x ON x.indexrelid = i.indexrelid
+        WHERE i.relid = s.relid AND i.idx_scan = 0 AND NOT x.indisunique
+    ), '[]') AS unused_indexes
+FROM pg_stat_user_tables s
+JOIN pg_statio_user_tables io ON io.relid = s.relid
+JOIN pg_class c ON c.oid = s.relid
+WHERE s.schemaname = $1 AND ($2::text = '' OR s.relname = $2::text)
+ORDER BY pg_total_relation_size(s.relid) DESC
+LIMIT $3
+"""
+
+# Thresholds for the findings attached to each table.
+DEAD_TUPLE_PCT = 20
+MIN_HIT_PCT = 90
+SEQ_SCAN_MIN_ROWS = 10_000
+
+
+def findings(row: dict[str, Any]) -> list[str]:
+    """Short, human-readable flags for the indicators that look unhealthy."""
+    flags = []
+    if (row.get("dead_pct") or 0) >= DEAD_TUPLE_PCT:
+        flags.append(f"{row['dead_pct']}% dead tuples; vacuum may be falling behind")
+    if row.get("last_analyze") is None and row.get("n_live_tup"):
+        flags.append("never analyzed; planner statistics are missing")
+    if row.get("n_live_tup", 0) >= SEQ_SCAN_MIN_ROWS and row.get("seq_scan", 0) > row.get("idx_scan", 0):
+        flags.append("more sequential scans than index scans on a large table")
+    if row.get("heap_hit_pct") is not None and row["heap_hit_pct"] < MIN_HIT_PCT:
+        flags.append(f"heap cache hit ratio {row['heap_hit_pct']}%")
+    if row.get("unused_indexes"):
+        flags.append(f"{len(row['unused_indexes'])} non-unique index(es) never scanned")
+    return flags
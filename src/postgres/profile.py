@@ -0,0 +1,74 @@
+"""Column profiles from planner statistics in pg_stats, without scanning the table."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# anyarray columns cannot be decoded by the driver, so they go through text[].
+# Inherited rows (partitioned and inheritance parents) sort last and win.
+COLUMN_STATS_SQL = """
+SELECT
+    s.attname AS column,
+    s.null_frac::float8 AS null_frac,
+    s.avg_width,
+    s.n_distinct::float8 AS n_distinct,
+    s.most_common_vals::text::text[] AS most_common_vals,
+    s.most_common_freqs::float8[] AS most_common_freqs,
+    s.histogram_bounds::text::text[] AS histogram_bounds,
+    s.correlation::float8 AS correlation
+FROM pg_stats s
+WHERE s.schemaname = $1 AND s.tablename = $2
+ORDER BY s.attname, s.inherited
+"""
+
+MAX_VALUE_CHARS = 100
+
+
+def _value(value: str | None) -> str | None:
+    if value is None or len(value) <= MAX_VALUE_CHARS:
+        return value
+    return value[:MAX_VALUE_CHARS] + "…"
+
+
+def _spread(values: list, count: int) -> list:
+    """`count` evenly spaced elements of `values`, always keeping the first and last."""
+    if len(values) <= count:
+        return values
+    if count < 2:
+        return values[:count]
+    step = (len(values) - 1) / (count - 1)
+    return [values[round(i * step)] for i in range(count)]
+
+
+def distinct_estimate(n_distinct: float, estimated_rows: float) -> int | None:
+    """pg_stats.n_distinct is an absolute count when positive and a fraction of the rows when negative."""
+    if n_distinct >= 0:
+        return int(n_distinct)
+    if estimated_rows <= 0:
+        return None
+    return round(-n_distinct * estimated_rows)
+
+
+def profile_column(row: dict, estimated_rows: float, max_values: int = 10) -> dict[str, Any]:
+    """
+    Readable profile of one pg_stats row.
+
+    Most-common values are paired with their frequencies and capped at
+    `max_values`; the histogram is thinned to at most `max_values + 1` bounds.
+    Long values are truncated.
+    """
+    values = row.get("most_common_vals") or []
+    freqs = row.get("most_common_freqs") or []
+    histogram = row.get("histogram_bounds") or []
+    return {
+        "null_frac": row["null_frac"],
+        "avg_width": row["avg_width"],
+        "n_distinct": row["n_distinct"],
+        "distinct_estimate": distinct_estimate(row["n_distinct"], estimated_rows),
+        "unique": row["n_distinct"] == -1,
+        "correlation": row["correlation"],
+        "most_common": [
+            {"value": _value(v), "freq": round(f, 6)} for v, f in list(zip(values, freqs))[:max_values]
+        ],
+        "histogram_bounds": [_value(v) for v in _spread(histogram, max_values + 1)],
+    }
@@ -0,0 +1,94 @@
+"""Memory-bounded LRU cache for read-only query results."""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Hashable
+
+# Quoted literals, quoted identifiers, dollar-quoted strings and comments are kept verbatim.
+_QUOTED_RE = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|\$((?:[A-Za-z_]\w*)?)\$.*?\$\2\$|--[^\n]*|/\*.*?\*/)""", re.DOTALL
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside quoted text and comments and drop trailing semicolons."""
+    parts = _QUOTED_RE.split(sql)
+    # split() yields [text, quoted, dollar-tag, text, quoted, dollar-tag, ...]
+    normalized = []
+    for i in range(0, len(parts), 3):
+        text = _WHITESPACE_RE.sub(" ", parts[i])
+        if i and parts[i - 2].startswith("--") and text:
+            # Keep the newline that ends a line comment, or the code after it would join the comment.
+            text = "\n" + text.lstrip()
+        normalized.append(text)
+        if i + 1 < len(parts):
+            normalized.append(parts[i + 1])
+    return "".join(normalized).strip().rstrip(";").rstrip()
+
+
+class QueryCache:
+    """
+    LRU cache bounded by the approximate size of the cached values.
+
+    Each entry carries its own TTL so hosts can expire results at different rates.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._counters: Counter[str] = Counter()
+
+    def _drop(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        expires_at, _, value = entry
+        if time.monotonic() >= expires_at:
+            self._drop(key)
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, size: int, ttl_s: float) -> None:
+        if ttl_s <= 0 or size > self._max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl_s, size, value)
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self._bytes = 0
+        self._counters.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self._counters["hits"],
+            "misses": self._counters["misses"],
+            "hit_ratio": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+            "expirations": self._counters["expirations"],
+            "evictions": self._counters["evictions"],
+        }
@@ -0,0 +1,70 @@
+"""Build TABLESAMPLE queries sized from pg_class row estimates."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+SampleMethod = Literal["system", "bernoulli"]
+
+# Relation kinds TABLESAMPLE accepts: tables, partitioned tables and materialized views.
+SAMPLEABLE_KINDS = ("r", "p", "m")
+
+# Planner row estimate for one relation. A partitioned parent has no rows of its
+# own, so its estimate is the sum over its leaf partitions. reltuples is -1 for a
+# relation that has never been vacuumed or analyzed.
+ROW_ESTIMATE_SQL = """
+SELECT CASE WHEN c.relkind = 'p' THEN (
+        SELECT COALESCE(sum(GREATEST(p.reltuples, 0)), 0)
+        FROM pg_partition_tree(c.oid) t
+        JOIN pg_class p ON p.oid = t.relid
+        WHERE t.isleaf
+    ) ELSE c.reltuples END::float8 AS reltuples
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = $1 AND c.relname = $2
+"""
+
+# SYSTEM picks whole pages, so the number of rows it returns varies more than
+# BERNOULLI's; both are oversampled and trimmed back with LIMIT.
+OVERSAMPLE = {"system": 2.0, "bernoulli": 1.2}
+MIN_PERCENT = 0.0001
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sample_percent(target_rows: int, estimated_rows: float, method: SampleMethod) -> float:
+    """Percentage of the relation to sample so roughly `target_rows` rows come back."""
+    if estimated_rows <= 0:
+        return 100.0
+    percent = target_rows / estimated_rows * 100 * OVERSAMPLE[method]
+    return min(max(percent, MIN_PERCENT), 100.0)
+
+
+def sample_sql(
+    schema: str,
+    table: str,
+    columns: list[str],
+    method: SampleMethod,
+    percent: float,
+    limit: int,
+    seed: int | None = None,
+) -> str:
+    """
+    SELECT the given columns from a TABLESAMPLE of the relation.
+
+    Without a seed the sampled rows are shuffled before the LIMIT, so trimming the
+    oversample does not favour the first pages read. With a seed, REPEATABLE makes
+    the sample reproducible and the rows are kept in scan order.
+    """
+    projection = ", ".join(quote_ident(c) for c in columns)
+    sql = (
+        f"SELECT {projection} FROM {quote_ident(schema)}.{quote_ident(table)} "
+        f"TABLESAMPLE {method.upper()} ({percent:.6g})"
+    )
+    if seed is not None:
+        sql += f" REPEATABLE ({int(seed)})"
+    elif percent < 100:
+        sql += " ORDER BY random()"
+    return sql + f" LIMIT {int(limit)}"
@@ -0,0 +1,86 @@
+"""Workload reports from the pg_stat_statements extension."""
+
+from __future__ import annotations
+
+from typing import Any, Literal
+
+StatementOrder = Literal["total_time", "mean_time", "calls", "rows", "shared_blks_read"]
+
+EXTENSION_SQL = "SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'"
+
+# Cumulative counters since the last pg_stat_statements_reset() (PostgreSQL 13+
+# column names). $1 caps the query text length, $2 is the row limit (NULL for all).
+_STATEMENTS_SQL = """
+SELECT
+    s.queryid,
+    s.userid::regrole::text AS user,
+    d.datname AS db,
+    s.calls,
+    s.total_exec_time AS total_time_ms,
+    s.mean_exec_time AS mean_time_ms,
+    s.rows,
+    s.shared_blks_hit,
+    s.shared_blks_read,
+    left(s.query, $1) AS query
+FROM pg_stat_statements s
+LEFT JOIN pg_database d ON d.oid = s.dbid
+ORDER BY {order} DESC
+LIMIT $2
+"""
+
+_ORDER_COLUMNS = {
+    "total_time": "total_time_ms",
+    "mean_time": "mean_time_ms",
+    "calls": "calls",
+    "rows": "rows",
+    "shared_blks_read": "shared_blks_read",
+}
+
+_COUNTERS = ("calls", "total_time_ms", "rows", "shared_blks_hit", "shared_blks_read")
+
+
+def statements_sql(order_by: StatementOrder) -> str:
+    if order_by not in _ORDER_COLUMNS:
+        raise ValueError(f"order_by must be one of: {', '.join(_ORDER_COLUMNS)}.")
+    return _STATEMENTS_SQL.format(order=_ORDER_COLUMNS[order_by])
+
+
+def _key(row: dict) -> tuple:
+    return (row["queryid"], row["user"], row["db"])
+
+
+def _finish(row: dict) -> dict[str, Any]:
+    row["mean_time_ms"] = row["total_time_ms"] / row["calls"] if row["calls"] else 0.0
+    row["total_time_ms"] = round(row["total_time_ms"], 3)
+    row["mean_time_ms"] = round(row["mean_time_ms"], 3)
+    return row
+
+
+def statement_deltas(before: list[dict], after: list[dict]) -> list[dict[str, Any]]:
+    """
+    Per-statement counter increase between two snapshots.
+
+    Statements not called in between are dropped. A statement missing from the
+    first snapshot, or whose counters went backwards because the stats were
+    reset, is counted from zero.
+    """
+    previous = {_key(row): row for row in before}
+    deltas = []
+    for row in after:
+        old = previous.get(_key(row))
+        if old is not None and row["calls"] >= old["calls"]:
+            delta = {**row, **{c: row[c] - old[c] for c in _COUNTERS}}
+        else:
+            delta = dict(row)
+        if delta["calls"] > 0:
+            deltas.append(_finish(delta))
+    return deltas
+
+
+def rank_statements(rows: list[dict], order_by: StatementOrder, limit: int) -> list[dict[str, Any]]:
+    column = _ORDER_COLUMNS[order_by]
+    return sorted(rows, key=lambda row: row[column], reverse=True)[:limit]
+
+
+def cumulative(rows: list[dict]) -> list[dict[str, Any]]:
+    return [_finish(dict(row)) for row in rows]
@@ -0,0 +1,16 @@
+from src.redis.diagnostics import (
+    summarize_clients,
+    summarize_info,
+    summarize_latency,
+    summarize_slowlog,
+)
+from src.redis.memory import MemoryReport, key_prefix
+
+__all__ = [
+    "MemoryReport",
+    "key_prefix",
+    "summarize_clients",
+    "summarize_info",
+    "summarize_latency",
+    "summarize_slowlog",
+]
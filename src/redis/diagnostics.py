@@ -0,0 +1,191 @@
+"""Compact summaries of INFO, SLOWLOG, LATENCY and CLIENT LIST output."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+INFO_SECTIONS = ("memory", "stats", "replication", "keyspace")
+
+_MEMORY_FIELDS = (
+    "used_memory",
+    "used_memory_rss",
+    "used_memory_peak",
+    "used_memory_dataset",
+    "maxmemory",
+    "maxmemory_policy",
+    "mem_fragmentation_ratio",
+)
+_STATS_FIELDS = (
+    "instantaneous_ops_per_sec",
+    "total_commands_processed",
+    "total_connections_received",
+    "rejected_connections",
+    "expired_keys",
+    "evicted_keys",
+    "keyspace_hits",
+    "keyspace_misses",
+    "latest_fork_usec",
+    "blocked_clients",
+)
+_REPLICATION_FIELDS = (
+    "role",
+    "connected_slaves",
+    "master_host",
+    "master_link_status",
+    "master_last_io_seconds_ago",
+    "master_sync_in_progress",
+    "master_repl_offset",
+)
+
+MAX_COMMAND_CHARS = 200
+
+
+def _pick(info: dict, fields: tuple[str, ...]) -> dict[str, Any]:
+    return {field: info[field] for field in fields if field in info}
+
+
+def _command(command: str) -> str:
+    if len(command) <= MAX_COMMAND_CHARS:
+        return command
+    return command[:MAX_COMMAND_CHARS] + "…"
+
+
+def summarize_info(info: dict[str, dict]) -> dict[str, Any]:
+    """
+    The fields of each INFO section that matter when latency spikes, plus a few
+    derived ones: memory used against maxmemory, the keyspace hit ratio and the
+    byte lag of each replica behind the primary.
+    """
+    summary: dict[str, Any] = {}
+    if "memory" in info:
+        memory = _pick(info["memory"], _MEMORY_FIELDS)
+        if memory.get("maxmemory"):
+            memory["used_pct_of_max"] = round(100 * memory["used_memory"] / memory["maxmemory"], 1)
+        summary["memory"] = memory
+    if "stats" in info:
+        stats = _pick(info["stats"], _STATS_FIELDS)
+        lookups = stats.get("keyspace_hits", 0) + stats.get("keyspace_misses", 0)
+        if lookups:
+            stats["hit_ratio"] = round(stats["keyspace_hits"] / lookups, 4)
+        summary["stats"] = stats
+    if "replication" in info:
+        replication = info["replication"]
+        summary["replication"] = _pick(replication, _REPLICATION_FIELDS)
+        offset = replication.get("master_repl_offset")
+        replicas = []
+        for i in range(replication.get("connected_slaves", 0)):
+            replica = replication.get(f"slave{i}")
+            if isinstance(replica, dict):
+                entry = _pick(replica, ("ip", "port", "state", "lag"))
+                if offset is not None and "offset" in replica:
+                    entry["lag_bytes"] = offset - replica["offset"]
+                replicas.append(entry)
+        if replicas:
+            summary["replication"]["replicas"] = replicas
+    if "keyspace" in info:
+        summary["keyspace"] = {
+            db: _pick(stats, ("keys", "expires", "avg_ttl"))
+            for db, stats in info["keyspace"].items()
+            if isinstance(stats, dict)
+        }
+    return summary
+
+
+def summarize_slowlog(entries: list[dict], limit: int = 10) -> dict[str, Any]:
+    """Slow commands grouped by command name, plus the slowest individual entries."""
+    by_command: dict[str, dict[str, int]] = {}
+    for entry in entries:
+        name = (entry.get("command") or "").split(" ", 1)[0].upper() or "?"
+        stats = by_command.setdefault(name, {"count": 0, "total_us": 0, "max_us": 0})
+        stats["count"] += 1
+        stats["total_us"] += entry["duration"]
+        stats["max_us"] = max(stats["max_us"], entry["duration"])
+    slowest = sorted(entries, key=lambda entry: entry["duration"], reverse=True)[:limit]
+    return {
+        "entries": len(entries),
+        "by_command": dict(sorted(by_command.items(), key=lambda item: item[1]["total_us"], reverse=True)),
+        "slowest": [
+            {
+                "id": entry["id"],
+                "start_time": entry["start_time"],
+                "duration_us": entry["duration"],
+                "command": _command(entry.get("command") or ""),
+                **({"client": entry["client_address"]} if entry.get("client_address") else {}),
+                **({"client_name": entry["client_name"]} if entry.get("client_name") else {}),
+            }
+            for entry in slowest
+        ],
+    }
+
+
+def summarize_latency(latest: list, history: dict[str, list]) -> list[dict[str, Any]]:
+    """
+    One entry per LATENCY LATEST event with its latest and all-time maximum
+    spike, and the count, average and maximum of the samples LATENCY HISTORY
+    still holds for it (up to 160, one per second with a spike).
+    """
+    events = []
+    for event, timestamp, latest_ms, max_ms, *_ in latest:
+        entry = {
+            "event": event,
+            "last_spike_at": int(timestamp),
+            "latest_ms": int(latest_ms),
+            "max_ms": int(max_ms),
+        }
+        samples = [int(ms) for _, ms in history.get(event) or []]
+        if samples:
+            entry["history"] = {
+                "samples": len(samples),
+                "avg_ms": round(sum(samples) / len(samples), 1),
+                "max_ms": max(samples),
+            }
+        events.append(entry)
+    return sorted(events, key=lambda entry: entry["max_ms"], reverse=True)
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def summarize_clients(clients: list[dict], idle_threshold_s: int = 300, limit: int = 10) -> dict[str, Any]:
+    """
+    Connection counts by client name, address host, last command and flags,
+    the number idle for at least `idle_threshold_s`, and the clients holding
+    the largest output buffers and the most memory.
+    """
+
+    def brief(client: dict) -> dict[str, Any]:
+        return {
+            "id": client.get("id"),
+            "addr": client.get("addr"),
+            "name": client.get("name") or None,
+            "cmd": client.get("cmd"),
+            "idle_s": _int(client.get("idle")),
+            "omem": _int(client.get("omem")),
+            "tot_mem": _int(client.get("tot-mem")),
+        }
+
+    def top(counter: Counter) -> dict[str, int]:
+        return dict(counter.most_common(limit))
+
+    return {
+        "connections": len(clients),
+        "by_name": top(Counter(client.get("name") or "(unnamed)" for client in clients)),
+        "by_host": top(Counter((client.get("addr") or "").rsplit(":", 1)[0] for client in clients)),
+        "by_cmd": top(Counter(client.get("cmd") or "?" for client in clients)),
+        "by_flags": top(Counter(client.get("flags") or "N" for client in clients)),
+        "blocked": sum(1 for client in clients if "b" in (client.get("flags") or "")),
+        "idle_over_threshold": sum(1 for client in clients if _int(client.get("idle")) >= idle_threshold_s),
+        "largest_output_buffers": [
+            brief(client)
+            for client in sorted(clients, key=lambda c: _int(c.get("omem")), reverse=True)[:limit]
+            if _int(client.get("omem"))
+        ],
+        "most_memory": [
+            brief(client) for client in sorted(clients, key=lambda c: _int(c.get("tot-mem")), reverse=True)[:limit]
+        ],
+    }
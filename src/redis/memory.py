@@ -0,0 +1,110 @@
+"""Aggregate Redis key memory usage by key prefix."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+NO_PREFIX = "(no prefix)"
+
+# TTL buckets in seconds, checked in order; keys without an expiry go to "none".
+TTL_BUCKETS = ((3600, "<1h"), (86_400, "<1d"), (7 * 86_400, "<7d"))
+
+
+def key_prefix(key: str, depth: int, separator: str = ":") -> str:
+    """
+    The key family a key belongs to: its first `depth` segments, never including
+    the last one, which is usually an id. "user:42:cart" at depth 2 is "user:42:*"
+    and "session:abc" at any depth is "session:*".
+    """
+    parts = key.split(separator)
+    kept = parts[: min(depth, len(parts) - 1)]
+    if not kept:
+        return NO_PREFIX
+    return separator.join(kept) + separator + "*"
+
+
+def ttl_bucket(ttl: int | None) -> str:
+    if ttl is None or ttl < 0:
+        return "none"
+    for limit, label in TTL_BUCKETS:
+        if ttl < limit:
+            return label
+    return ">=7d"
+
+
+def _percentile(sorted_values: list[int], pct: float) -> int:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+@dataclass
+class _PrefixStats:
+    sizes: list[int] = field(default_factory=list)
+    types: Counter = field(default_factory=Counter)
+    ttls: Counter = field(default_factory=Counter)
+
+
+class MemoryReport:
+    """Running per-prefix totals plus the biggest keys seen, fed one key at a time."""
+
+    def __init__(self, depth: int = 2, separator: str = ":", top_n: int = 20):
+        self._depth = depth
+        self._separator = separator
+        self._top_n = top_n
+        self._prefixes: dict[str, _PrefixStats] = {}
+        self._biggest: list[tuple[int, str, str]] = []
+
+    def add(self, key: str, type_: str, size: int | None, ttl: int | None) -> None:
+        size = size or 0
+        stats = self._prefixes.setdefault(key_prefix(key, self._depth, self._separator), _PrefixStats())
+        stats.sizes.append(size)
+        stats.types[type_] += 1
+        stats.ttls[ttl_bucket(ttl)] += 1
+        entry = (size, key, type_)
+        if len(self._biggest) < self._top_n:
+            heapq.heappush(self._biggest, entry)
+        elif entry > self._biggest[0]:
+            heapq.heapreplace(self._biggest, entry)
+
+    def report(self, sample_rate: float = 1.0, max_prefixes: int = 50) -> dict[str, Any]:
+        """
+        Prefixes ordered by total bytes. With sampling, key counts and byte totals
+        are also given as estimates for the whole keyspace; percentiles and
+        distributions are those of the sample.
+        """
+        prefixes = []
+        for prefix, stats in self._prefixes.items():
+            sizes = sorted(stats.sizes)
+            total = sum(sizes)
+            entry = {
+                "prefix": prefix,
+                "keys": len(sizes),
+                "bytes": total,
+                "avg_bytes": round(total / len(sizes)),
+                "p99_bytes": _percentile(sizes, 99),
+                "max_bytes": sizes[-1],
+                "types": dict(stats.types.most_common()),
+                "ttl": dict(stats.ttls.most_common()),
+            }
+            if sample_rate < 1:
+                entry["estimated_keys"] = round(len(sizes) / sample_rate)
+                entry["estimated_bytes"] = round(total / sample_rate)
+            prefixes.append(entry)
+        prefixes.sort(key=lambda p: p["bytes"], reverse=True)
+        total_bytes = sum(p["bytes"] for p in prefixes)
+        return {
+            "keys": sum(p["keys"] for p in prefixes),
+            "bytes": total_bytes,
+            "estimated_total_bytes": round(total_bytes / sample_rate),
+            "prefix_count": len(prefixes),
+            "prefixes": prefixes[:max_prefixes],
+            "biggest_keys": [
+                {"key": key, "type": type_, "bytes": size}
+                for size, key, type_ in sorted(self._biggest, reverse=True)
+            ],
+        }
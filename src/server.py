@@ -22,8 +22,42 @@ def _make_server(name: str) -> FastMCP:
     return FastMCP(f"local-mcp-{name}", host="0.0.0.0", port=PORTS[name])
 
 
+def _report_background_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        error = task.exception()
+        print(f"background task failed ({type(error).__name__}: {error})")
+
+
+async def _prewarm_postgres() -> None:
+    """
+    Open the pools of every PostgreSQL host with POSTGRES_PREWARM enabled, concurrently,
+    then keep all pools healthy with periodic liveness probes if
+    POSTGRES_PROBE_INTERVAL_S is set. Runs in the background so the servers start
+    listening immediately.
+    """
+    from src.tools import postgres_clients, postgres_pool_manager
+
+    targets = [
+        (f"{host}/{env}", client)
+        for (host, env), client in sorted(postgres_clients.items())
+        if config.postgres_settings(host).prewarm
+    ]
+    results = await asyncio.gather(
+        *(client.prewarm() for _, client in targets), return_exceptions=True
+    )
+    for (name, _), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            print(f"postgres prewarm {name}: failed ({type(result).__name__}: {result})")
+        else:
+            print(f"postgres prewarm {name}: connected in {result * 1000:.0f} ms")
+
+    if config.postgres_probe_interval_s > 0:
+        await postgres_pool_manager.maintain(config.postgres_probe_interval_s)
+
+
 async def main() -> None:
     servers: list[FastMCP] = []
+    background: list = []
 
     if config.enable_jira or config.enable_confluence or config.enable_bitbucket:
         mcp = _make_server("atlassian")
@@ -43,6 +77,7 @@ async def main() -> None:
         from src.tools import postgres
         postgres.register(mcp)
         servers.append(mcp)
+        background.append(_prewarm_postgres())
 
     if config.enable_redis:
         mcp = _make_server("redis")
@@ -91,6 +126,10 @@ async def main() -> None:
         print("No clients enabled. Set at least one ENABLE_* env var to true.")
         return
 
+    # Background work runs detached: if it fails, the servers keep running.
+    tasks = [asyncio.create_task(job) for job in background]
+    for task in tasks:
+        task.add_done_callback(_report_background_failure)
     await asyncio.gather(*[s.run_streamable_http_async() for s in servers])
 
 
@@ -6,6 +6,7 @@ config = Config()
 jira_cloud_client = None
 bitbucket_client = None
 obsidian_client = None
+postgres_pool_manager = None
 
 # Per-environment client registries: {"dev": Client, "qa": Client, "uat": Client, "prod": Client}
 redis_clients: dict[str, "RedisClient"] = {}
@@ -29,19 +30,31 @@ if config.enable_bitbucket:
     bitbucket_client = BitbucketClient(config)
 
 if config.enable_postgres:
-    from src.clients.postgres import PostgresClient
+    from src.clients.postgres import PostgresClient, PostgresPoolManager
 
+    # One pool manager shared by every host so the connection cap is global.
+    postgres_pool_manager = PostgresPoolManager(config.postgres_max_total_connections)
     for _host, _env_urls in config.postgres_host_urls.items():
         for _env, _url in _env_urls.items():
             if _url:
-                postgres_clients[(_host, _env)] = PostgresClient(_url)
+                postgres_clients[(_host, _env)] = PostgresClient(
+                    _url,
+                    name=f"{_host}/{_env}",
+                    settings=config.postgres_settings(_host),
+                    pool_manager=postgres_pool_manager,
+                    replica_urls=config.postgres_replica_urls.get(_host, {}).get(_env),
+                )
 
 if config.enable_redis:
     from src.clients.redis import RedisClient
 
     for _env, _url in config.redis_urls.items():
         if _url:
-            redis_clients[_env] = RedisClient(_url)
+            redis_clients[_env] = RedisClient(
+                _url,
+                mode=config.redis_modes.get(_env) or "standalone",
+                sentinel_master=config.redis_sentinel_masters.get(_env, ""),
+            )
 
 if config.enable_kafka:
     from src.clients.kafka import KafkaClient
@@ -120,3 +133,19 @@ def resolve_postgres_client(host: str, environment: str) -> "PostgresClient":
             f"Available host/environment combos: {available}."
         )
     return client
+
+
+def resolve_postgres_clients(
+    host: str, environment: str | list[str]
+) -> list[tuple[str, "PostgresClient"]]:
+    """Resolve "all", a list of environments, or one environment to (environment, client) pairs for a host."""
+    if environment == "all":
+        targets = sorted((e, c) for (h, e), c in postgres_clients.items() if h == host)
+        if not targets:
+            hosts = ", ".join(sorted({h for h, _ in postgres_clients})) or "none"
+            raise ValueError(
+                f"No postgres clients configured for host '{host}'. Available hosts: {hosts}."
+            )
+        return targets
+    environments = [environment] if isinstance(environment, str) else environment
+    return [(env, resolve_postgres_client(host, env)) for env in environments]
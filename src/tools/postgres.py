@@ -1,8 +1,50 @@
+import asyncio
 import json
+import os
+import time
 
 from mcp.server.fastmcp import FastMCP
 
-from src.tools import resolve_postgres_client
+from src.postgres.activity import ACTIVITY_SQL, summarize_activity
+from src.postgres.diff import diff_columns, diff_rows, diff_schemas
+from src.postgres.encoding import ResultFormat, encode_rows, encode_value, to_columns
+from src.postgres.guard import UNCHECKABLE, classify, rejection, violations, with_limit
+from src.postgres.health import TABLE_HEALTH_SQL, findings
+from src.postgres.explain import RELATION_ROWS_SQL, seq_scan_relations, summarize_plan
+from src.postgres.profile import COLUMN_STATS_SQL, profile_column
+from src.postgres.query_cache import QueryCache, normalize_sql
+from src.postgres.sampling import (
+    ROW_ESTIMATE_SQL,
+    SAMPLEABLE_KINDS,
+    SampleMethod,
+    quote_ident,
+    sample_percent,
+    sample_sql,
+)
+from src.postgres.statements import (
+    EXTENSION_SQL,
+    StatementOrder,
+    cumulative,
+    rank_statements,
+    statement_deltas,
+    statements_sql,
+)
+from src.tools import (
+    config,
+    postgres_clients,
+    postgres_pool_manager,
+    resolve_postgres_client,
+    resolve_postgres_clients,
+)
+
+# Hard ceilings for the per-call pg_query budgets.
+MAX_ROWS_LIMIT = 10_000
+MAX_BYTES_LIMIT = 5_000_000
+MAX_TIMEOUT_MS = 3_600_000
+MAX_BATCH_STATEMENTS = 50
+
+# Opt-in pg_query result cache shared by every host; entries expire per host TTL.
+query_cache = QueryCache(config.postgres_query_cache_max_bytes)
 
 
 def _serialize(rows: list[dict]) -> str:
@@ -18,10 +60,176 @@ def _client(host: str, environment: str):
     return resolve_postgres_client(host, environment)
 
 
+def _fans_out(environment: str | list[str]) -> bool:
+    return not isinstance(environment, str) or environment == "all"
+
+
+def _host_targets(host: str | list[str], environment: str | list[str]) -> list[tuple[str, object]]:
+    """("host/environment", client) pairs for one or several hosts and environments."""
+    hosts = [host] if isinstance(host, str) else host
+    return [
+        (f"{h}/{env}", client)
+        for h in hosts
+        for env, client in resolve_postgres_clients(h, environment)
+    ]
+
+
+async def _run_all(targets: list[tuple[str, object]], operation) -> tuple[list[tuple[str, object]], dict[str, str]]:
+    """Run one operation per environment concurrently, keeping per-environment errors apart."""
+    results = await asyncio.gather(
+        *(operation(environment, client) for environment, client in targets),
+        return_exceptions=True,
+    )
+    successes: list[tuple[str, object]] = []
+    errors: dict[str, str] = {}
+    for (environment, _), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            errors[environment] = f"{type(result).__name__}: {result}"
+        else:
+            successes.append((environment, result))
+    return successes, errors
+
+
+def _render(rows: list[dict], truncated_reason: str | None, fmt: ResultFormat) -> str:
+    """Encode one environment's rows, marking a truncated result in a format-appropriate way."""
+    if truncated_reason is None:
+        return encode_rows(rows, fmt)
+    marker = {"row_count": len(rows), "truncated": True, "truncated_reason": truncated_reason}
+    if fmt == "json":
+        return json.dumps({"rows": rows, **marker}, default=str, indent=2)
+    if fmt == "columns":
+        return json.dumps({**to_columns(rows), **marker}, default=str, separators=(",", ":"))
+    return encode_rows(rows, fmt) + f"# truncated after {len(rows)} rows ({truncated_reason})\n"
+
+
+def _cost_guarded(host: str) -> bool:
+    settings = config.postgres_settings(host)
+    return bool(settings.cost_guard_max_cost or settings.cost_guard_max_rows)
+
+
+async def _apply_cost_guard(explain, host: str, sql: str, max_rows: int) -> tuple[str, int | None]:
+    """
+    Check a query's estimated cost and rows against the host's cost guard,
+    planning it with `explain(sql) -> plan`.
+
+    Returns the SQL to run and, if the guard wrapped it in a LIMIT, that limit.
+    Raises ValueError with the plan summary if the query is refused, and for
+    statements the guard cannot check.
+    """
+    settings = config.postgres_settings(host)
+    max_cost, max_plan_rows = settings.cost_guard_max_cost, settings.cost_guard_max_rows
+    if not (max_cost or max_plan_rows):
+        return sql, None
+    kind, plannable = classify(sql)
+    if kind == "passthrough":
+        return sql, None
+    if kind == "unknown":
+        raise ValueError(json.dumps({"error": UNCHECKABLE}))
+    plan = await explain(plannable)
+    found = violations(plan, max_cost, max_plan_rows)
+    if not found:
+        return sql, None
+    if kind == "query" and settings.cost_guard_action == "limit":
+        limit = min(max_rows + 1, max_plan_rows) if max_plan_rows else max_rows + 1
+        limited = with_limit(sql, limit)
+        plan = await explain(limited)
+        found = violations(plan, max_cost, 0)
+        if not found:
+            return limited, limit
+    raise ValueError(json.dumps(rejection(plan, found), default=str))
+
+
+async def _guarded_sql(
+    client, host: str, db: str, sql: str, max_rows: int, timeout_ms: int | None
+) -> tuple[str, int | None]:
+    """_apply_cost_guard with plans read in a read-only transaction of their own."""
+    return await _apply_cost_guard(
+        lambda query: client.explain(_db_name(db), query, timeout_ms=timeout_ms), host, sql, max_rows
+    )
+
+
+def _limited_reason(rows: list[dict], truncated_reason: str | None, limit: int | None) -> str | None:
+    """Report rows cut short by a cost-guard LIMIT as such rather than as a plain budget hit."""
+    if limit is not None and (truncated_reason == "max_rows" or len(rows) >= limit):
+        return "cost_guard_limit"
+    return truncated_reason
+
+
+async def _fetch_rows(
+    client,
+    host: str,
+    environment: str,
+    db: str,
+    sql: str,
+    max_rows: int,
+    max_bytes: int,
+    timeout_ms: int | None,
+    cache: bool,
+) -> tuple[list[dict], str | None]:
+    """Cost-guarded fetch_capped, optionally answered from or stored into the query cache."""
+    if cache:
+        key = (host, environment, db.strip(), normalize_sql(sql), max_rows, max_bytes)
+        cached = query_cache.get(key)
+        if cached is not None:
+            return cached
+    guarded_sql, limit = await _guarded_sql(client, host, db, sql, max_rows, timeout_ms)
+    rows, truncated_reason = await client.fetch_capped(
+        _db_name(db), guarded_sql, max_rows=max_rows, max_bytes=max_bytes, timeout_ms=timeout_ms
+    )
+    truncated_reason = _limited_reason(rows, truncated_reason, limit)
+    if cache:
+        query_cache.put(
+            key,
+            (rows, truncated_reason),
+            len(json.dumps(rows, default=str)),
+            config.postgres_settings(host).query_cache_ttl_s,
+        )
+    return rows, truncated_reason
+
+
+def _timeout(timeout_ms: int) -> int | None:
+    """0 means use the host's default statement timeout."""
+    if timeout_ms < 0 or timeout_ms > MAX_TIMEOUT_MS:
+        raise ValueError(f"timeout_ms must be between 0 and {MAX_TIMEOUT_MS}.")
+    return timeout_ms or None
+
+
 def register(mcp: FastMCP) -> None:
     @mcp.tool()
-    async def pg_query(sql: str, host: str, environment: str, db: str = "") -> str:
-        """Run a read-only SQL query against PostgreSQL and return results as JSON.
+    async def pg_query(
+        sql: str,
+        host: str,
+        environment: str | list[str],
+        db: str = "",
+        max_rows: int = 500,
+        max_bytes: int = 256_000,
+        timeout_ms: int = 0,
+        diff: bool = False,
+        format: ResultFormat = "json",
+        cache: bool = False,
+    ) -> str:
+        """Run a read-only SQL query against PostgreSQL and return the rows.
+
+        Rows are streamed through a server-side cursor and reading stops once
+        `max_rows` rows or roughly `max_bytes` of JSON have been collected. A
+        truncated result is returned as an object with the rows read so far and a
+        `truncated_reason`; a complete result is returned as a plain JSON array.
+
+        `format` trades readability for size: "columns" sends column names once and
+        each row as a value array, "csv" and "jsonl" are line-oriented. For csv and
+        jsonl a truncated result ends with a "# truncated ..." line.
+
+        With cache=True a repeat of the same query (same host, environment, db,
+        normalized SQL and budgets) within the host's cache TTL is answered from
+        memory without contacting the database.
+
+        If the host has a cost guard configured, the query is explained first and
+        refused with a plan summary when its estimated cost or rows exceed the
+        host's thresholds, or wrapped in a LIMIT when the host's action is "limit"
+        (reported as truncated_reason "cost_guard_limit").
+
+        With environment="all" or a list of environments the query runs concurrently
+        against each one and results and errors are reported per environment.
 
         Credentials are configured server-side per host/environment and never
         passed by the caller.
@@ -29,51 +237,287 @@ def register(mcp: FastMCP) -> None:
         Args:
             sql: SQL query to run (read-only).
             host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod), a list of them, or "all".
+            db: Database name on that host. Leave empty to use the host's default database.
+            max_rows: Maximum number of rows to return per environment (default: 500).
+            max_bytes: Approximate response size budget in bytes per environment (default: 256000).
+            timeout_ms: Statement timeout in milliseconds. 0 uses the host's default.
+            diff: With several environments, also report rows not returned by every environment.
+            format: Row encoding: json (default), columns, csv or jsonl.
+            cache: Serve and store the result in the read-only query cache.
+        """
+        if max_rows < 1 or max_rows > MAX_ROWS_LIMIT:
+            raise ValueError(f"max_rows must be between 1 and {MAX_ROWS_LIMIT}.")
+        if max_bytes < 1 or max_bytes > MAX_BYTES_LIMIT:
+            raise ValueError(f"max_bytes must be between 1 and {MAX_BYTES_LIMIT}.")
+        timeout = _timeout(timeout_ms)
+        if _fans_out(environment):
+            targets = resolve_postgres_clients(host, environment)
+            successes, errors = await _run_all(
+                targets,
+                lambda env, client: _fetch_rows(
+                    client, host, env, db, sql, max_rows, max_bytes, timeout, cache
+                ),
+            )
+            results = {
+                env: {
+                    "row_count": len(rows),
+                    "truncated_reason": reason,
+                    "rows": encode_value(rows, format),
+                }
+                for env, (rows, reason) in successes
+            }
+            payload = {
+                "host": host,
+                "environments": [env for env, _ in targets],
+                "results": results,
+                "errors": errors,
+            }
+            if diff:
+                payload["diff"] = diff_rows({env: rows for env, (rows, _) in successes})
+            return json.dumps(payload, default=str, indent=2 if format == "json" else None)
+
+        rows, truncated_reason = await _fetch_rows(
+            _client(host, environment), host, environment, db, sql, max_rows, max_bytes, timeout, cache
+        )
+        return _render(rows, truncated_reason, format)
+
+    @mcp.tool()
+    async def pg_query_batch(
+        statements: list[str],
+        host: str,
+        environment: str,
+        db: str = "",
+        max_rows: int = 500,
+        max_bytes: int = 256_000,
+        timeout_ms: int = 0,
+        format: ResultFormat = "json",
+    ) -> str:
+        """Run several small read-only queries in one transaction on one connection.
+
+        Saves a pool acquire and a transaction per statement compared with
+        separate pg_query calls. Each statement runs in its own savepoint, so a
+        failing one is reported without aborting the rest. Results are keyed by
+        the statement's index and carry their own timing; the row and byte
+        budgets apply per statement. The host's cost guard checks every statement
+        on the batch's connection before any of them runs.
+
+        Args:
+            statements: SQL queries to run (read-only), at most 50.
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
             environment: Target environment (dev, qa, uat, prod).
             db: Database name on that host. Leave empty to use the host's default database.
+            max_rows: Maximum number of rows to return per statement (default: 500).
+            max_bytes: Approximate response size budget in bytes per statement (default: 256000).
+            timeout_ms: Statement timeout in milliseconds, per statement. 0 uses the host's default.
+            format: Row encoding: json (default), columns, csv or jsonl.
         """
-        rows = await _client(host, environment).fetch(_db_name(db), sql)
-        return _serialize(rows) or "No rows returned."
+        if not statements or len(statements) > MAX_BATCH_STATEMENTS:
+            raise ValueError(f"statements must contain between 1 and {MAX_BATCH_STATEMENTS} queries.")
+        if max_rows < 1 or max_rows > MAX_ROWS_LIMIT:
+            raise ValueError(f"max_rows must be between 1 and {MAX_ROWS_LIMIT}.")
+        if max_bytes < 1 or max_bytes > MAX_BYTES_LIMIT:
+            raise ValueError(f"max_bytes must be between 1 and {MAX_BYTES_LIMIT}.")
+        timeout = _timeout(timeout_ms)
+        client = _client(host, environment)
+
+        # The guard runs once per statement, in order, on the batch connection;
+        # limits[i] is the LIMIT it wrapped statement i in, if any.
+        limits: list[int | None] = []
+
+        async def guard(explain, sql: str) -> str:
+            limits.append(None)
+            guarded_sql, limits[-1] = await _apply_cost_guard(explain, host, sql, max_rows)
+            return guarded_sql
+
+        started = time.perf_counter()
+        batch = await client.fetch_batch(
+            _db_name(db),
+            statements,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            timeout_ms=timeout,
+            **({"guard": guard} if _cost_guarded(host) else {}),
+        )
+        results: dict[str, dict] = {}
+        for index, entry in enumerate(batch):
+            if "rows" in entry:
+                limit = limits[index] if index < len(limits) else None
+                rows = entry.pop("rows")
+                entry["truncated_reason"] = _limited_reason(rows, entry["truncated_reason"], limit)
+                entry = {"row_count": len(rows), **entry, "rows": encode_value(rows, format)}
+            results[str(index)] = entry
+        payload = {
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            "results": results,
+        }
+        return json.dumps(payload, default=str, indent=2 if format == "json" else None)
+
+    @mcp.tool()
+    async def pg_export(
+        sql: str,
+        host: str,
+        environment: str,
+        db: str = "",
+        filename: str = "",
+        compress: bool = False,
+        timeout_ms: int = 0,
+    ) -> str:
+        """Export a read-only query's full result to a local CSV file with COPY.
+
+        Streams `COPY (sql) TO STDOUT WITH (FORMAT csv, HEADER)` straight into a
+        file in the server's export directory, optionally gzip-compressed, without
+        decoding rows, so memory stays constant for results of any size. Returns
+        the file path, row count and size instead of the rows.
+
+        If the host has a cost guard, a query whose estimated cost exceeds it is refused.
+
+        Args:
+            sql: SQL query to export (read-only).
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            db: Database name on that host. Leave empty to use the host's default database.
+            filename: File name inside the export directory. Leave empty for a generated name.
+            compress: Write gzip-compressed CSV (.csv.gz).
+            timeout_ms: Statement timeout in milliseconds. 0 uses the host's default.
+        """
+        timeout = _timeout(timeout_ms)
+        client = _client(host, environment)
+        suffix = ".csv.gz" if compress else ".csv"
+        name = os.path.basename(filename.strip()) or (
+            f"{host}-{environment}-{time.strftime('%Y%m%d-%H%M%S')}{suffix}"
+        )
+        os.makedirs(config.postgres_export_dir, exist_ok=True)
+        path = os.path.join(config.postgres_export_dir, name)
+        if os.path.exists(path):
+            raise ValueError(f"Export file '{path}' already exists.")
+
+        max_cost = config.postgres_settings(host).cost_guard_max_cost
+        if max_cost:
+            kind, plannable = classify(sql)
+            if kind == "unknown":
+                raise ValueError(json.dumps({"error": UNCHECKABLE}))
+            if kind != "passthrough":
+                plan = await client.explain(_db_name(db), plannable, timeout_ms=timeout)
+                found = violations(plan, max_cost, 0)
+                if found:
+                    raise ValueError(json.dumps(rejection(plan, found), default=str))
+
+        started = time.perf_counter()
+        rows, received = await client.copy_to_file(
+            _db_name(db), sql.strip().rstrip(";"), path, compress=compress, timeout_ms=timeout
+        )
+        result = {
+            "path": path,
+            "row_count": rows,
+            "bytes": os.path.getsize(path),
+            "uncompressed_bytes": received,
+            "compressed": compress,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    async def pg_explain(
+        sql: str,
+        host: str,
+        environment: str,
+        db: str = "",
+        analyze: bool = False,
+        top_n: int = 5,
+        large_table_rows: int = 100_000,
+        timeout_ms: int = 0,
+    ) -> str:
+        """Explain a query and summarise its plan hot spots instead of returning the raw plan.
+
+        Runs EXPLAIN (FORMAT JSON, BUFFERS) in a read-only transaction and reports the
+        costliest nodes, row-estimate misses, seq scans on large relations and
+        sort/hash spills.
+
+        Args:
+            sql: SQL query to explain (read-only).
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            db: Database name on that host. Leave empty to use the host's default database.
+            analyze: Also execute the query (EXPLAIN ANALYZE) to get actual rows, timings and spills.
+            top_n: Number of costliest nodes to report (default: 5).
+            large_table_rows: Flag seq scans on relations with at least this many rows (default: 100000).
+            timeout_ms: Statement timeout in milliseconds. 0 uses the host's default.
+        """
+        if top_n < 1 or top_n > 50:
+            raise ValueError("top_n must be between 1 and 50.")
+        client = _client(host, environment)
+        plan = await client.explain(
+            _db_name(db), sql, analyze=analyze, timeout_ms=_timeout(timeout_ms)
+        )
+        relations = seq_scan_relations(plan["Plan"])
+        relation_rows = {}
+        if relations:
+            rows = await client.fetch(_db_name(db), RELATION_ROWS_SQL, relations)
+            relation_rows = {r["relname"]: r["reltuples"] for r in rows}
+        summary = summarize_plan(
+            plan, relation_rows, top_n=top_n, large_table_rows=large_table_rows
+        )
+        return json.dumps(summary, indent=2)
 
     @mcp.tool()
     async def pg_list_tables(host: str, environment: str, schema: str = "public", db: str = "") -> str:
         """List all tables in a PostgreSQL schema.
 
+        Answered from the host's cached schema snapshot, which is reloaded only
+        when the catalog changes.
+
         Args:
             host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
             environment: Target environment (dev, qa, uat, prod).
             schema: Schema name (default: public).
             db: Database name on that host. Leave empty to use the host's default database.
         """
-        rows = await _client(host, environment).fetch(
-            _db_name(db),
-            "SELECT table_name FROM information_schema.tables WHERE table_schema = $1 ORDER BY table_name",
-            schema,
-        )
-        return "\n".join(r["table_name"] for r in rows) or "No tables found."
+        snapshot = await _client(host, environment).schema(_db_name(db))
+        return "\n".join(snapshot.tables(schema)) or "No tables found."
 
     @mcp.tool()
     async def pg_describe_table(
-        table_name: str, host: str, environment: str, schema: str = "public", db: str = ""
+        table_name: str,
+        host: str,
+        environment: str | list[str],
+        schema: str = "public",
+        db: str = "",
+        diff: bool = False,
     ) -> str:
         """Describe columns of a PostgreSQL table (name, type, nullable, default).
 
+        Answered from the host's cached schema snapshot. With environment="all" or a
+        list of environments, each one is described concurrently; diff=True reports
+        columns that are missing or defined differently between them.
+
         Args:
             table_name: Table name.
             host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
-            environment: Target environment (dev, qa, uat, prod).
+            environment: Target environment (dev, qa, uat, prod), a list of them, or "all".
             schema: Schema name (default: public).
             db: Database name on that host. Leave empty to use the host's default database.
+            diff: With several environments, also report schema drift between them.
         """
-        rows = await _client(host, environment).fetch(
-            _db_name(db),
-            "SELECT column_name, data_type, is_nullable, column_default "
-            "FROM information_schema.columns WHERE table_schema = $1 AND table_name = $2 "
-            "ORDER BY ordinal_position",
-            schema,
-            table_name,
-        )
-        return _serialize(rows) or f"Table '{schema}.{table_name}' not found."
+        if _fans_out(environment):
+            targets = resolve_postgres_clients(host, environment)
+            successes, errors = await _run_all(
+                targets, lambda _, client: client.schema(_db_name(db))
+            )
+            results = {env: snapshot.columns(schema, table_name) for env, snapshot in successes}
+            payload = {
+                "table": f"{schema}.{table_name}",
+                "host": host,
+                "environments": [env for env, _ in targets],
+                "results": results,
+                "errors": errors,
+            }
+            if diff:
+                payload["diff"] = diff_columns(results)
+            return json.dumps(payload, default=str, indent=2)
+
+        snapshot = await _client(host, environment).schema(_db_name(db))
+        return _serialize(snapshot.columns(schema, table_name)) or f"Table '{schema}.{table_name}' not found."
 
     @mcp.tool()
     async def pg_list_indexes(
@@ -81,6 +525,8 @@ def register(mcp: FastMCP) -> None:
     ) -> str:
         """List indexes on a PostgreSQL table.
 
+        Answered from the host's cached schema snapshot.
+
         Args:
             table_name: Table name.
             host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
@@ -88,10 +534,425 @@ def register(mcp: FastMCP) -> None:
             schema: Schema name (default: public).
             db: Database name on that host. Leave empty to use the host's default database.
         """
+        snapshot = await _client(host, environment).schema(_db_name(db))
+        return _serialize(snapshot.indexes(schema, table_name)) or f"No indexes found for '{schema}.{table_name}'."
+
+    @mcp.tool()
+    async def pg_schema_snapshot(
+        host: str, environment: str, schema: str = "public", db: str = ""
+    ) -> str:
+        """Export every table in a schema with its columns, indexes, constraints and foreign keys.
+
+        Built from the cached bulk catalog snapshot. Definitions are flattened to
+        {name: definition} maps and every table carries a content hash, as does the
+        schema as a whole.
+
+        Args:
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            schema: Schema name (default: public).
+            db: Database name on that host. Leave empty to use the host's default database.
+        """
+        snapshot = await _client(host, environment).schema(_db_name(db))
+        return json.dumps(snapshot.export(schema), separators=(",", ":"))
+
+    @mcp.tool()
+    async def pg_schema_diff(
+        host: str,
+        environment: str,
+        other_environment: str,
+        other_host: str = "",
+        schema: str = "public",
+        db: str = "",
+        other_db: str = "",
+    ) -> str:
+        """Compare a schema between two (host, environment, db) targets and report only the differences.
+
+        Both schema snapshots are loaded concurrently. Tables missing on either side
+        are listed, and for tables whose content hashes differ the added, removed
+        and changed columns, indexes, constraints and foreign keys are reported.
+
+        Args:
+            host: Left PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Left environment (dev, qa, uat, prod).
+            other_environment: Right environment (dev, qa, uat, prod).
+            other_host: Right host. Leave empty to use the same host as the left side.
+            schema: Schema name (default: public).
+            db: Left database. Leave empty to use the host's default database.
+            other_db: Right database. Leave empty to use the same value as db.
+        """
+        other_host = other_host or host
+        other_db = other_db or db
+        left_client = _client(host, environment)
+        right_client = _client(other_host, other_environment)
+        left, right = await asyncio.gather(
+            left_client.schema(_db_name(db)), right_client.schema(_db_name(other_db))
+        )
+        result = {
+            "schema": schema,
+            "left": f"{host}/{environment}" + (f"/{db}" if db else ""),
+            "right": f"{other_host}/{other_environment}" + (f"/{other_db}" if other_db else ""),
+            **diff_schemas(left.export(schema), right.export(schema)),
+        }
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    async def pg_table_health(
+        host: str,
+        environment: str,
+        schema: str = "public",
+        table_name: str = "",
+        db: str = "",
+        limit: int = 20,
+    ) -> str:
+        """Report health indicators for one table or the largest tables in a schema.
+
+        One batched catalog query returns live/dead tuples, last vacuum/analyze,
+        seq-scan versus index-scan counts, heap and index cache hit ratios,
+        table/index/toast sizes and never-scanned non-unique indexes, plus short
+        findings for the indicators that look unhealthy.
+
+        Args:
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            schema: Schema name (default: public).
+            table_name: Table name. Leave empty to report the largest tables in the schema.
+            db: Database name on that host. Leave empty to use the host's default database.
+            limit: Maximum number of tables to report when table_name is empty (default: 20).
+        """
+        if limit < 1 or limit > 500:
+            raise ValueError("limit must be between 1 and 500.")
         rows = await _client(host, environment).fetch(
+            _db_name(db), TABLE_HEALTH_SQL, schema, table_name, limit, primary=True
+        )
+        if not rows:
+            target = f"{schema}.{table_name}" if table_name else f"schema '{schema}'"
+            return f"No table statistics found for {target}."
+        for row in rows:
+            if isinstance(row["unused_indexes"], str):
+                row["unused_indexes"] = json.loads(row["unused_indexes"])
+            row["findings"] = findings(row)
+        return json.dumps(rows, default=str, indent=2)
+
+    @mcp.tool()
+    async def pg_sample_table(
+        table_name: str,
+        host: str,
+        environment: str,
+        schema: str = "public",
+        rows: int = 100,
+        method: SampleMethod = "system",
+        columns: list[str] | None = None,
+        seed: int | None = None,
+        db: str = "",
+        max_bytes: int = 256_000,
+        timeout_ms: int = 0,
+        format: ResultFormat = "json",
+    ) -> str:
+        """Return a random sample of a table's rows using TABLESAMPLE.
+
+        The sampling percentage is chosen from the planner's row estimate
+        (pg_class.reltuples) so that roughly `rows` rows are read, which keeps a
+        sample of a huge table to a few pages of I/O instead of the biased
+        `SELECT * ... LIMIT n`. "system" samples whole pages (cheapest);
+        "bernoulli" samples individual rows (less clustered, reads every page).
+
+        Args:
+            table_name: Table, partitioned table or materialized view to sample.
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            schema: Schema name (default: public).
+            rows: Number of rows to return (default: 100).
+            method: Sampling method: system (default) or bernoulli.
+            columns: Columns to project. Leave empty for every column in the table.
+            seed: Optional REPEATABLE seed for a reproducible sample.
+            db: Database name on that host. Leave empty to use the host's default database.
+            max_bytes: Approximate response size budget in bytes (default: 256000).
+            timeout_ms: Statement timeout in milliseconds. 0 uses the host's default.
+            format: Row encoding: json (default), columns, csv or jsonl.
+        """
+        if rows < 1 or rows > MAX_ROWS_LIMIT:
+            raise ValueError(f"rows must be between 1 and {MAX_ROWS_LIMIT}.")
+        if max_bytes < 1 or max_bytes > MAX_BYTES_LIMIT:
+            raise ValueError(f"max_bytes must be between 1 and {MAX_BYTES_LIMIT}.")
+        if method not in ("system", "bernoulli"):
+            raise ValueError("method must be one of: system, bernoulli.")
+        timeout = _timeout(timeout_ms)
+        client = _client(host, environment)
+        snapshot = await client.schema(_db_name(db))
+        relation = snapshot.relations.get((schema, table_name))
+        if relation is None:
+            return f"Table '{schema}.{table_name}' not found."
+        if relation["kind"] not in SAMPLEABLE_KINDS:
+            raise ValueError(
+                f"'{schema}.{table_name}' is not a table or materialized view; "
+                "TABLESAMPLE cannot be used on it."
+            )
+        available = [c["column_name"] for c in relation["columns"]]
+        if columns:
+            unknown = [c for c in columns if c not in available]
+            if unknown:
+                raise ValueError(
+                    f"Unknown columns for '{schema}.{table_name}': {', '.join(unknown)}."
+                )
+        projection = columns or available
+
+        estimate = await client.fetch(_db_name(db), ROW_ESTIMATE_SQL, schema, table_name)
+        estimated_rows = estimate[0]["reltuples"] if estimate else -1
+        percent = sample_percent(rows, estimated_rows, method)
+        sql = sample_sql(schema, table_name, projection, method, percent, rows, seed)
+        sampled, truncated_reason = await client.fetch_capped(
+            _db_name(db), sql, max_rows=rows, max_bytes=max_bytes, timeout_ms=timeout
+        )
+        result = {
+            "table": f"{schema}.{table_name}",
+            "method": method,
+            "percent": percent,
+            "estimated_rows": int(estimated_rows) if estimated_rows >= 0 else None,
+            "row_count": len(sampled),
+            "truncated_reason": truncated_reason,
+            "rows": encode_value(sampled, format),
+        }
+        return json.dumps(result, default=str, indent=2 if format == "json" else None)
+
+    @mcp.tool()
+    async def pg_activity(
+        host: str | list[str],
+        environment: str | list[str],
+        long_running_s: float = 60.0,
+        query_chars: int = 200,
+        limit: int = 20,
+        db: str = "",
+    ) -> str:
+        """Show what the database is doing now: sessions, long transactions and lock blocking chains.
+
+        One query over pg_stat_activity, pg_locks and pg_blocking_pids() per target
+        returns client sessions grouped by state and by wait event, the longest
+        running open transactions, and a tree of blocking sessions with the
+        sessions they block nested underneath, each with the lock it waits for.
+        Several hosts and environments are inspected concurrently.
+
+        Args:
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant), or a list of hosts.
+            environment: Target environment (dev, qa, uat, prod), a list of them, or "all".
+            long_running_s: Report transactions open for at least this many seconds (default: 60).
+            query_chars: Truncate each query text to this many characters (default: 200).
+            limit: Maximum number of long-running transactions per target (default: 20).
+            db: Database to connect to. Leave empty for the host's default; activity covers the whole cluster.
+        """
+        if query_chars < 1 or query_chars > 10_000:
+            raise ValueError("query_chars must be between 1 and 10000.")
+        if limit < 1 or limit > 500:
+            raise ValueError("limit must be between 1 and 500.")
+
+        async def inspect(_, client):
+            rows = await client.fetch(_db_name(db), ACTIVITY_SQL, query_chars, primary=True)
+            return summarize_activity(rows, long_running_s, limit)
+
+        if isinstance(host, str) and not _fans_out(environment):
+            return json.dumps(await inspect(environment, _client(host, environment)), default=str, indent=2)
+        successes, errors = await _run_all(_host_targets(host, environment), inspect)
+        return json.dumps({"results": dict(successes), "errors": errors}, default=str, indent=2)
+
+    @mcp.tool()
+    async def pg_top_statements(
+        host: str,
+        environment: str,
+        order_by: StatementOrder = "total_time",
+        limit: int = 20,
+        interval_s: float = 0,
+        query_chars: int = 300,
+        db: str = "",
+    ) -> str:
+        """Rank the heaviest statements from pg_stat_statements.
+
+        By default reports lifetime totals since the last stats reset. With
+        interval_s > 0 two snapshots are taken that many seconds apart and
+        statements are ranked by what they did in between, which shows the
+        current workload. Requires the pg_stat_statements extension (PostgreSQL 13+).
+
+        Args:
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            order_by: Ranking: total_time (default), mean_time, calls, rows or shared_blks_read.
+            limit: Number of statements to return (default: 20).
+            interval_s: Seconds between two snapshots for a delta report. 0 reports lifetime totals.
+            query_chars: Truncate each query text to this many characters (default: 300).
+            db: Database to connect to. Leave empty for the host's default; statements cover every database.
+        """
+        if limit < 1 or limit > 500:
+            raise ValueError("limit must be between 1 and 500.")
+        if interval_s < 0 or interval_s > 300:
+            raise ValueError("interval_s must be between 0 and 300.")
+        if query_chars < 1 or query_chars > 10_000:
+            raise ValueError("query_chars must be between 1 and 10000.")
+        sql = statements_sql(order_by)
+        client = _client(host, environment)
+        if not await client.fetch(_db_name(db), EXTENSION_SQL, primary=True):
+            return "The pg_stat_statements extension is not installed in this database."
+
+        if not interval_s:
+            rows = await client.fetch(_db_name(db), sql, query_chars, limit, primary=True)
+            statements = cumulative(rows)
+        else:
+            before = await client.fetch(_db_name(db), sql, query_chars, None, primary=True)
+            await asyncio.sleep(interval_s)
+            after = await client.fetch(_db_name(db), sql, query_chars, None, primary=True)
+            statements = rank_statements(statement_deltas(before, after), order_by, limit)
+        result = {
+            "order_by": order_by,
+            "interval_s": interval_s or None,
+            "statements": statements,
+        }
+        return json.dumps(result, default=str, indent=2)
+
+    @mcp.tool()
+    async def pg_profile_table(
+        table_name: str,
+        host: str,
+        environment: str,
+        schema: str = "public",
+        columns: list[str] | None = None,
+        max_values: int = 10,
+        analyze: bool = False,
+        db: str = "",
+    ) -> str:
+        """Profile a table's columns from planner statistics (pg_stats) without scanning it.
+
+        For every column: null fraction, average width, n_distinct and the
+        resulting distinct-value estimate, most-common values with their
+        frequencies, histogram bounds and physical-order correlation. Statistics
+        are as fresh as the last ANALYZE; columns without statistics are listed
+        separately. With analyze=True (dev only) the table, or just the requested
+        columns, is analyzed first.
+
+        Args:
+            table_name: Table name.
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            schema: Schema name (default: public).
+            columns: Columns to profile. Leave empty for every column.
+            max_values: Most-common values and histogram buckets to report per column (default: 10).
+            analyze: Run ANALYZE on the table first. Only allowed in the dev environment.
+            db: Database name on that host. Leave empty to use the host's default database.
+        """
+        if max_values < 1 or max_values > 100:
+            raise ValueError("max_values must be between 1 and 100.")
+        if analyze and environment != "dev":
+            raise ValueError("analyze is only allowed in the dev environment.")
+        client = _client(host, environment)
+        snapshot = await client.schema(_db_name(db))
+        relation = snapshot.relations.get((schema, table_name))
+        if relation is None:
+            return f"Table '{schema}.{table_name}' not found."
+        available = [c["column_name"] for c in relation["columns"]]
+        if columns:
+            unknown = [c for c in columns if c not in available]
+            if unknown:
+                raise ValueError(
+                    f"Unknown columns for '{schema}.{table_name}': {', '.join(unknown)}."
+                )
+        wanted = columns or available
+
+        if analyze:
+            target = f"{quote_ident(schema)}.{quote_ident(table_name)}"
+            if columns:
+                target += f" ({', '.join(quote_ident(c) for c in columns)})"
+            await client.execute(_db_name(db), f"ANALYZE {target}")
+
+        stats = {
+            row["column"]: row
+            for row in await client.fetch(
+                _db_name(db), COLUMN_STATS_SQL, schema, table_name, primary=analyze
+            )
+        }
+        estimate = await client.fetch(_db_name(db), ROW_ESTIMATE_SQL, schema, table_name)
+        estimated_rows = estimate[0]["reltuples"] if estimate else -1
+        result = {
+            "table": f"{schema}.{table_name}",
+            "estimated_rows": int(estimated_rows) if estimated_rows >= 0 else None,
+            "columns": {
+                name: profile_column(stats[name], estimated_rows, max_values)
+                for name in wanted
+                if name in stats
+            },
+            "columns_without_statistics": [name for name in wanted if name not in stats],
+        }
+        return json.dumps(result, default=str, indent=2)
+
+    @mcp.tool()
+    async def pg_listen(
+        channel: str,
+        host: str,
+        environment: str,
+        db: str = "",
+        duration_s: float = 10.0,
+        max_messages: int = 100,
+        max_payload_bytes: int = 1_000,
+    ) -> str:
+        """Watch a LISTEN/NOTIFY channel for a bounded time and return the notifications received.
+
+        Opens a dedicated connection to the primary (not a pooled or replica one),
+        listens on the channel until `duration_s` passes or `max_messages`
+        notifications arrive, then closes it. Notifications are returned in arrival
+        order with the sending backend's PID; payloads longer than
+        `max_payload_bytes` are truncated.
+
+        Args:
+            channel: Channel name, as used in NOTIFY / pg_notify().
+            host: Target PostgreSQL host/cluster (e.g. microservices, merchant, openapipartner).
+            environment: Target environment (dev, qa, uat, prod).
+            db: Database name on that host. Notifications are per database. Leave empty for the default.
+            duration_s: Maximum seconds to listen (default: 10, max 300).
+            max_messages: Stop after this many notifications (default: 100).
+            max_payload_bytes: Truncate each payload to this many bytes (default: 1000).
+        """
+        if not channel.strip() or len(channel) > 63:
+            raise ValueError("channel must be between 1 and 63 characters.")
+        if duration_s <= 0 or duration_s > 300:
+            raise ValueError("duration_s must be greater than 0 and at most 300.")
+        if max_messages < 1 or max_messages > 10_000:
+            raise ValueError("max_messages must be between 1 and 10000.")
+        if max_payload_bytes < 1 or max_payload_bytes > 8_000:
+            raise ValueError("max_payload_bytes must be between 1 and 8000.")
+        messages, stopped = await _client(host, environment).listen(
             _db_name(db),
-            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = $1 AND tablename = $2 ORDER BY indexname",
-            schema,
-            table_name,
+            channel,
+            duration_s=duration_s,
+            max_messages=max_messages,
+            max_payload_bytes=max_payload_bytes,
         )
-        return _serialize(rows) or f"No indexes found for '{schema}.{table_name}'."
+        result = {
+            "channel": channel,
+            "message_count": len(messages),
+            "stopped": stopped,
+            "messages": messages,
+        }
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    async def pg_pool_stats() -> str:
+        """Show PostgreSQL connection pool usage and query outcomes across all hosts.
+
+        Reports size, idle and in-use connections plus acquire wait times for every
+        open pool, the global connection budget shared by all hosts, per
+        host/environment counts of completed, timed-out, cancelled and
+        replica-served queries, and the last measured lag of every replica.
+        """
+        if postgres_pool_manager is None:
+            return "No postgres pools are configured."
+        stats = postgres_pool_manager.stats()
+        stats["queries"] = {
+            f"{h}/{e}": dict(client.metrics) for (h, e), client in sorted(postgres_clients.items())
+        }
+        stats["replicas"] = {
+            f"{h}/{e}": client.replica_status()
+            for (h, e), client in sorted(postgres_clients.items())
+            if client.replica_status()
+        }
+        return json.dumps(stats, indent=2)
+
+    @mcp.tool()
+    async def pg_cache_stats() -> str:
+        """Show pg_query result cache usage: entries, bytes, hits, misses and evictions."""
+        return json.dumps(query_cache.stats(), indent=2)
@@ -1,14 +1,103 @@
+import asyncio
+import base64
 import json
+import time
+import zlib
 
 from mcp.server.fastmcp import FastMCP
 
+from src.clients.redis import ScanCursor
+from src.redis.diagnostics import (
+    INFO_SECTIONS,
+    summarize_clients,
+    summarize_info,
+    summarize_latency,
+    summarize_slowlog,
+)
+from src.redis.memory import MemoryReport
 from src.tools import redis_clients, resolve_client
 
+# Hard ceilings for the per-call scan budgets.
+MAX_SCAN_COUNT = 10_000
+MAX_SCAN_KEYS = 100_000
+MAX_SCAN_TIME_MS = 60_000
+MAX_INSPECT_KEYS = 1_000
+
+DIAGNOSTIC_SECTIONS = ("info", "slowlog", "latency", "clients")
+
 
 def _client(environment: str):
     return resolve_client(redis_clients, environment, "redis")
 
 
+def _targets(environment: str) -> list[tuple[str, object]]:
+    if environment == "all":
+        if not redis_clients:
+            raise ValueError("No redis clients are configured.")
+        return sorted(redis_clients.items())
+    return [(environment, _client(environment))]
+
+
+async def _run_all(targets: list[tuple[str, object]], operation) -> tuple[list[tuple[str, object]], dict[str, str]]:
+    """Run one operation per environment concurrently, keeping per-environment errors apart."""
+    results = await asyncio.gather(
+        *(operation(client) for _, client in targets),
+        return_exceptions=True,
+    )
+    successes: list[tuple[str, object]] = []
+    errors: dict[str, str] = {}
+    for (environment, _), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            errors[environment] = f"{type(result).__name__}: {result}"
+        else:
+            successes.append((environment, result))
+    return successes, errors
+
+
+def _diagnostics_summary(raw: dict, errors: dict[str, str], limit: int, idle_threshold_s: int) -> dict:
+    summary = {}
+    if "info" in raw:
+        summary["info"] = summarize_info(raw["info"])
+    if "slowlog" in raw:
+        summary["slowlog"] = summarize_slowlog(raw["slowlog"], limit)
+    if "latency" in raw:
+        summary["latency"] = summarize_latency(raw["latency"]["latest"], raw["latency"]["history"])
+    if "clients" in raw:
+        summary["clients"] = summarize_clients(raw["clients"], idle_threshold_s, limit)
+    if errors:
+        summary["errors"] = errors
+    return summary
+
+
+def _encode_cursor(cursor: ScanCursor, pattern: str, type_: str) -> str:
+    """Opaque resume token binding a SCAN cursor to the pattern and type it was issued for."""
+    raw = json.dumps({"c": cursor, "p": pattern, "t": type_}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(token: str, pattern: str, type_: str) -> ScanCursor:
+    if not token:
+        return 0
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode()))
+        cursor = state["c"]
+        # Cluster scans carry one cursor per primary.
+        if isinstance(cursor, dict):
+            cursor = {str(node): int(position) for node, position in cursor.items()}
+        else:
+            cursor = int(cursor)
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("cursor is not a value returned by redis_keys.") from None
+    if state.get("p") != pattern or state.get("t") != type_:
+        raise ValueError("cursor was issued for a different pattern or type.")
+    return cursor
+
+
+def _sampled(key: str, sample_rate: float) -> bool:
+    """Deterministic per-key sampling, so repeated reports look at the same keys."""
+    return sample_rate >= 1 or zlib.crc32(key.encode()) % 10_000 < sample_rate * 10_000
+
+
 def register(mcp: FastMCP) -> None:
     @mcp.tool()
     async def redis_get(key: str, environment: str) -> str:
@@ -22,12 +111,252 @@ def register(mcp: FastMCP) -> None:
         return val if val is not None else f"Key '{key}' not found."
 
     @mcp.tool()
-    async def redis_keys(environment: str, pattern: str = "*") -> str:
-        """List Redis keys matching a glob pattern (default: *).
+    async def redis_keys(
+        environment: str,
+        pattern: str = "*",
+        count: int = 1000,
+        type: str = "",
+        max_keys: int = 1000,
+        time_budget_ms: int = 2000,
+        cursor: str = "",
+        force_keys: bool = False,
+    ) -> str:
+        """List Redis keys matching a glob pattern (default: *) using incremental SCAN.
+
+        Scanning stops once the keyspace is exhausted, about `max_keys` keys were
+        found, or `time_budget_ms` has passed. An unfinished scan returns a
+        `cursor`; pass it back with the same pattern and type to continue.
 
         Args:
             environment: Target environment (dev, qa, uat, prod).
             pattern: Glob pattern to match keys against (default: *).
+            count: SCAN COUNT hint — keys examined per server call (default: 1000).
+            type: Only return keys of this type (string, list, set, zset, hash, stream).
+            max_keys: Stop after roughly this many matching keys (default: 1000).
+            time_budget_ms: Stop scanning after this many milliseconds (default: 2000).
+            cursor: Resume token from a previous call. Leave empty to start a new scan.
+            force_keys: Use the blocking KEYS command instead of SCAN. Refused on prod.
         """
-        keys = await _client(environment).keys(pattern)
-        return json.dumps(keys, indent=2) if keys else "No keys found."
+        if force_keys:
+            if environment == "prod":
+                raise ValueError("KEYS blocks the server and is not allowed on prod; use SCAN.")
+            keys = await _client(environment).keys(pattern)
+            return json.dumps(keys, indent=2) if keys else "No keys found."
+
+        if count < 1 or count > MAX_SCAN_COUNT:
+            raise ValueError(f"count must be between 1 and {MAX_SCAN_COUNT}.")
+        if max_keys < 1 or max_keys > MAX_SCAN_KEYS:
+            raise ValueError(f"max_keys must be between 1 and {MAX_SCAN_KEYS}.")
+        if time_budget_ms < 1 or time_budget_ms > MAX_SCAN_TIME_MS:
+            raise ValueError(f"time_budget_ms must be between 1 and {MAX_SCAN_TIME_MS}.")
+        keys, next_cursor, stopped = await _client(environment).scan_keys(
+            pattern,
+            cursor=_decode_cursor(cursor, pattern, type),
+            count=count,
+            type_=type or None,
+            max_keys=max_keys,
+            time_budget_s=time_budget_ms / 1000,
+        )
+        if not keys and stopped is None:
+            return "No keys found."
+        result = {
+            "keys": keys,
+            "complete": stopped is None,
+            "stopped": stopped,
+            "cursor": _encode_cursor(next_cursor, pattern, type) if stopped else None,
+        }
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    async def redis_inspect(
+        environment: str,
+        keys: list[str] | None = None,
+        pattern: str = "",
+        max_keys: int = 200,
+        max_elements: int = 100,
+        max_bytes: int = 4096,
+    ) -> str:
+        """Inspect several keys of any type: type, TTL, memory usage and a capped value.
+
+        Keys are given explicitly or found with a SCAN pattern. All keys are read
+        in two pipelined round trips regardless of how many there are; each value
+        is read with the command for its type and cut at `max_elements` elements
+        and roughly `max_bytes` bytes, with `truncated` set when anything was cut.
+
+        Args:
+            environment: Target environment (dev, qa, uat, prod).
+            keys: Keys to inspect.
+            pattern: Glob pattern to SCAN for keys instead of listing them.
+            max_keys: Maximum number of keys to inspect (default: 200).
+            max_elements: Maximum elements per hash/list/set/zset/stream value (default: 100).
+            max_bytes: Approximate size cap per value in bytes (default: 4096).
+        """
+        if bool(keys) == bool(pattern):
+            raise ValueError("Provide either keys or pattern.")
+        if max_keys < 1 or max_keys > MAX_INSPECT_KEYS:
+            raise ValueError(f"max_keys must be between 1 and {MAX_INSPECT_KEYS}.")
+        if max_elements < 1 or max_elements > 10_000:
+            raise ValueError("max_elements must be between 1 and 10000.")
+        if max_bytes < 1 or max_bytes > 1_000_000:
+            raise ValueError("max_bytes must be between 1 and 1000000.")
+        client = _client(environment)
+        if pattern:
+            keys, _, _ = await client.scan_keys(pattern, max_keys=max_keys)
+        if not keys:
+            return "No keys found."
+        results = await client.inspect(keys[:max_keys], max_elements, max_bytes)
+        return json.dumps(results, default=str, indent=2)
+
+    @mcp.tool()
+    async def redis_memory_report(
+        environment: str,
+        pattern: str = "*",
+        depth: int = 2,
+        separator: str = ":",
+        sample_rate: float = 1.0,
+        top_n: int = 20,
+        max_prefixes: int = 50,
+        max_keys: int = 10_000,
+        max_commands: int = 50_000,
+        time_budget_ms: int = 5_000,
+        count: int = 1000,
+    ) -> str:
+        """Report which key families use Redis memory, aggregated by key prefix.
+
+        SCANs the keyspace, keeps a deterministic sample of keys, and pipelines
+        TYPE, TTL and MEMORY USAGE for them one SCAN page at a time. Keys are
+        grouped by their first `depth` separator-delimited segments; each group
+        reports key count, total/avg/p99/max bytes, types and a TTL distribution,
+        and the overall biggest keys are listed. Work stops at whichever budget is
+        hit first (sampled keys, Redis commands, wall-clock time), so it is safe to
+        run against prod; `complete` tells whether the whole keyspace was covered.
+
+        Args:
+            environment: Target environment (dev, qa, uat, prod).
+            pattern: Glob pattern limiting the keys scanned (default: *).
+            depth: Key segments that make up a prefix (default: 2).
+            separator: Key segment separator (default: ":").
+            sample_rate: Fraction of keys to measure, 0-1 (default: 1.0 = every key).
+            top_n: Number of biggest keys to list (default: 20).
+            max_prefixes: Number of prefixes to report, biggest first (default: 50).
+            max_keys: Stop after measuring this many keys (default: 10000).
+            max_commands: Stop after issuing this many Redis commands (default: 50000).
+            time_budget_ms: Stop after this many milliseconds (default: 5000).
+            count: SCAN COUNT hint (default: 1000).
+        """
+        if depth < 1 or depth > 10:
+            raise ValueError("depth must be between 1 and 10.")
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be greater than 0 and at most 1.")
+        if top_n < 1 or top_n > 1_000:
+            raise ValueError("top_n must be between 1 and 1000.")
+        if max_keys < 1 or max_keys > MAX_SCAN_KEYS:
+            raise ValueError(f"max_keys must be between 1 and {MAX_SCAN_KEYS}.")
+        if max_commands < 1 or max_commands > 1_000_000:
+            raise ValueError("max_commands must be between 1 and 1000000.")
+        if time_budget_ms < 1 or time_budget_ms > MAX_SCAN_TIME_MS:
+            raise ValueError(f"time_budget_ms must be between 1 and {MAX_SCAN_TIME_MS}.")
+        if count < 1 or count > MAX_SCAN_COUNT:
+            raise ValueError(f"count must be between 1 and {MAX_SCAN_COUNT}.")
+
+        client = _client(environment)
+        report = MemoryReport(depth, separator, top_n)
+        started = time.monotonic()
+        deadline = started + time_budget_ms / 1000
+        cursor, scanned, measured, commands = 0, 0, 0, 0
+        stopped = None
+        while True:
+            if commands >= max_commands:
+                stopped = "max_commands"
+                break
+            cursor, page = await client.scan_page(cursor, pattern, count)
+            commands += 1
+            scanned += len(page)
+            sample = [key for key in page if _sampled(key, sample_rate)]
+            # Trim the sample to whatever the key and command budgets still allow.
+            room = min(max_keys - measured, (max_commands - commands) // 3)
+            if len(sample) > room:
+                stopped = "max_keys" if measured + room >= max_keys else "max_commands"
+                sample = sample[:room]
+            if sample:
+                for key, (type_, ttl, size) in zip(sample, await client.key_meta(sample)):
+                    if type_ not in (None, "none"):
+                        report.add(key, type_, size, ttl)
+                commands += 3 * len(sample)
+                measured += len(sample)
+            if stopped or cursor == 0:
+                break
+            if measured >= max_keys:
+                stopped = "max_keys"
+                break
+            if time.monotonic() >= deadline:
+                stopped = "time_budget"
+                break
+
+        result = {
+            "environment": environment,
+            "pattern": pattern,
+            "complete": stopped is None,
+            "stopped": stopped,
+            "scanned_keys": scanned,
+            "sampled_keys": measured,
+            "sample_rate": sample_rate,
+            "commands": commands,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            **report.report(sample_rate, max_prefixes),
+        }
+        return json.dumps(result, indent=2)
+
+    @mcp.tool()
+    async def redis_diagnostics(
+        environment: str = "all",
+        sections: list[str] | None = None,
+        slowlog_count: int = 128,
+        limit: int = 10,
+        idle_threshold_s: int = 300,
+    ) -> str:
+        """Summarize Redis server health for latency investigations, across one or all environments.
+
+        Environments are queried concurrently, each in at most two pipelined
+        round trips; a Redis Cluster is reported per primary node. Raw server
+        output is reduced to structured summaries:
+        - info: key fields of INFO memory, stats, replication and keyspace, with
+          memory used against maxmemory, hit ratio and replica byte lag
+        - slowlog: the last `slowlog_count` SLOWLOG entries grouped by command,
+          plus the slowest ones
+        - latency: LATENCY LATEST events with their LATENCY HISTORY statistics
+          (empty unless latency-monitor-threshold is set)
+        - clients: CLIENT LIST counts by name, host, command and flags, idle and
+          blocked clients, and the biggest buffers and memory users
+
+        Args:
+            environment: dev, qa, uat, prod, or "all" (default) for every configured environment.
+            sections: Any of info, slowlog, latency, clients (default: all of them).
+            slowlog_count: SLOWLOG entries to read per environment (default: 128).
+            limit: Entries per top list — slowest commands, clients, hosts (default: 10).
+            idle_threshold_s: Clients idle at least this long are counted as idle (default: 300).
+        """
+        sections = tuple(sections or DIAGNOSTIC_SECTIONS)
+        unknown = [section for section in sections if section not in DIAGNOSTIC_SECTIONS]
+        if unknown:
+            raise ValueError(f"sections must be among: {', '.join(DIAGNOSTIC_SECTIONS)}.")
+        if slowlog_count < 1 or slowlog_count > 1_000:
+            raise ValueError("slowlog_count must be between 1 and 1000.")
+        if limit < 1 or limit > 100:
+            raise ValueError("limit must be between 1 and 100.")
+
+        successes, errors = await _run_all(
+            _targets(environment),
+            lambda client: client.diagnostics(sections, INFO_SECTIONS, slowlog_count),
+        )
+
+        environments = {}
+        for env, nodes in successes:
+            summaries = {
+                node: _diagnostics_summary(raw, section_errors, limit, idle_threshold_s)
+                for node, (raw, section_errors) in nodes.items()
+            }
+            # A single server is reported directly; a cluster per primary.
+            environments[env] = summaries[None] if None in summaries else {"nodes": summaries}
+
+        return json.dumps({"environments": environments, "errors": errors}, default=str, indent=2)
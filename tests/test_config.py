@@ -1,6 +1,6 @@
 import os
 
-from src.config import Config
+from src.config import Config, PostgresHostSettings
 
 
 def test_config_defaults():
@@ -32,6 +32,18 @@ def test_config_per_environment_urls():
     assert config.configured_environments(config.redis_urls) == ["dev", "uat"]
 
 
+def test_config_redis_modes_per_environment(monkeypatch):
+    monkeypatch.setenv("REDIS_MODE_PROD", "cluster")
+    monkeypatch.setenv("REDIS_MODE_UAT", "sentinel")
+    monkeypatch.setenv("REDIS_SENTINEL_MASTER_UAT", "mymaster")
+    monkeypatch.delenv("REDIS_MODE_DEV", raising=False)
+
+    config = Config()
+    assert config.redis_modes["prod"] == "cluster"
+    assert config.redis_modes["dev"] == ""
+    assert config.redis_sentinel_masters["uat"] == "mymaster"
+
+
 def test_config_loki_and_tempo_per_environment(monkeypatch):
     for key in list(os.environ):
         if key.startswith("LOKI_") or key.startswith("TEMPO_"):
@@ -93,3 +105,38 @@ def test_config_postgres_host_urls_discovery(monkeypatch):
     }
     assert config.postgres_host_urls["merchant"] == {"qa": "postgresql://qa-merchant"}
     assert "openapipartner" not in config.postgres_host_urls
+
+
+def test_config_postgres_host_settings(monkeypatch):
+    for key in list(os.environ):
+        if key.startswith("POSTGRES_"):
+            monkeypatch.delenv(key, raising=False)
+
+    monkeypatch.setenv("POSTGRES_URL_MICROSERVICES_DEV", "postgresql://dev-microservices")
+    monkeypatch.setenv("POSTGRES_URL_MERCHANT_PROD", "postgresql://prod-merchant")
+    monkeypatch.setenv("POSTGRES_POOL_MAX_SIZE", "10")
+    monkeypatch.setenv("POSTGRES_POOL_MAX_SIZE_MERCHANT", "3")
+    monkeypatch.setenv("POSTGRES_POOL_IDLE_TIMEOUT_S_MERCHANT", "30")
+    monkeypatch.setenv("POSTGRES_PREWARM_MERCHANT", "true")
+
+    config = Config()
+
+    assert config.postgres_settings("microservices") == PostgresHostSettings(pool_max_size=10)
+    assert config.postgres_settings("merchant") == PostgresHostSettings(
+        pool_max_size=3, pool_idle_timeout_s=30.0, prewarm=True
+    )
+    assert config.postgres_settings("unknown") == PostgresHostSettings()
+
+
+def test_config_postgres_replica_urls(monkeypatch):
+    for key in list(os.environ):
+        if key.startswith("POSTGRES_"):
+            monkeypatch.delenv(key, raising=False)
+
+    monkeypatch.setenv("POSTGRES_URL_MICROSERVICES_PROD", "postgresql://primary")
+    monkeypatch.setenv("POSTGRES_REPLICA_URLS_MICROSERVICES_PROD", "postgresql://r1, postgresql://r2,")
+
+    config = Config()
+
+    assert config.postgres_replica_urls == {"microservices": {"prod": ["postgresql://r1", "postgresql://r2"]}}
+    assert config.postgres_host_urls == {"microservices": {"prod": "postgresql://primary"}}
@@ -0,0 +1,57 @@
+from src.postgres.activity import blocking_tree, summarize_activity
+
+
+def _row(pid, state="active", blocked_by=(), xact_age_s=1.0, wait=None, **extra):
+    row = {
+        "pid": pid,
+        "user": "app",
+        "application_name": "svc",
+        "state": state,
+        "wait_event_type": wait[0] if wait else None,
+        "wait_event": wait[1] if wait else None,
+        "xact_age_s": xact_age_s,
+        "query": f"query {pid}",
+        "blocked_by": list(blocked_by),
+        "waiting_for": None,
+    }
+    row.update(extra)
+    return row
+
+
+def test_blocking_tree_nests_chains():
+    rows = [
+        _row(1, state="idle in transaction", xact_age_s=300.0),
+        _row(2, blocked_by=[1], wait=("Lock", "relation"), waiting_for="relation AccessExclusiveLock on orders"),
+        _row(3, blocked_by=[2], wait=("Lock", "relation")),
+        _row(4),
+    ]
+    [root] = blocking_tree(rows)
+    assert root["pid"] == 1
+    [child] = root["blocked"]
+    assert child["pid"] == 2
+    assert child["wait_event"] == "Lock:relation"
+    assert child["waiting_for"] == "relation AccessExclusiveLock on orders"
+    assert [c["pid"] for c in child["blocked"]] == [3]
+
+
+def test_blocking_tree_breaks_cycles():
+    rows = [_row(1, blocked_by=[2]), _row(2, blocked_by=[1])]
+    [root] = blocking_tree(rows)
+    assert root["pid"] == 1
+    assert root["blocked"][0]["pid"] == 2
+    assert "blocked" not in root["blocked"][0]
+
+
+def test_summarize_activity_groups_and_ranks():
+    rows = [
+        _row(1, state="idle in transaction", xact_age_s=300.0),
+        _row(2, blocked_by=[1], xact_age_s=90.0, wait=("Lock", "transactionid")),
+        _row(3, state="idle", xact_age_s=None),
+    ]
+    summary = summarize_activity(rows, long_running_s=60, limit=1)
+    assert summary["sessions"] == 3
+    assert summary["by_state"] == {"idle in transaction": 1, "active": 1, "idle": 1}
+    assert summary["by_wait_event"] == {"Lock:transactionid": 1}
+    assert summary["blocked_sessions"] == 1
+    assert [s["pid"] for s in summary["long_running_transactions"]] == [1]
+    assert summary["blocking_tree"][0]["pid"] == 1
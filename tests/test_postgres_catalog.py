@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.postgres.catalog import CATALOG_SQL, FINGERPRINT_SQL, SchemaCache, SchemaSnapshot
+
+_ROWS = [
+    {
+        "schema": "public",
+        "name": "users",
+        "kind": "r",
+        "columns": '[{"column_name": "id", "data_type": "integer", "is_nullable": "NO", "column_default": null}]',
+        "indexes": '[{"indexname": "users_pkey", "indexdef": "CREATE UNIQUE INDEX users_pkey ON public.users USING btree (id)"}]',
+        "constraints": '[{"name": "users_pkey", "type": "p", "definition": "PRIMARY KEY (id)"}]',
+    },
+    {
+        "schema": "public",
+        "name": "orders",
+        "kind": "r",
+        "columns": '[{"column_name": "user_id", "data_type": "integer", "is_nullable": "YES", "column_default": "0"}]',
+        "indexes": "[]",
+        "constraints": '[{"name": "orders_user_fk", "type": "f", "definition": "FOREIGN KEY (user_id) REFERENCES users(id)"}]',
+    },
+    {"schema": "audit", "name": "events", "kind": "r", "columns": "[]", "indexes": "[]", "constraints": "[]"},
+]
+
+
+def _client(fingerprints, catalogs=None):
+    fingerprints = iter(fingerprints)
+    catalogs = iter(catalogs or [])
+
+    async def fetch(database, query, *args):
+        if query == FINGERPRINT_SQL:
+            return [{"fingerprint": next(fingerprints)}]
+        assert query == CATALOG_SQL
+        return next(catalogs, _ROWS)
+
+    client = AsyncMock()
+    client.fetch.side_effect = fetch
+    return client
+
+
+def _catalog_loads(client) -> int:
+    return sum(1 for call in client.fetch.call_args_list if call.args[1] == CATALOG_SQL)
+
+
+def test_snapshot_lookups():
+    snapshot = SchemaSnapshot.from_rows("f", _ROWS)
+    assert snapshot.tables("public") == ["orders", "users"]
+    assert snapshot.tables("other") == []
+    assert snapshot.columns("public", "users")[0]["column_name"] == "id"
+    assert snapshot.indexes("public", "users")[0]["indexname"] == "users_pkey"
+    assert snapshot.columns("public", "missing") == []
+
+
+def test_snapshot_export_is_compact_and_hashed():
+    exported = SchemaSnapshot.from_rows("f", _ROWS).export("public")
+    assert exported["schema"] == "public"
+    assert sorted(exported["tables"]) == ["orders", "users"]
+    users = exported["tables"]["users"]
+    assert users["columns"] == {"id": "integer NOT NULL"}
+    assert users["constraints"] == {"users_pkey": "PRIMARY KEY (id)"}
+    assert users["foreign_keys"] == {}
+    orders = exported["tables"]["orders"]
+    assert orders["columns"] == {"user_id": "integer DEFAULT 0"}
+    assert orders["foreign_keys"] == {"orders_user_fk": "FOREIGN KEY (user_id) REFERENCES users(id)"}
+    assert orders["constraints"] == {}
+    assert len(exported["hash"]) == 16
+    assert SchemaSnapshot.from_rows("g", _ROWS).export("public") == exported
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_from_memory_within_ttl():
+    client = _client(["a"])
+    cache = SchemaCache(ttl_s=60)
+    first = await cache.get(client, "app")
+    second = await cache.get(client, "app")
+    assert first is second
+    assert client.fetch.call_count == 2  # one fingerprint, one catalog load
+
+
+@pytest.mark.asyncio
+async def test_cache_revalidates_with_fingerprint_after_ttl():
+    client = _client(["a", "a"])
+    cache = SchemaCache(ttl_s=0)
+    first = await cache.get(client, "app")
+    second = await cache.get(client, "app")
+    assert first is second
+    assert _catalog_loads(client) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_reloads_when_fingerprint_changes():
+    client = _client(["a", "b"])
+    cache = SchemaCache(ttl_s=0)
+    first = await cache.get(client, "app")
+    second = await cache.get(client, "app")
+    assert first is not second
+    assert second.fingerprint == "b"
+    assert _catalog_loads(client) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_loads_once_for_concurrent_callers():
+    client = _client(["a"])
+    cache = SchemaCache(ttl_s=60)
+    snapshots = await asyncio.gather(*(cache.get(client, "app") for _ in range(5)))
+    assert all(s is snapshots[0] for s in snapshots)
+    assert _catalog_loads(client) == 1
+
+
+def test_fingerprint_covers_column_default_and_constraint_catalogs():
+    for catalog in ("pg_class", "pg_attribute", "pg_attrdef", "pg_constraint"):
+        assert f"FROM {catalog} " in FINGERPRINT_SQL
+
+
+@pytest.mark.asyncio
+async def test_cache_picks_up_column_only_changes():
+    # RENAME COLUMN / SET NOT NULL only touch pg_attribute, which now moves the fingerprint.
+    renamed = [
+        {
+            **_ROWS[0],
+            "columns": '[{"column_name": "user_id", "data_type": "integer", "is_nullable": "NO", "column_default": null}]',
+        }
+    ]
+    client = _client(["a", "b"], [_ROWS, renamed])
+    cache = SchemaCache(ttl_s=0)
+    first = await cache.get(client, "app")
+    second = await cache.get(client, "app")
+    assert [c["column_name"] for c in first.columns("public", "users")] == ["id"]
+    assert [c["column_name"] for c in second.columns("public", "users")] == ["user_id"]
+
+
+@pytest.mark.asyncio
+async def test_cache_reloads_after_max_age_even_with_same_fingerprint():
+    client = _client(["a", "a"])
+    cache = SchemaCache(ttl_s=0, max_age_s=0)
+    first = await cache.get(client, "app")
+    second = await cache.get(client, "app")
+    assert first is not second
+    assert _catalog_loads(client) == 2
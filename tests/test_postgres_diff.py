@@ -0,0 +1,98 @@
+from src.postgres.catalog import SchemaSnapshot
+from src.postgres.diff import diff_columns, diff_rows, diff_schemas
+
+
+def test_diff_rows_identical():
+    rows = [{"id": 1}, {"id": 2}]
+    assert diff_rows({"dev": rows, "prod": list(rows)}) == {
+        "identical": True,
+        "row_counts": {"dev": 2, "prod": 2},
+        "rows_not_in_all": {},
+    }
+
+
+def test_diff_rows_reports_rows_not_in_every_environment():
+    result = diff_rows(
+        {
+            "dev": [{"id": 1, "v": "a"}, {"id": 2, "v": "b"}],
+            "prod": [{"id": 1, "v": "a"}, {"id": 2, "v": "c"}, {"id": 3, "v": "d"}],
+        }
+    )
+    assert result["identical"] is False
+    assert result["rows_not_in_all"] == {
+        "dev": [{"id": 2, "v": "b"}],
+        "prod": [{"id": 2, "v": "c"}, {"id": 3, "v": "d"}],
+    }
+
+
+def _column(name, data_type="integer", nullable="NO", default=None):
+    return {"column_name": name, "data_type": data_type, "is_nullable": nullable, "column_default": default}
+
+
+def test_diff_columns_reports_missing_and_changed():
+    result = diff_columns(
+        {
+            "uat": [_column("id"), _column("email", "text", "YES"), _column("flag", "boolean")],
+            "prod": [_column("id"), _column("email", "character varying(255)", "YES")],
+        }
+    )
+    assert result["identical"] is False
+    assert result["missing"] == {"flag": ["prod"]}
+    assert result["changed"]["email"]["uat"]["data_type"] == "text"
+    assert result["changed"]["email"]["prod"]["data_type"] == "character varying(255)"
+    assert "id" not in result["changed"]
+
+
+def test_diff_columns_identical():
+    assert diff_columns({"dev": [_column("id")], "qa": [_column("id")]})["identical"] is True
+
+
+def _relation(columns, indexes=(), constraints=()):
+    return {
+        "kind": "r",
+        "columns": [_column(*c) for c in columns],
+        "indexes": [{"indexname": n, "indexdef": d} for n, d in indexes],
+        "constraints": [{"name": n, "type": t, "definition": d} for n, t, d in constraints],
+    }
+
+
+def test_diff_schemas_reports_only_differences():
+    left = SchemaSnapshot(
+        "a",
+        {
+            ("public", "users"): _relation([("id",)], constraints=[("users_pkey", "p", "PRIMARY KEY (id)")]),
+            ("public", "orders"): _relation(
+                [("id",), ("user_id",)],
+                indexes=[("orders_user_idx", "CREATE INDEX orders_user_idx ON public.orders (user_id)")],
+                constraints=[("orders_user_fk", "f", "FOREIGN KEY (user_id) REFERENCES users(id)")],
+            ),
+            ("public", "legacy"): _relation([("id",)]),
+        },
+    ).export("public")
+    right = SchemaSnapshot(
+        "b",
+        {
+            ("public", "users"): _relation([("id",)], constraints=[("users_pkey", "p", "PRIMARY KEY (id)")]),
+            ("public", "orders"): _relation([("id",), ("user_id", "bigint")]),
+            ("public", "audit"): _relation([("id",)]),
+        },
+    ).export("public")
+
+    result = diff_schemas(left, right)
+
+    assert result["identical"] is False
+    assert result["tables_only_in_left"] == ["legacy"]
+    assert result["tables_only_in_right"] == ["audit"]
+    assert list(result["changed_tables"]) == ["orders"]
+    orders = result["changed_tables"]["orders"]
+    assert orders["columns"] == {
+        "different": {"user_id": {"left": "integer NOT NULL", "right": "bigint NOT NULL"}}
+    }
+    assert list(orders["indexes"]["only_in_left"]) == ["orders_user_idx"]
+    assert list(orders["foreign_keys"]["only_in_left"]) == ["orders_user_fk"]
+    assert "constraints" not in orders
+
+
+def test_diff_schemas_identical():
+    exported = SchemaSnapshot("a", {("public", "t"): _relation([("id",)])}).export("public")
+    assert diff_schemas(exported, exported)["identical"] is True
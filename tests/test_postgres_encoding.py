@@ -0,0 +1,45 @@
+import json
+from datetime import date
+
+import pytest
+
+from src.postgres.encoding import encode_rows, encode_value, to_columns
+
+_ROWS = [{"id": 1, "name": "a", "day": date(2026, 1, 2)}, {"id": 2, "name": None, "day": None}]
+
+
+def test_encode_json_matches_legacy_output():
+    assert encode_rows(_ROWS, "json") == json.dumps(_ROWS, default=str, indent=2)
+
+
+def test_encode_columns():
+    assert json.loads(encode_rows(_ROWS, "columns")) == {
+        "columns": ["id", "name", "day"],
+        "rows": [[1, "a", "2026-01-02"], [2, None, None]],
+    }
+
+
+def test_encode_csv():
+    assert encode_rows(_ROWS, "csv") == "id,name,day\n1,a,2026-01-02\n2,,\n"
+
+
+def test_encode_jsonl():
+    lines = encode_rows(_ROWS, "jsonl").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2]
+
+
+def test_encode_empty():
+    assert to_columns([]) == {"columns": [], "rows": []}
+    assert encode_rows([], "csv") == ""
+    assert encode_rows([], "jsonl") == ""
+
+
+def test_encode_value_embeds_structured_formats():
+    assert encode_value(_ROWS, "json") is _ROWS
+    assert encode_value(_ROWS, "columns")["columns"] == ["id", "name", "day"]
+    assert encode_value(_ROWS, "csv").startswith("id,name,day\n")
+
+
+def test_encode_unknown_format():
+    with pytest.raises(ValueError, match="Unknown format 'xml'"):
+        encode_rows(_ROWS, "xml")
@@ -0,0 +1,95 @@
+from src.postgres.explain import seq_scan_relations, summarize_plan
+
+_PLAN = {
+    "Plan": {
+        "Node Type": "Hash Join",
+        "Total Cost": 1500.0,
+        "Plan Rows": 100,
+        "Plans": [
+            {
+                "Node Type": "Seq Scan",
+                "Relation Name": "orders",
+                "Total Cost": 1000.0,
+                "Plan Rows": 50000,
+            },
+            {
+                "Node Type": "Hash",
+                "Total Cost": 300.0,
+                "Plan Rows": 10,
+                "Plans": [
+                    {
+                        "Node Type": "Index Scan",
+                        "Relation Name": "users",
+                        "Index Name": "users_pkey",
+                        "Total Cost": 300.0,
+                        "Plan Rows": 10,
+                    }
+                ],
+            },
+        ],
+    }
+}
+
+
+def _analyzed():
+    return {
+        "Planning Time": 0.5,
+        "Execution Time": 120.0,
+        "Plan": {
+            "Node Type": "Sort",
+            "Total Cost": 900.0,
+            "Plan Rows": 10,
+            "Actual Rows": 5000,
+            "Actual Loops": 1,
+            "Actual Total Time": 120.0,
+            "Sort Method": "external merge",
+            "Sort Space Type": "Disk",
+            "Sort Space Used": 2048,
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "orders",
+                    "Total Cost": 800.0,
+                    "Plan Rows": 10,
+                    "Actual Rows": 5000,
+                    "Actual Loops": 1,
+                    "Actual Total Time": 30.0,
+                }
+            ],
+        },
+    }
+
+
+def test_seq_scan_relations():
+    assert seq_scan_relations(_PLAN["Plan"]) == ["orders"]
+
+
+def test_summarize_ranks_by_self_cost_without_analyze():
+    summary = summarize_plan(_PLAN, top_n=3)
+    assert summary["analyzed"] is False
+    assert summary["node_count"] == 4
+    assert [n["node"] for n in summary["costliest_nodes"]] == ["Seq Scan", "Index Scan", "Hash Join"]
+    assert summary["costliest_nodes"][2]["self_cost"] == 200.0
+    assert summary["row_estimate_misses"] == []
+    assert "execution_time_ms" not in summary
+
+
+def test_summarize_flags_seq_scan_on_large_relation():
+    summary = summarize_plan(_PLAN, {"orders": 2_000_000}, large_table_rows=1_000_000)
+    [scan] = summary["seq_scans_on_large_relations"]
+    assert scan["relation"] == "orders"
+    assert scan["relation_rows"] == 2_000_000
+    assert summarize_plan(_PLAN, {"orders": 10})["seq_scans_on_large_relations"] == []
+
+
+def test_summarize_analyzed_plan_reports_misses_and_spills():
+    summary = summarize_plan(_analyzed())
+    assert summary["analyzed"] is True
+    assert summary["execution_time_ms"] == 120.0
+    assert summary["costliest_nodes"][0]["node"] == "Sort"
+    assert summary["costliest_nodes"][0]["self_time_ms"] == 90.0
+    assert [m["node"] for m in summary["row_estimate_misses"]] == ["Sort", "Seq Scan"]
+    assert summary["row_estimate_misses"][0]["misestimate"] == 500.0
+    [spill] = summary["spills"]
+    assert spill["node"] == "Sort"
+    assert "disk" in spill["spill"]
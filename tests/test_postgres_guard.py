@@ -0,0 +1,56 @@
+from src.postgres.guard import classify, rejection, violations, with_limit
+
+
+def _plan(cost, rows):
+    return {"Plan": {"Node Type": "Hash Join", "Total Cost": cost, "Plan Rows": rows}}
+
+
+def test_classify_plain_queries():
+    assert classify("  select 1") == ("query", "select 1")
+    assert classify("WITH x AS (SELECT 1) SELECT * FROM x")[0] == "query"
+    assert classify("SHOW server_version") == ("passthrough", "SHOW server_version")
+    assert classify("EXPLAIN SELECT 1") == ("passthrough", "EXPLAIN SELECT 1")
+    assert classify("EXPLAIN (FORMAT JSON, ANALYZE false) SELECT 1")[0] == "passthrough"
+
+
+def test_classify_looks_through_leading_comments():
+    assert classify("-- note\nSELECT * FROM big") == ("query", "SELECT * FROM big")
+    assert classify("/* outer /* nested */ */ SELECT * FROM big") == ("query", "SELECT * FROM big")
+    assert classify("-- note\n/* hint */\n  TABLE big")[0] == "query"
+    assert classify("/* SHOW */ DELETE FROM big")[0] == "unknown"
+
+
+def test_classify_plans_parenthesised_queries_as_subqueries():
+    kind, plannable = classify("( /* x */ (SELECT * FROM big) UNION (SELECT * FROM big2));")
+    assert kind == "query"
+    assert plannable == "SELECT * FROM (\n( /* x */ (SELECT * FROM big) UNION (SELECT * FROM big2))\n) AS guarded"
+
+
+def test_classify_explain_analyze_plans_inner_statement():
+    assert classify("EXPLAIN ANALYZE SELECT * FROM big") == ("explain_analyze", "SELECT * FROM big")
+    assert classify("explain analyse verbose /* x */ select 1") == ("explain_analyze", "select 1")
+    assert classify("EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM big") == ("explain_analyze", "SELECT * FROM big")
+    assert classify("EXPLAIN (analyze on) (SELECT 1)")[0] == "explain_analyze"
+    assert classify("EXPLAIN ANALYZE DELETE FROM big")[0] == "unknown"
+
+
+def test_classify_fails_closed_on_other_statements():
+    for sql in ("DELETE FROM big", "CALL expensive()", "DO $$ BEGIN END $$", "(SHOW server_version)", ""):
+        assert classify(sql)[0] == "unknown"
+
+
+def test_with_limit_wraps_and_strips_semicolon():
+    assert with_limit("SELECT * FROM t;\n", 11) == "SELECT * FROM (\nSELECT * FROM t\n) AS guarded LIMIT 11"
+
+
+def test_violations():
+    assert violations(_plan(100.0, 10), max_cost=1000, max_rows=100) == []
+    assert violations(_plan(5000.0, 10), max_cost=1000, max_rows=0) == ["estimated cost 5000 exceeds 1000"]
+    assert violations(_plan(1.0, 500), max_cost=0, max_rows=100) == ["estimated rows 500 exceed 100"]
+
+
+def test_rejection_includes_plan_summary():
+    payload = rejection(_plan(5000.0, 10), ["estimated cost 5000 exceeds 1000"])
+    assert payload["error"].startswith("Query refused by the cost guard")
+    assert payload["plan"]["total_cost"] == 5000.0
+    assert payload["plan"]["costliest_nodes"][0]["node"] == "Hash Join"
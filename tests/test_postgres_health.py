@@ -0,0 +1,43 @@
+from src.postgres.health import findings
+
+
+def _row(**overrides):
+    row = {
+        "n_live_tup": 1_000_000,
+        "n_dead_tup": 1_000,
+        "dead_pct": 0.1,
+        "last_analyze": "2026-10-01 00:00:00+00",
+        "seq_scan": 10,
+        "idx_scan": 5_000,
+        "heap_hit_pct": 99.5,
+        "unused_indexes": [],
+    }
+    row.update(overrides)
+    return row
+
+
+def test_findings_healthy_table():
+    assert findings(_row()) == []
+
+
+def test_findings_flags_unhealthy_indicators():
+    flags = findings(
+        _row(
+            dead_pct=35.0,
+            last_analyze=None,
+            seq_scan=900,
+            idx_scan=3,
+            heap_hit_pct=42.0,
+            unused_indexes=[{"index": "orders_note_idx", "bytes": 8192}],
+        )
+    )
+    assert len(flags) == 5
+    assert flags[0].startswith("35.0% dead tuples")
+    assert "never analyzed" in flags[1]
+    assert "sequential scans" in flags[2]
+    assert "42.0%" in flags[3]
+    assert "1 non-unique index(es)" in flags[4]
+
+
+def test_findings_ignores_small_tables_for_seq_scans():
+    assert findings(_row(n_live_tup=50, seq_scan=100, idx_scan=0)) == []
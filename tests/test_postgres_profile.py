@@ -0,0 +1,46 @@
+from src.postgres.profile import distinct_estimate, profile_column
+
+
+def _stats(**overrides):
+    row = {
+        "column": "status",
+        "null_frac": 0.01,
+        "avg_width": 8,
+        "n_distinct": 3.0,
+        "most_common_vals": ["active", "closed", "pending"],
+        "most_common_freqs": [0.7, 0.2, 0.09],
+        "histogram_bounds": None,
+        "correlation": 0.12,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_distinct_estimate_handles_fractions():
+    assert distinct_estimate(42.0, 1_000) == 42
+    assert distinct_estimate(-0.5, 1_000) == 500
+    assert distinct_estimate(-1.0, -1) is None
+
+
+def test_profile_column_pairs_most_common_values():
+    profile = profile_column(_stats(), 1_000, max_values=2)
+    assert profile["most_common"] == [
+        {"value": "active", "freq": 0.7},
+        {"value": "closed", "freq": 0.2},
+    ]
+    assert profile["histogram_bounds"] == []
+    assert profile["distinct_estimate"] == 3
+    assert profile["unique"] is False
+
+
+def test_profile_column_thins_histogram_and_truncates_values():
+    bounds = [str(i) for i in range(101)]
+    profile = profile_column(
+        _stats(n_distinct=-1.0, most_common_vals=["x" * 500], most_common_freqs=[0.001], histogram_bounds=bounds),
+        10_000,
+        max_values=4,
+    )
+    assert profile["histogram_bounds"] == ["0", "25", "50", "75", "100"]
+    assert profile["most_common"][0]["value"] == "x" * 100 + "…"
+    assert profile["unique"] is True
+    assert profile["distinct_estimate"] == 10_000
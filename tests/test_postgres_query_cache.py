@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+from src.postgres.query_cache import QueryCache, normalize_sql
+
+
+def test_normalize_sql_collapses_whitespace_outside_quotes():
+    assert normalize_sql("  SELECT  *\n FROM t\tWHERE a = 'x  y' ;") == "SELECT * FROM t WHERE a = 'x  y'"
+    assert normalize_sql('SELECT "Col  A" FROM t;;') == 'SELECT "Col  A" FROM t'
+    assert normalize_sql("SELECT $$a  b$$,  $1") == "SELECT $$a  b$$, $1"
+
+
+def test_normalize_sql_keeps_comments_apart_from_the_code_after_them():
+    assert normalize_sql("SELECT 1 -- note\n+ 1") != normalize_sql("SELECT 1 -- note + 1")
+    assert normalize_sql("SELECT 1  -- note\n  + 1") == normalize_sql("SELECT 1 -- note\n+ 1")
+    assert normalize_sql("SELECT /* a  b */  1") == "SELECT /* a  b */ 1"
+    assert normalize_sql("SELECT '--x'  ,  1") == "SELECT '--x' , 1"
+
+
+def test_cache_hit_and_miss_counts():
+    cache = QueryCache(max_bytes=100)
+    assert cache.get("k") is None
+    cache.put("k", ["row"], size=10, ttl_s=60)
+    assert cache.get("k") == ["row"]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 10
+
+
+def test_cache_expires_entries():
+    cache = QueryCache()
+    with patch("src.postgres.query_cache.time.monotonic", return_value=100.0):
+        cache.put("k", "v", size=1, ttl_s=5)
+    with patch("src.postgres.query_cache.time.monotonic", return_value=106.0):
+        assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    cache = QueryCache(max_bytes=25)
+    cache.put("a", "A", size=10, ttl_s=60)
+    cache.put("b", "B", size=10, ttl_s=60)
+    cache.get("a")
+    cache.put("c", "C", size=10, ttl_s=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_skips_oversized_and_zero_ttl_values():
+    cache = QueryCache(max_bytes=10)
+    cache.put("big", "x", size=11, ttl_s=60)
+    cache.put("off", "x", size=1, ttl_s=0)
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,29 @@
+from src.postgres.sampling import sample_percent, sample_sql
+
+
+def test_sample_percent_scales_with_estimate():
+    assert sample_percent(100, 1_000_000, "bernoulli") == 100 / 1_000_000 * 100 * 1.2
+    assert sample_percent(100, 1_000_000, "system") == 100 / 1_000_000 * 100 * 2.0
+
+
+def test_sample_percent_bounds():
+    assert sample_percent(100, 50, "system") == 100.0
+    assert sample_percent(100, -1, "system") == 100.0
+    assert sample_percent(1, 1e12, "bernoulli") == 0.0001
+
+
+def test_sample_sql_quotes_and_shuffles():
+    sql = sample_sql("public", 'Odd"Name', ["id", "Email"], "system", 0.02, 50)
+    assert sql == (
+        'SELECT "id", "Email" FROM "public"."Odd""Name" '
+        "TABLESAMPLE SYSTEM (0.02) ORDER BY random() LIMIT 50"
+    )
+
+
+def test_sample_sql_repeatable_keeps_scan_order():
+    sql = sample_sql("public", "users", ["id"], "bernoulli", 1.5, 10, seed=42)
+    assert sql.endswith("TABLESAMPLE BERNOULLI (1.5) REPEATABLE (42) LIMIT 10")
+
+
+def test_sample_sql_full_scan_is_not_sorted():
+    assert "ORDER BY" not in sample_sql("public", "users", ["id"], "system", 100.0, 10)
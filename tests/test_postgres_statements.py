@@ -0,0 +1,44 @@
+import pytest
+
+from src.postgres.statements import cumulative, rank_statements, statement_deltas, statements_sql
+
+
+def _row(queryid, calls, total, read=0, rows=0):
+    return {
+        "queryid": queryid,
+        "user": "app",
+        "db": "orders",
+        "calls": calls,
+        "total_time_ms": total,
+        "mean_time_ms": total / calls if calls else 0.0,
+        "rows": rows,
+        "shared_blks_hit": 0,
+        "shared_blks_read": read,
+        "query": f"q{queryid}",
+    }
+
+
+def test_statements_sql_orders_by_whitelisted_column():
+    assert "ORDER BY mean_time_ms DESC" in statements_sql("mean_time")
+    with pytest.raises(ValueError, match="order_by"):
+        statements_sql("query; DROP TABLE x")
+
+
+def test_statement_deltas_subtracts_and_drops_idle():
+    before = [_row(1, 10, 100.0), _row(2, 5, 50.0), _row(3, 100, 10.0)]
+    after = [_row(1, 14, 180.0), _row(2, 5, 50.0), _row(3, 2, 4.0), _row(4, 1, 7.0)]
+    deltas = {row["queryid"]: row for row in statement_deltas(before, after)}
+    assert set(deltas) == {1, 3, 4}
+    assert deltas[1]["calls"] == 4
+    assert deltas[1]["total_time_ms"] == 80.0
+    assert deltas[1]["mean_time_ms"] == 20.0
+    # Counters went backwards: the stats were reset, so count from zero.
+    assert deltas[3]["calls"] == 2
+    assert deltas[4]["total_time_ms"] == 7.0
+
+
+def test_rank_statements():
+    rows = cumulative([_row(1, 10, 100.0, read=5), _row(2, 1, 90.0, read=50)])
+    assert [r["queryid"] for r in rank_statements(rows, "total_time", 5)] == [1, 2]
+    assert [r["queryid"] for r in rank_statements(rows, "mean_time", 5)] == [2, 1]
+    assert [r["queryid"] for r in rank_statements(rows, "shared_blks_read", 1)] == [2]
@@ -1,6 +1,11 @@
+import json
+from collections import Counter
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from src.config import PostgresHostSettings
+from src.postgres.catalog import SchemaSnapshot
 from tests.conftest import load_tool_functions
 
 _tools = load_tool_functions("src.tools.postgres")
@@ -8,6 +13,19 @@ pg_query = _tools["pg_query"]
 pg_list_tables = _tools["pg_list_tables"]
 pg_describe_table = _tools["pg_describe_table"]
 pg_list_indexes = _tools["pg_list_indexes"]
+pg_pool_stats = _tools["pg_pool_stats"]
+pg_explain = _tools["pg_explain"]
+pg_cache_stats = _tools["pg_cache_stats"]
+pg_table_health = _tools["pg_table_health"]
+pg_schema_snapshot = _tools["pg_schema_snapshot"]
+pg_schema_diff = _tools["pg_schema_diff"]
+pg_sample_table = _tools["pg_sample_table"]
+pg_activity = _tools["pg_activity"]
+pg_top_statements = _tools["pg_top_statements"]
+pg_profile_table = _tools["pg_profile_table"]
+pg_export = _tools["pg_export"]
+pg_query_batch = _tools["pg_query_batch"]
+pg_listen = _tools["pg_listen"]
 
 
 def _patched(mock_pg, host="microservices", environment="uat"):
@@ -17,33 +35,348 @@ def _patched(mock_pg, host="microservices", environment="uat"):
 @pytest.mark.asyncio
 async def test_pg_query_with_results():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = [{"id": 1, "name": "John"}]
+    mock_pg.fetch_capped.return_value = ([{"id": 1, "name": "John"}], None)
     with _patched(mock_pg):
         result = await pg_query(sql="SELECT * FROM users", host="microservices", environment="uat")
     assert '"id": 1' in result
     assert '"name": "John"' in result
-    mock_pg.fetch.assert_called_once_with(None, "SELECT * FROM users")
+    mock_pg.fetch_capped.assert_called_once_with(
+        None, "SELECT * FROM users", max_rows=500, max_bytes=256_000, timeout_ms=None
+    )
 
 
 @pytest.mark.asyncio
 async def test_pg_query_with_db():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = [{"id": 1}]
+    mock_pg.fetch_capped.return_value = ([{"id": 1}], None)
     with _patched(mock_pg):
         result = await pg_query(sql="SELECT 1", host="microservices", environment="uat", db="order_engine")
     assert '"id": 1' in result
-    mock_pg.fetch.assert_called_once_with("order_engine", "SELECT 1")
+    mock_pg.fetch_capped.assert_called_once_with(
+        "order_engine", "SELECT 1", max_rows=500, max_bytes=256_000, timeout_ms=None
+    )
 
 
 @pytest.mark.asyncio
 async def test_pg_query_no_results():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = []
+    mock_pg.fetch_capped.return_value = ([], None)
     with _patched(mock_pg):
         result = await pg_query(sql="SELECT * FROM empty", host="microservices", environment="uat")
     assert result == "[]"
 
 
+@pytest.mark.asyncio
+async def test_pg_query_truncated_returns_marker():
+    mock_pg = AsyncMock()
+    mock_pg.fetch_capped.return_value = ([{"id": 1}, {"id": 2}], "max_rows")
+    with _patched(mock_pg):
+        result = await pg_query(sql="SELECT * FROM big", host="microservices", environment="uat", max_rows=2)
+    data = json.loads(result)
+    assert data["truncated"] is True
+    assert data["truncated_reason"] == "max_rows"
+    assert data["row_count"] == 2
+    assert data["rows"] == [{"id": 1}, {"id": 2}]
+    mock_pg.fetch_capped.assert_called_once_with(
+        None, "SELECT * FROM big", max_rows=2, max_bytes=256_000, timeout_ms=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_pg_query_passes_timeout():
+    mock_pg = AsyncMock()
+    mock_pg.fetch_capped.return_value = ([], None)
+    with _patched(mock_pg):
+        await pg_query(sql="SELECT 1", host="microservices", environment="uat", timeout_ms=1500)
+    assert mock_pg.fetch_capped.call_args.kwargs["timeout_ms"] == 1500
+    with _patched(mock_pg):
+        with pytest.raises(ValueError, match="timeout_ms must be between"):
+            await pg_query(sql="SELECT 1", host="microservices", environment="uat", timeout_ms=-1)
+
+
+@pytest.mark.asyncio
+async def test_pg_query_rejects_invalid_budget():
+    mock_pg = AsyncMock()
+    with _patched(mock_pg):
+        with pytest.raises(ValueError, match="max_rows must be between"):
+            await pg_query(sql="SELECT 1", host="microservices", environment="uat", max_rows=0)
+    mock_pg.fetch_capped.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_query_columns_format():
+    mock_pg = AsyncMock()
+    mock_pg.fetch_capped.return_value = ([{"id": 1, "name": "John"}, {"id": 2, "name": "Jane"}], None)
+    with _patched(mock_pg):
+        result = await pg_query(sql="SELECT 1", host="microservices", environment="uat", format="columns")
+    assert json.loads(result) == {"columns": ["id", "name"], "rows": [[1, "John"], [2, "Jane"]]}
+
+
+@pytest.mark.asyncio
+async def test_pg_query_csv_format_marks_truncation():
+    mock_pg = AsyncMock()
+    mock_pg.fetch_capped.return_value = ([{"id": 1}], "max_bytes")
+    with _patched(mock_pg):
+        result = await pg_query(sql="SELECT 1", host="microservices", environment="uat", format="csv")
+    assert result == "id\n1\n# truncated after 1 rows (max_bytes)\n"
+
+
+@pytest.mark.asyncio
+async def test_pg_query_columns_format_marks_truncation():
+    mock_pg = AsyncMock()
+    mock_pg.fetch_capped.return_value = ([{"id": 1}], "max_rows")
+    with _patched(mock_pg):
+        result = await pg_query(sql="SELECT 1", host="microservices", environment="uat", format="columns")
+    data = json.loads(result)
+    assert data["rows"] == [[1]]
+    assert data["truncated_reason"] == "max_rows"
+
+
+@pytest.mark.asyncio
+async def test_pg_query_cache_skips_repeat_round_trip():
+    from src.tools.postgres import query_cache
+
+    query_cache.clear()
+    mock_pg = AsyncMock()
+    mock_pg.fetch_capped.return_value = ([{"id": 1}], None)
+    with _patched(mock_pg):
+        first = await pg_query(sql="SELECT id FROM t", host="microservices", environment="uat", cache=True)
+        second = await pg_query(sql="SELECT  id\nFROM t;", host="microservices", environment="uat", cache=True)
+        await pg_query(sql="SELECT id FROM t", host="microservices", environment="uat")
+    assert first == second
+    assert mock_pg.fetch_capped.call_count == 2
+    stats = json.loads(await pg_cache_stats())
+    assert stats["hits"] == 1
+    assert stats["entries"] == 1
+    query_cache.clear()
+
+
+def _guarded(**settings):
+    return patch(
+        "src.tools.postgres.config.postgres_host_settings",
+        {"microservices": PostgresHostSettings(**settings)},
+    )
+
+
+@pytest.mark.asyncio
+async def test_pg_query_cost_guard_rejects_with_plan():
+    mock_pg = AsyncMock()
+    mock_pg.explain.return_value = {"Plan": {"Node Type": "Seq Scan", "Total Cost": 90_000.0, "Plan Rows": 5}}
+    with _patched(mock_pg), _guarded(cost_guard_max_cost=10_000):
+        with pytest.raises(ValueError, match="cost guard") as exc:
+            await pg_query(sql="SELECT * FROM big", host="microservices", environment="uat")
+    assert json.loads(str(exc.value))["plan"]["total_cost"] == 90_000.0
+    mock_pg.fetch_capped.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_query_cost_guard_wraps_with_limit():
+    mock_pg = AsyncMock()
+    mock_pg.explain.side_effect = [
+        {"Plan": {"Total Cost": 90_000.0, "Plan Rows": 1_000_000}},
+        {"Plan": {"Total Cost": 12.0, "Plan Rows": 100}},
+    ]
+    mock_pg.fetch_capped.return_value = ([{"id": i} for i in range(100)], None)
+    with _patched(mock_pg), _guarded(
+        cost_guard_max_cost=10_000, cost_guard_max_rows=100, cost_guard_action="limit"
+    ):
+        result = await pg_query(sql="SELECT * FROM big;", host="microservices", environment="uat")
+    data = json.loads(result)
+    assert data["truncated_reason"] == "cost_guard_limit"
+    assert mock_pg.fetch_capped.call_args.args[1].endswith(") AS guarded LIMIT 100")
+
+
+@pytest.mark.asyncio
+async def test_pg_query_cost_guard_skips_cheap_and_unexplainable_queries():
+    mock_pg = AsyncMock()
+    mock_pg.explain.return_value = {"Plan": {"Total Cost": 1.0, "Plan Rows": 1}}
+    mock_pg.fetch_capped.return_value = ([{"x": 1}], None)
+    with _patched(mock_pg), _guarded(cost_guard_max_cost=10_000):
+        await pg_query(sql="SELECT 1", host="microservices", environment="uat")
+        await pg_query(sql="SHOW server_version", host="microservices", environment="uat")
+    mock_pg.explain.assert_called_once()
+    assert mock_pg.fetch_capped.call_args.args[1] == "SHOW server_version"
+
+
+@pytest.mark.asyncio
+async def test_pg_query_cost_guard_sees_through_comments_and_parentheses():
+    mock_pg = AsyncMock()
+    mock_pg.explain.return_value = {"Plan": {"Node Type": "Seq Scan", "Total Cost": 90_000.0, "Plan Rows": 5}}
+    with _patched(mock_pg), _guarded(cost_guard_max_cost=10_000):
+        for sql in ("-- note\nSELECT * FROM big", "/* hint */ SELECT * FROM big", "(SELECT * FROM big)"):
+            with pytest.raises(ValueError, match="cost guard"):
+                await pg_query(sql=sql, host="microservices", environment="uat")
+    assert mock_pg.explain.call_args.args[1] == "SELECT * FROM (\n(SELECT * FROM big)\n) AS guarded"
+    mock_pg.fetch_capped.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_query_cost_guard_checks_explain_analyze_target():
+    mock_pg = AsyncMock()
+    mock_pg.explain.return_value = {"Plan": {"Node Type": "Seq Scan", "Total Cost": 90_000.0, "Plan Rows": 5}}
+    with _patched(mock_pg), _guarded(cost_guard_max_cost=10_000, cost_guard_action="limit"):
+        with pytest.raises(ValueError, match="cost guard"):
+            await pg_query(sql="EXPLAIN ANALYZE SELECT * FROM big", host="microservices", environment="uat")
+    assert mock_pg.explain.call_args.args[1] == "SELECT * FROM big"
+    mock_pg.explain.assert_called_once()
+    mock_pg.fetch_capped.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_query_cost_guard_refuses_unknown_statements():
+    mock_pg = AsyncMock()
+    with _patched(mock_pg), _guarded(cost_guard_max_cost=10_000):
+        with pytest.raises(ValueError, match="can be checked"):
+            await pg_query(sql="CALL expensive()", host="microservices", environment="uat")
+    mock_pg.explain.assert_not_called()
+    mock_pg.fetch_capped.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_query_batch_keys_results_by_index():
+    mock_pg = AsyncMock()
+    mock_pg.fetch_batch.return_value = [
+        {"rows": [{"n": 3}], "truncated_reason": None, "elapsed_ms": 1.0},
+        {"error": "UndefinedTableError: nope", "elapsed_ms": 0.5},
+    ]
+    with _patched(mock_pg):
+        result = await pg_query_batch(
+            statements=["SELECT count(*) AS n FROM t", "SELECT * FROM nope"],
+            host="microservices",
+            environment="uat",
+        )
+    data = json.loads(result)
+    assert data["results"]["0"] == {"row_count": 1, "truncated_reason": None, "elapsed_ms": 1.0, "rows": [{"n": 3}]}
+    assert data["results"]["1"]["error"] == "UndefinedTableError: nope"
+    mock_pg.fetch_batch.assert_called_once_with(
+        None,
+        ["SELECT count(*) AS n FROM t", "SELECT * FROM nope"],
+        max_rows=500,
+        max_bytes=256_000,
+        timeout_ms=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pg_query_batch_cost_guard_runs_on_batch_connection():
+    plans = {"SELECT 1": 1.0, "SELECT * FROM big": 90_000.0}
+    explained = []
+
+    async def explain(sql):
+        explained.append(sql)
+        return {"Plan": {"Total Cost": plans[sql], "Plan Rows": 1}}
+
+    async def fetch_batch(database, queries, *, guard, **kwargs):
+        entries = []
+        for query in queries:
+            try:
+                await guard(explain, query)
+                entries.append({"rows": [], "truncated_reason": None, "elapsed_ms": 1.0})
+            except ValueError as e:
+                entries.append({"error": f"ValueError: {e}", "elapsed_ms": 0.0})
+        return entries
+
+    mock_pg = AsyncMock()
+    mock_pg.fetch_batch.side_effect = fetch_batch
+    with _patched(mock_pg), _guarded(cost_guard_max_cost=10_000):
+        result = await pg_query_batch(
+            statements=["SELECT 1", "SELECT * FROM big"], host="microservices", environment="uat"
+        )
+    data = json.loads(result)
+    assert data["results"]["0"]["row_count"] == 0
+    assert "cost guard" in data["results"]["1"]["error"]
+    assert explained == ["SELECT 1", "SELECT * FROM big"]
+    mock_pg.explain.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_query_batch_cost_guard_limit_reported():
+    async def explain(sql):
+        return {"Plan": {"Total Cost": 1.0 if "LIMIT" in sql else 90_000.0, "Plan Rows": 1}}
+
+    async def fetch_batch(database, queries, *, guard, **kwargs):
+        sql = await guard(explain, queries[0])
+        assert sql.endswith("LIMIT 3")
+        return [{"rows": [{"n": 1}, {"n": 2}, {"n": 3}], "truncated_reason": None, "elapsed_ms": 1.0}]
+
+    mock_pg = AsyncMock()
+    mock_pg.fetch_batch.side_effect = fetch_batch
+    with _patched(mock_pg), _guarded(cost_guard_max_cost=10_000, cost_guard_action="limit"):
+        result = await pg_query_batch(
+            statements=["SELECT * FROM big"], host="microservices", environment="uat", max_rows=2
+        )
+    assert json.loads(result)["results"]["0"]["truncated_reason"] == "cost_guard_limit"
+
+
+@pytest.mark.asyncio
+async def test_pg_query_batch_validates_size():
+    with pytest.raises(ValueError, match="statements"):
+        await pg_query_batch(statements=[], host="microservices", environment="uat")
+
+
+@pytest.mark.asyncio
+async def test_pg_export_writes_into_export_dir(tmp_path):
+    mock_pg = AsyncMock()
+
+    async def copy(database, query, path, **kwargs):
+        with open(path, "wb") as f:
+            f.write(b"id\n1\n")
+        return 1, 5
+
+    mock_pg.copy_to_file.side_effect = copy
+    with _patched(mock_pg), patch("src.tools.postgres.config.postgres_export_dir", str(tmp_path)):
+        result = await pg_export(
+            sql="SELECT id FROM t;", host="microservices", environment="uat", filename="../evil/out.csv"
+        )
+        with pytest.raises(ValueError, match="already exists"):
+            await pg_export(sql="SELECT 1", host="microservices", environment="uat", filename="out.csv")
+    data = json.loads(result)
+    assert data["path"] == str(tmp_path / "out.csv")
+    assert data["row_count"] == 1
+    assert data["bytes"] == 5
+    mock_pg.copy_to_file.assert_called_once_with(
+        None, "SELECT id FROM t", str(tmp_path / "out.csv"), compress=False, timeout_ms=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_pg_query_fans_out_across_environments():
+    dev, prod = AsyncMock(), AsyncMock()
+    dev.fetch_capped.return_value = ([{"id": 1}, {"id": 2}], None)
+    prod.fetch_capped.return_value = ([{"id": 1}], None)
+    clients = {("microservices", "dev"): dev, ("microservices", "prod"): prod, ("merchant", "dev"): AsyncMock()}
+    with patch("src.tools.postgres_clients", clients):
+        result = await pg_query(sql="SELECT id FROM t", host="microservices", environment="all", diff=True)
+    data = json.loads(result)
+    assert data["environments"] == ["dev", "prod"]
+    assert data["results"]["dev"]["row_count"] == 2
+    assert data["results"]["prod"]["rows"] == [{"id": 1}]
+    assert data["diff"]["rows_not_in_all"] == {"dev": [{"id": 2}]}
+    assert data["errors"] == {}
+
+
+@pytest.mark.asyncio
+async def test_pg_query_fan_out_reports_errors_per_environment():
+    dev, prod = AsyncMock(), AsyncMock()
+    dev.fetch_capped.side_effect = TimeoutError("statement timeout")
+    prod.fetch_capped.return_value = ([{"id": 1}], None)
+    clients = {("microservices", "dev"): dev, ("microservices", "prod"): prod}
+    with patch("src.tools.postgres_clients", clients):
+        result = await pg_query(sql="SELECT 1", host="microservices", environment=["prod", "dev"])
+    data = json.loads(result)
+    assert data["environments"] == ["prod", "dev"]
+    assert data["errors"] == {"dev": "TimeoutError: statement timeout"}
+    assert data["results"]["prod"]["rows"] == [{"id": 1}]
+    assert "diff" not in data
+
+
+@pytest.mark.asyncio
+async def test_pg_query_all_unknown_host():
+    with patch("src.tools.postgres_clients", {}):
+        with pytest.raises(ValueError, match="No postgres clients configured for host 'merchant'"):
+            await pg_query(sql="SELECT 1", host="merchant", environment="all")
+
+
 @pytest.mark.asyncio
 async def test_pg_query_unknown_host_environment():
     with patch("src.tools.postgres_clients", {}):
@@ -65,19 +398,56 @@ async def test_pg_query_wrong_environment_for_host():
             await pg_query(sql="SELECT 1", host="microservices", environment="prod")
 
 
+@pytest.mark.asyncio
+async def test_pg_explain_summarises_plan():
+    mock_pg = AsyncMock()
+    mock_pg.explain.return_value = {
+        "Plan": {"Node Type": "Seq Scan", "Relation Name": "orders", "Total Cost": 10.0, "Plan Rows": 5}
+    }
+    mock_pg.fetch.return_value = [{"relname": "orders", "reltuples": 500_000}]
+    with _patched(mock_pg):
+        result = await pg_explain(sql="SELECT * FROM orders", host="microservices", environment="uat")
+    data = json.loads(result)
+    assert data["costliest_nodes"][0]["relation"] == "orders"
+    assert data["seq_scans_on_large_relations"][0]["relation_rows"] == 500_000
+    mock_pg.explain.assert_called_once_with(None, "SELECT * FROM orders", analyze=False, timeout_ms=None)
+    assert mock_pg.fetch.call_args.args[2] == ["orders"]
+
+
+@pytest.mark.asyncio
+async def test_pg_explain_skips_relation_lookup_without_seq_scans():
+    mock_pg = AsyncMock()
+    mock_pg.explain.return_value = {"Plan": {"Node Type": "Result", "Total Cost": 0.01, "Plan Rows": 1}}
+    with _patched(mock_pg):
+        await pg_explain(sql="SELECT 1", host="microservices", environment="uat", analyze=True)
+    mock_pg.explain.assert_called_once_with(None, "SELECT 1", analyze=True, timeout_ms=None)
+    mock_pg.fetch.assert_not_called()
+
+
+def _snapshot(relations=None):
+    return SchemaSnapshot(fingerprint="f", relations=relations or {})
+
+
 @pytest.mark.asyncio
 async def test_pg_list_tables_with_results():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = [{"table_name": "users"}, {"table_name": "orders"}]
+    mock_pg.schema.return_value = _snapshot(
+        {
+            ("public", "users"): {"kind": "r", "columns": [], "indexes": []},
+            ("public", "orders"): {"kind": "r", "columns": [], "indexes": []},
+            ("audit", "events"): {"kind": "r", "columns": [], "indexes": []},
+        }
+    )
     with _patched(mock_pg):
         result = await pg_list_tables(host="microservices", environment="uat")
-    assert result == "users\norders"
+    assert result == "orders\nusers"
+    mock_pg.schema.assert_called_once_with(None)
 
 
 @pytest.mark.asyncio
 async def test_pg_list_tables_no_results():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = []
+    mock_pg.schema.return_value = _snapshot()
     with _patched(mock_pg):
         result = await pg_list_tables(host="microservices", environment="uat")
     assert result == "No tables found."
@@ -86,16 +456,20 @@ async def test_pg_list_tables_no_results():
 @pytest.mark.asyncio
 async def test_pg_describe_table_with_results():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = [{"column_name": "id", "data_type": "integer", "is_nullable": "NO", "column_default": None}]
+    columns = [{"column_name": "id", "data_type": "integer", "is_nullable": "NO", "column_default": None}]
+    mock_pg.schema.return_value = _snapshot(
+        {("public", "users"): {"kind": "r", "columns": columns, "indexes": []}}
+    )
     with _patched(mock_pg):
-        result = await pg_describe_table(table_name="users", host="microservices", environment="uat")
+        result = await pg_describe_table(table_name="users", host="microservices", environment="uat", db="app")
     assert '"column_name": "id"' in result
+    mock_pg.schema.assert_called_once_with("app")
 
 
 @pytest.mark.asyncio
 async def test_pg_describe_table_not_found():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = []
+    mock_pg.schema.return_value = _snapshot()
     with _patched(mock_pg):
         result = await pg_describe_table(
             table_name="nonexistent", host="microservices", environment="uat", schema="test"
@@ -103,10 +477,32 @@ async def test_pg_describe_table_not_found():
     assert result == "[]"  # _serialize([]) is truthy, so fallback doesn't trigger
 
 
+@pytest.mark.asyncio
+async def test_pg_describe_table_diff_across_environments():
+    uat, prod = AsyncMock(), AsyncMock()
+    uat.schema.return_value = _snapshot(
+        {("public", "users"): {"kind": "r", "columns": [{"column_name": "id"}, {"column_name": "email"}], "indexes": []}}
+    )
+    prod.schema.return_value = _snapshot(
+        {("public", "users"): {"kind": "r", "columns": [{"column_name": "id"}], "indexes": []}}
+    )
+    clients = {("microservices", "uat"): uat, ("microservices", "prod"): prod}
+    with patch("src.tools.postgres_clients", clients):
+        result = await pg_describe_table(
+            table_name="users", host="microservices", environment="all", diff=True
+        )
+    data = json.loads(result)
+    assert data["environments"] == ["prod", "uat"]
+    assert data["diff"]["missing"] == {"email": ["prod"]}
+
+
 @pytest.mark.asyncio
 async def test_pg_list_indexes_with_results():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = [{"indexname": "users_pkey", "indexdef": "CREATE UNIQUE INDEX ..."}]
+    indexes = [{"indexname": "users_pkey", "indexdef": "CREATE UNIQUE INDEX ..."}]
+    mock_pg.schema.return_value = _snapshot(
+        {("public", "users"): {"kind": "r", "columns": [], "indexes": indexes}}
+    )
     with _patched(mock_pg):
         result = await pg_list_indexes(table_name="users", host="microservices", environment="uat")
     assert '"indexname": "users_pkey"' in result
@@ -115,7 +511,287 @@ async def test_pg_list_indexes_with_results():
 @pytest.mark.asyncio
 async def test_pg_list_indexes_no_results():
     mock_pg = AsyncMock()
-    mock_pg.fetch.return_value = []
+    mock_pg.schema.return_value = _snapshot()
     with _patched(mock_pg):
         result = await pg_list_indexes(table_name="t", host="microservices", environment="uat", schema="s")
     assert result == "[]"
+
+
+def _users(columns):
+    return _snapshot(
+        {
+            ("public", "users"): {
+                "kind": "r",
+                "columns": [
+                    {"column_name": c, "data_type": "integer", "is_nullable": "NO", "column_default": None}
+                    for c in columns
+                ],
+                "indexes": [],
+                "constraints": [],
+            }
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_pg_schema_snapshot():
+    mock_pg = AsyncMock()
+    mock_pg.schema.return_value = _users(["id"])
+    with _patched(mock_pg):
+        result = await pg_schema_snapshot(host="microservices", environment="uat")
+    data = json.loads(result)
+    assert data["tables"]["users"]["columns"] == {"id": "integer NOT NULL"}
+
+
+@pytest.mark.asyncio
+async def test_pg_schema_diff_across_environments():
+    uat, prod = AsyncMock(), AsyncMock()
+    uat.schema.return_value = _users(["id", "email"])
+    prod.schema.return_value = _users(["id"])
+    clients = {("microservices", "uat"): uat, ("microservices", "prod"): prod}
+    with patch("src.tools.postgres_clients", clients):
+        result = await pg_schema_diff(host="microservices", environment="uat", other_environment="prod")
+    data = json.loads(result)
+    assert data["left"] == "microservices/uat"
+    assert data["right"] == "microservices/prod"
+    assert data["changed_tables"]["users"]["columns"]["only_in_left"] == {"email": "integer NOT NULL"}
+    uat.schema.assert_called_once_with(None)
+    prod.schema.assert_called_once_with(None)
+
+
+@pytest.mark.asyncio
+async def test_pg_sample_table_sizes_sample_from_estimate():
+    mock_pg = AsyncMock()
+    mock_pg.schema.return_value = _users(["id", "email"])
+    mock_pg.fetch.return_value = [{"reltuples": 1_000_000.0}]
+    mock_pg.fetch_capped.return_value = ([{"id": 7, "email": "a@b"}], None)
+    with _patched(mock_pg):
+        result = await pg_sample_table(table_name="users", host="microservices", environment="uat", rows=100)
+    data = json.loads(result)
+    assert data["estimated_rows"] == 1_000_000
+    assert data["percent"] == 0.02
+    assert data["rows"] == [{"id": 7, "email": "a@b"}]
+    sql = mock_pg.fetch_capped.call_args.args[1]
+    assert sql == (
+        'SELECT "id", "email" FROM "public"."users" '
+        "TABLESAMPLE SYSTEM (0.02) ORDER BY random() LIMIT 100"
+    )
+    assert mock_pg.fetch.call_args.args[2:] == ("public", "users")
+
+
+@pytest.mark.asyncio
+async def test_pg_sample_table_rejects_unknown_columns_and_views():
+    mock_pg = AsyncMock()
+    snapshot = _users(["id"])
+    snapshot.relations[("public", "v_users")] = {**snapshot.relations[("public", "users")], "kind": "v"}
+    mock_pg.schema.return_value = snapshot
+    with _patched(mock_pg):
+        with pytest.raises(ValueError, match="Unknown columns"):
+            await pg_sample_table(table_name="users", host="microservices", environment="uat", columns=["nope"])
+        with pytest.raises(ValueError, match="TABLESAMPLE"):
+            await pg_sample_table(table_name="v_users", host="microservices", environment="uat")
+        result = await pg_sample_table(table_name="missing", host="microservices", environment="uat")
+    assert result == "Table 'public.missing' not found."
+    mock_pg.fetch_capped.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_activity_single_target():
+    mock_pg = AsyncMock()
+    mock_pg.fetch.return_value = [
+        {"pid": 1, "state": "active", "xact_age_s": 5.0, "query": "SELECT", "blocked_by": []},
+    ]
+    with _patched(mock_pg):
+        result = await pg_activity(host="microservices", environment="uat", query_chars=50)
+    data = json.loads(result)
+    assert data["sessions"] == 1
+    assert data["by_state"] == {"active": 1}
+    assert mock_pg.fetch.call_args.args[2] == 50
+
+
+@pytest.mark.asyncio
+async def test_pg_activity_fans_out_across_hosts():
+    ok, broken = AsyncMock(), AsyncMock()
+    ok.fetch.return_value = []
+    broken.fetch.side_effect = OSError("unreachable")
+    clients = {("microservices", "prod"): ok, ("merchant", "prod"): broken}
+    with patch("src.tools.postgres_clients", clients):
+        result = await pg_activity(host=["microservices", "merchant"], environment="prod")
+    data = json.loads(result)
+    assert data["results"]["microservices/prod"]["sessions"] == 0
+    assert data["errors"] == {"merchant/prod": "OSError: unreachable"}
+
+
+def _statement(calls, total):
+    return {
+        "queryid": 1,
+        "user": "app",
+        "db": "orders",
+        "calls": calls,
+        "total_time_ms": total,
+        "mean_time_ms": 0.0,
+        "rows": 0,
+        "shared_blks_hit": 0,
+        "shared_blks_read": 0,
+        "query": "SELECT 1",
+    }
+
+
+@pytest.mark.asyncio
+async def test_pg_top_statements_lifetime():
+    mock_pg = AsyncMock()
+    mock_pg.fetch.side_effect = [[{"?column?": 1}], [_statement(4, 10.0)]]
+    with _patched(mock_pg):
+        result = await pg_top_statements(host="microservices", environment="uat", limit=5)
+    data = json.loads(result)
+    assert data["statements"][0]["mean_time_ms"] == 2.5
+    assert mock_pg.fetch.call_args.args[2:] == (300, 5)
+
+
+@pytest.mark.asyncio
+async def test_pg_top_statements_interval_delta():
+    mock_pg = AsyncMock()
+    mock_pg.fetch.side_effect = [[{"?column?": 1}], [_statement(4, 10.0)], [_statement(6, 16.0)]]
+    with _patched(mock_pg), patch("src.tools.postgres.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        result = await pg_top_statements(host="microservices", environment="uat", interval_s=5)
+    sleep.assert_called_once_with(5)
+    [statement] = json.loads(result)["statements"]
+    assert statement["calls"] == 2
+    assert statement["total_time_ms"] == 6.0
+
+
+@pytest.mark.asyncio
+async def test_pg_top_statements_without_extension():
+    mock_pg = AsyncMock()
+    mock_pg.fetch.return_value = []
+    with _patched(mock_pg):
+        result = await pg_top_statements(host="microservices", environment="uat")
+    assert "not installed" in result
+    mock_pg.fetch.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_pg_profile_table_from_pg_stats():
+    mock_pg = AsyncMock()
+    mock_pg.schema.return_value = _users(["id", "email"])
+    mock_pg.fetch.side_effect = [
+        [
+            {
+                "column": "id",
+                "null_frac": 0.0,
+                "avg_width": 4,
+                "n_distinct": -1.0,
+                "most_common_vals": None,
+                "most_common_freqs": None,
+                "histogram_bounds": ["1", "500", "1000"],
+                "correlation": 1.0,
+            }
+        ],
+        [{"reltuples": 1000.0}],
+    ]
+    with _patched(mock_pg):
+        result = await pg_profile_table(table_name="users", host="microservices", environment="uat")
+    data = json.loads(result)
+    assert data["estimated_rows"] == 1000
+    assert data["columns"]["id"]["distinct_estimate"] == 1000
+    assert data["columns_without_statistics"] == ["email"]
+    mock_pg.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_pg_profile_table_analyze_only_in_dev():
+    mock_pg = AsyncMock()
+    mock_pg.schema.return_value = _users(["id"])
+    mock_pg.fetch.side_effect = [[], []]
+    with _patched(mock_pg):
+        with pytest.raises(ValueError, match="dev"):
+            await pg_profile_table(table_name="users", host="microservices", environment="uat", analyze=True)
+    with _patched(mock_pg, environment="dev"):
+        await pg_profile_table(
+            table_name="users", host="microservices", environment="dev", columns=["id"], analyze=True
+        )
+    mock_pg.execute.assert_called_once_with(None, 'ANALYZE "public"."users" ("id")')
+
+
+@pytest.mark.asyncio
+async def test_pg_listen_returns_messages():
+    mock_pg = AsyncMock()
+    mock_pg.listen.return_value = ([{"pid": 1, "received_at": "t", "payload": "{}"}], "duration")
+    with _patched(mock_pg):
+        result = await pg_listen(channel="orders", host="microservices", environment="uat", duration_s=2)
+    data = json.loads(result)
+    assert data["message_count"] == 1
+    assert data["stopped"] == "duration"
+    mock_pg.listen.assert_called_once_with(
+        None, "orders", duration_s=2, max_messages=100, max_payload_bytes=1_000
+    )
+
+
+@pytest.mark.asyncio
+async def test_pg_listen_validates_bounds():
+    with pytest.raises(ValueError, match="duration_s"):
+        await pg_listen(channel="orders", host="microservices", environment="uat", duration_s=0)
+    with pytest.raises(ValueError, match="channel"):
+        await pg_listen(channel="", host="microservices", environment="uat")
+
+
+@pytest.mark.asyncio
+async def test_pg_table_health_single_round_trip():
+    mock_pg = AsyncMock()
+    mock_pg.fetch.return_value = [
+        {
+            "schema": "public",
+            "table": "orders",
+            "n_live_tup": 10,
+            "dead_pct": 50.0,
+            "seq_scan": 1,
+            "idx_scan": 1,
+            "last_analyze": None,
+            "heap_hit_pct": None,
+            "unused_indexes": '[{"index": "orders_tmp_idx", "bytes": 16384}]',
+        }
+    ]
+    with _patched(mock_pg):
+        result = await pg_table_health(host="microservices", environment="uat", table_name="orders")
+    [table] = json.loads(result)
+    assert table["unused_indexes"] == [{"index": "orders_tmp_idx", "bytes": 16384}]
+    assert len(table["findings"]) == 3
+    mock_pg.fetch.assert_called_once()
+    assert mock_pg.fetch.call_args.args[2:] == ("public", "orders", 20)
+
+
+@pytest.mark.asyncio
+async def test_pg_table_health_not_found():
+    mock_pg = AsyncMock()
+    mock_pg.fetch.return_value = []
+    with _patched(mock_pg):
+        result = await pg_table_health(host="microservices", environment="uat", schema="s", table_name="t")
+    assert result == "No table statistics found for s.t."
+
+
+@pytest.mark.asyncio
+async def test_pg_pool_stats():
+    manager = MagicMock()
+    manager.stats.return_value = {"total_connections": 2, "max_total_connections": 50, "pools": []}
+    client = MagicMock()
+    client.metrics = Counter(completed=3, timeouts=1)
+    client.replica_status.return_value = [{"replica": "microservices/uat/replica1", "lag_s": 0.5, "eligible": True}]
+    other = MagicMock()
+    other.metrics = Counter()
+    other.replica_status.return_value = []
+    with patch("src.tools.postgres.postgres_pool_manager", manager), patch(
+        "src.tools.postgres.postgres_clients",
+        {("microservices", "uat"): client, ("merchant", "uat"): other},
+    ):
+        result = await pg_pool_stats()
+    data = json.loads(result)
+    assert data["max_total_connections"] == 50
+    assert data["queries"]["microservices/uat"] == {"completed": 3, "timeouts": 1}
+    assert list(data["replicas"]) == ["microservices/uat"]
+
+
+@pytest.mark.asyncio
+async def test_pg_pool_stats_not_configured():
+    with patch("src.tools.postgres.postgres_pool_manager", None):
+        result = await pg_pool_stats()
+    assert result == "No postgres pools are configured."
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from src.clients.redis import RedisClient
 
 
@@ -135,6 +135,266 @@ async def test_keys_default_pattern():
         mock_redis.keys.assert_called_once_with("*")
 
 
+@pytest.mark.asyncio
+async def test_scan_keys_iterates_until_complete():
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = AsyncMock()
+        mock_redis.scan.side_effect = [(5, ["k1"]), (9, []), (0, ["k2"])]
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        keys, cursor, stopped = await client.scan_keys("k*", count=10, type_="string")
+
+        assert keys == ["k1", "k2"]
+        assert (cursor, stopped) == (0, None)
+        mock_redis.scan.assert_called_with(cursor=9, match="k*", count=10, _type="string")
+
+
+@pytest.mark.asyncio
+async def test_scan_keys_stops_at_max_keys_with_resume_cursor():
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = AsyncMock()
+        mock_redis.scan.side_effect = [(5, ["k1", "k2"]), (7, ["k3", "k4"]), (0, ["k5"])]
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        keys, cursor, stopped = await client.scan_keys(max_keys=3)
+
+        assert keys == ["k1", "k2", "k3", "k4"]
+        assert (cursor, stopped) == (7, "max_keys")
+
+
+@pytest.mark.asyncio
+async def test_scan_keys_stops_at_time_budget():
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = AsyncMock()
+        mock_redis.scan.return_value = (5, ["k1"])
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        keys, cursor, stopped = await client.scan_keys(cursor=3, time_budget_s=0)
+
+        assert (keys, cursor, stopped) == (["k1"], 5, "time_budget")
+        mock_redis.scan.assert_called_once_with(cursor=3, match="*", count=1000, _type=None)
+
+
+def _pipelines(*results):
+    """Mock pipelines whose execute() returns each given result list in turn."""
+    pipes = []
+    for result in results:
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=result)
+        pipes.append(pipe)
+    return pipes
+
+
+@pytest.mark.asyncio
+async def test_inspect_reads_every_type_in_two_round_trips():
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = MagicMock()
+        meta, values = _pipelines(
+            [
+                "string", -1, 60,
+                "hash", 300, 200,
+                "zset", -1, Exception("MEMORY disabled"),
+                "none", -2, None,
+            ],
+            [
+                12, b"hello world!",
+                3, (0, {"a": "1", "b": "2", "c": "3"}),
+                5, [("m1", 1.0), ("m2", 2.0)],
+            ],
+        )
+        mock_redis.pipeline.side_effect = [meta, values]
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        result = await client.inspect(["s", "h", "z", "gone"], max_elements=2, max_bytes=64)
+
+    assert mock_redis.pipeline.call_count == 2
+    meta.execute.assert_called_once_with(raise_on_error=False)
+    values.execute_command.assert_called_once_with("GETRANGE", "s", 0, 63, NEVER_DECODE=True)
+    values.hscan.assert_called_once_with("h", 0, count=2)
+    values.zrange.assert_called_once_with("z", 0, 1, withscores=True)
+    assert result["s"] == {
+        "type": "string", "ttl": -1, "memory_bytes": 60,
+        "length": 12, "value": "hello world!", "truncated": False,
+    }
+    assert result["h"]["value"] == {"a": "1", "b": "2"}
+    assert result["h"]["truncated"] is True
+    assert result["z"]["memory_bytes"] is None
+    assert result["z"]["value"] == [["m1", 1.0], ["m2", 2.0]]
+    assert result["z"]["truncated"] is True
+    assert result["gone"] == {"type": "none"}
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_reads_latency_history_and_isolates_errors():
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = MagicMock()
+        first, history = _pipelines(
+            [
+                {"used_memory": 1},
+                Exception("NOPERM this user has no permissions to run the 'slowlog' command"),
+                [["command", 1700000000, 12, 80]],
+                [{"id": "1"}],
+            ],
+            [[[1700000000, 12]]],
+        )
+        mock_redis.pipeline.side_effect = [first, history]
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        nodes = await client.diagnostics(("info", "slowlog", "latency", "clients"), ("memory",), 10)
+
+    raw, errors = nodes[None]
+
+    assert raw == {
+        "info": {"memory": {"used_memory": 1}},
+        "latency": {"latest": [["command", 1700000000, 12, 80]], "history": {"command": [[1700000000, 12]]}},
+        "clients": [{"id": "1"}],
+    }
+    assert errors["slowlog"].startswith("Exception: NOPERM")
+    first.slowlog_get.assert_called_once_with(10)
+    history.execute_command.assert_called_once_with("LATENCY HISTORY", "command")
+
+
+def _cluster(*primaries):
+    cluster = MagicMock()
+    cluster.initialize = AsyncMock()
+    cluster.get_primaries.return_value = list(primaries)
+    cluster.get_node.side_effect = lambda node_name: {n.name: n for n in primaries}.get(node_name)
+    return cluster
+
+
+def _node(name):
+    node = MagicMock()
+    node.name = name
+    return node
+
+
+def test_unknown_mode_and_sentinel_without_master_rejected():
+    with pytest.raises(ValueError, match="Unknown Redis mode"):
+        RedisClient("redis://localhost:6379", mode="replicated")
+    with pytest.raises(ValueError, match="Sentinel"):
+        RedisClient("redis://s1:26379", mode="sentinel")
+
+
+def test_cluster_mode_uses_redis_cluster():
+    with patch("src.clients.redis.RedisCluster.from_url") as mock_from_url:
+        client = RedisClient("redis://node1:7000", mode="cluster")
+        assert client._get_client() is mock_from_url.return_value
+    mock_from_url.assert_called_once_with("redis://node1:7000", decode_responses=True)
+
+
+def test_sentinel_mode_resolves_primary_through_sentinels():
+    with patch("src.clients.redis.Sentinel") as mock_sentinel:
+        client = RedisClient("rediss://:p%40ss@s1:26379/2, redis://s2", mode="sentinel", sentinel_master="main")
+        assert client._get_client() is mock_sentinel.return_value.master_for.return_value
+    mock_sentinel.assert_called_once_with(
+        [("s1", 26379), ("s2", 26379)], sentinel_kwargs={"password": "p@ss", "ssl": True}
+    )
+    mock_sentinel.return_value.master_for.assert_called_once_with(
+        "main", db=2, decode_responses=True, password="p@ss", ssl=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_cluster_scan_page_fans_out_and_merges_cursors():
+    a, b = _node("10.0.0.1:7000"), _node("10.0.0.2:7000")
+    cluster = _cluster(a, b)
+    pages = {
+        ("10.0.0.1:7000", 0): ({"10.0.0.1:7000": 17}, ["k1"]),
+        ("10.0.0.2:7000", 0): ({"10.0.0.2:7000": 0}, ["k2", "k3"]),
+        ("10.0.0.1:7000", 17): ({"10.0.0.1:7000": 0}, ["k4"]),
+    }
+
+    async def scan(cursor, match, count, _type, target_nodes):
+        return pages[(target_nodes.name, cursor)]
+
+    cluster.scan = AsyncMock(side_effect=scan)
+    with patch("src.clients.redis.RedisCluster.from_url", return_value=cluster):
+        client = RedisClient("redis://node1:7000", mode="cluster")
+        cursor, keys = await client.scan_page(0, "*", 100)
+        assert (cursor, sorted(keys)) == ({"10.0.0.1:7000": 17}, ["k1", "k2", "k3"])
+        cursor, keys = await client.scan_page(cursor, "*", 100)
+        assert (cursor, keys) == (0, ["k4"])
+        assert cluster.scan.call_count == 3
+
+        with pytest.raises(ValueError, match="restart the scan"):
+            await client.scan_page({"10.0.0.9:7000": 5}, "*", 100)
+
+
+@pytest.mark.asyncio
+async def test_cluster_diagnostics_targets_every_primary():
+    a, b = _node("a:7000"), _node("b:7000")
+    cluster = _cluster(a, b)
+    first, history = _pipelines([{"used_memory": 1}, {"used_memory": 2}], [])
+    cluster.pipeline.side_effect = [first, history]
+    with patch("src.clients.redis.RedisCluster.from_url", return_value=cluster):
+        client = RedisClient("redis://a:7000", mode="cluster")
+        nodes = await client.diagnostics(("info",), ("memory",))
+
+    assert nodes == {
+        "a:7000": ({"info": {"memory": {"used_memory": 1}}}, {}),
+        "b:7000": ({"info": {"memory": {"used_memory": 2}}}, {}),
+    }
+    first.info.assert_any_call("memory", target_nodes=b)
+    history.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_key_meta_single_pipeline():
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = MagicMock()
+        [pipe] = _pipelines(["hash", 10, 512, "none", -2, None])
+        mock_redis.pipeline.return_value = pipe
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        meta = await client.key_meta(["h", "gone"])
+
+    assert meta == [("hash", 10, 512), ("none", -2, None)]
+    mock_redis.pipeline.assert_called_once_with(transaction=False)
+    pipe.memory_usage.assert_any_call("h")
+
+
+@pytest.mark.asyncio
+async def test_inspect_trims_string_cut_inside_multibyte_character():
+    value = "สวัสดี" * 200  # 3 bytes per character
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = MagicMock()
+        meta, values = _pipelines(
+            ["string", -1, 4000, "string", -1, 10],
+            [len(value.encode()), value.encode()[:100], 4, b"\xff\xfe\x00\x01"],
+        )
+        mock_redis.pipeline.side_effect = [meta, values]
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        result = await client.inspect(["thai", "blob"], max_bytes=100)
+
+    assert result["thai"]["value"] == value[:33]
+    assert result["thai"]["truncated"] is True
+    assert result["blob"]["value"] == "\ufffd\ufffd\x00\x01"
+    assert result["blob"]["truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_inspect_caps_value_bytes():
+    with patch('redis.asyncio.from_url') as mock_from_url:
+        mock_redis = MagicMock()
+        meta, values = _pipelines(["list", -1, 500], [3, ["x" * 10, "y" * 10, "z" * 10]])
+        mock_redis.pipeline.side_effect = [meta, values]
+        mock_from_url.return_value = mock_redis
+
+        client = RedisClient("redis://localhost:6379")
+        result = await client.inspect(["l"], max_elements=10, max_bytes=30)
+
+    assert result["l"]["value"] == ["x" * 10, "y" * 10]
+    assert result["l"]["truncated"] is True
+
+
 @pytest.mark.asyncio
 async def test_close_with_client():
     with patch('redis.asyncio.from_url') as mock_from_url:
@@ -0,0 +1,83 @@
+from src.redis.diagnostics import (
+    MAX_COMMAND_CHARS,
+    summarize_clients,
+    summarize_info,
+    summarize_latency,
+    summarize_slowlog,
+)
+
+
+def test_summarize_info_derives_ratios_and_replica_lag():
+    info = {
+        "memory": {"used_memory": 250, "maxmemory": 1000, "maxmemory_policy": "allkeys-lru", "lazyfree_pending_objects": 0},
+        "stats": {"keyspace_hits": 90, "keyspace_misses": 10, "evicted_keys": 3},
+        "replication": {
+            "role": "master",
+            "connected_slaves": 1,
+            "master_repl_offset": 5000,
+            "slave0": {"ip": "10.0.0.2", "port": 6379, "state": "online", "offset": 4200, "lag": 1},
+        },
+        "keyspace": {"db0": {"keys": 10, "expires": 2, "avg_ttl": 100, "subexpiry": 0}},
+    }
+    summary = summarize_info(info)
+    assert summary["memory"] == {
+        "used_memory": 250,
+        "maxmemory": 1000,
+        "maxmemory_policy": "allkeys-lru",
+        "used_pct_of_max": 25.0,
+    }
+    assert summary["stats"]["hit_ratio"] == 0.9
+    assert summary["replication"]["replicas"] == [
+        {"ip": "10.0.0.2", "port": 6379, "state": "online", "lag": 1, "lag_bytes": 800}
+    ]
+    assert summary["keyspace"] == {"db0": {"keys": 10, "expires": 2, "avg_ttl": 100}}
+
+
+def test_summarize_info_skips_missing_sections_and_zero_maxmemory():
+    summary = summarize_info({"memory": {"used_memory": 10, "maxmemory": 0}})
+    assert summary == {"memory": {"used_memory": 10, "maxmemory": 0}}
+
+
+def test_summarize_slowlog_groups_by_command():
+    entries = [
+        {"id": 1, "start_time": 100, "duration": 5000, "command": "KEYS *", "client_address": "1.2.3.4:5"},
+        {"id": 2, "start_time": 101, "duration": 200, "command": "get a"},
+        {"id": 3, "start_time": 102, "duration": 300, "command": "GET b"},
+        {"id": 4, "start_time": 103, "duration": 100, "command": "SET " + "x" * 500},
+    ]
+    summary = summarize_slowlog(entries, limit=2)
+    assert summary["entries"] == 4
+    assert list(summary["by_command"]) == ["KEYS", "GET", "SET"]
+    assert summary["by_command"]["GET"] == {"count": 2, "total_us": 500, "max_us": 300}
+    assert [e["id"] for e in summary["slowest"]] == [1, 3]
+    assert summary["slowest"][0]["client"] == "1.2.3.4:5"
+    assert "client" not in summary["slowest"][1]
+
+    long = summarize_slowlog(entries[3:])["slowest"][0]["command"]
+    assert len(long) == MAX_COMMAND_CHARS + 1
+
+
+def test_summarize_latency_merges_history():
+    latest = [["command", 1700000000, 12, 80], ["fork", 1700000100, 300, 300]]
+    history = {"command": [[1699999990, 20], [1700000000, 12], [1700000001, 80]]}
+    events = summarize_latency(latest, history)
+    assert [e["event"] for e in events] == ["fork", "command"]
+    assert "history" not in events[0]
+    assert events[1]["history"] == {"samples": 3, "avg_ms": 37.3, "max_ms": 80}
+
+
+def test_summarize_clients():
+    clients = [
+        {"id": "1", "addr": "10.0.0.1:5000", "name": "api", "cmd": "get", "flags": "N", "idle": "0", "omem": "0", "tot-mem": "20000"},
+        {"id": "2", "addr": "10.0.0.1:5001", "name": "api", "cmd": "blpop", "flags": "b", "idle": "600", "omem": "0", "tot-mem": "1000"},
+        {"id": "3", "addr": "10.0.0.9:7000", "name": "", "cmd": "psubscribe", "flags": "P", "idle": "10", "omem": "900000", "tot-mem": "950000"},
+    ]
+    summary = summarize_clients(clients, idle_threshold_s=300, limit=2)
+    assert summary["connections"] == 3
+    assert summary["by_name"] == {"api": 2, "(unnamed)": 1}
+    assert summary["by_host"] == {"10.0.0.1": 2, "10.0.0.9": 1}
+    assert summary["blocked"] == 1
+    assert summary["idle_over_threshold"] == 1
+    assert [c["id"] for c in summary["largest_output_buffers"]] == ["3"]
+    assert [c["id"] for c in summary["most_memory"]] == ["3", "1"]
+    assert summary["most_memory"][0]["name"] is None
@@ -0,0 +1,47 @@
+from src.redis.memory import NO_PREFIX, MemoryReport, key_prefix, ttl_bucket
+
+
+def test_key_prefix_never_includes_last_segment():
+    assert key_prefix("user:42:cart", 2) == "user:42:*"
+    assert key_prefix("user:42:cart", 1) == "user:*"
+    assert key_prefix("session:abc", 3) == "session:*"
+    assert key_prefix("plainkey", 2) == NO_PREFIX
+    assert key_prefix("a/b/c", 1, "/") == "a/*"
+
+
+def test_ttl_bucket():
+    assert ttl_bucket(-1) == "none"
+    assert ttl_bucket(None) == "none"
+    assert ttl_bucket(60) == "<1h"
+    assert ttl_bucket(7200) == "<1d"
+    assert ttl_bucket(86_400 * 3) == "<7d"
+    assert ttl_bucket(86_400 * 30) == ">=7d"
+
+
+def test_memory_report_aggregates_by_prefix():
+    report = MemoryReport(depth=1, top_n=2)
+    for i in range(100):
+        report.add(f"user:{i}", "hash", 100 + i, 60)
+    report.add("cache:big", "string", 10_000, -1)
+    report.add("cache:small", "string", 10, -1)
+
+    result = report.report()
+
+    assert result["keys"] == 102
+    [cache, user] = sorted(result["prefixes"], key=lambda p: p["prefix"])
+    assert cache["bytes"] == 10_010
+    assert cache["ttl"] == {"none": 2}
+    assert user["keys"] == 100
+    assert user["p99_bytes"] == 198
+    assert user["max_bytes"] == 199
+    assert user["types"] == {"hash": 100}
+    assert result["prefixes"][0]["prefix"] == "user:*"
+    assert [k["key"] for k in result["biggest_keys"]] == ["cache:big", "user:99"]
+
+
+def test_memory_report_extrapolates_samples():
+    report = MemoryReport()
+    report.add("a:1", "string", 50, -1)
+    result = report.report(sample_rate=0.1, max_prefixes=1)
+    assert result["estimated_total_bytes"] == 500
+    assert result["prefixes"][0]["estimated_keys"] == 10
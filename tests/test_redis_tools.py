@@ -1,11 +1,16 @@
+import json
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, patch
 
 from tests.conftest import load_tool_functions
 
 _tools = load_tool_functions("src.tools.redis")
 redis_get = _tools["redis_get"]
 redis_keys = _tools["redis_keys"]
+redis_inspect = _tools["redis_inspect"]
+redis_memory_report = _tools["redis_memory_report"]
+redis_diagnostics = _tools["redis_diagnostics"]
 
 
 def _patched(mock_rd):
@@ -40,17 +45,196 @@ async def test_redis_get_unknown_environment():
 @pytest.mark.asyncio
 async def test_redis_keys_with_results():
     mock_rd = AsyncMock()
-    mock_rd.keys.return_value = ["k1", "k2"]
+    mock_rd.scan_keys.return_value = (["k1", "k2"], 0, None)
     with _patched(mock_rd):
         result = await redis_keys(pattern="test:*", environment="uat")
-    assert '"k1"' in result
-    assert '"k2"' in result
+    data = json.loads(result)
+    assert data["keys"] == ["k1", "k2"]
+    assert data["complete"] is True
+    assert data["cursor"] is None
+    mock_rd.scan_keys.assert_called_once_with(
+        "test:*", cursor=0, count=1000, type_=None, max_keys=1000, time_budget_s=2.0
+    )
+    mock_rd.keys.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_redis_keys_no_results():
     mock_rd = AsyncMock()
-    mock_rd.keys.return_value = []
+    mock_rd.scan_keys.return_value = ([], 0, None)
     with _patched(mock_rd):
         result = await redis_keys(pattern="none:*", environment="uat")
     assert result == "No keys found."
+
+
+@pytest.mark.asyncio
+async def test_redis_keys_resume_cursor_round_trip():
+    mock_rd = AsyncMock()
+    mock_rd.scan_keys.side_effect = [(["k1"], 42, "time_budget"), (["k2"], 0, None)]
+    with _patched(mock_rd):
+        first = json.loads(await redis_keys(pattern="a:*", type="hash", environment="uat"))
+        assert first["stopped"] == "time_budget"
+        second = json.loads(
+            await redis_keys(pattern="a:*", type="hash", environment="uat", cursor=first["cursor"])
+        )
+        with pytest.raises(ValueError, match="different pattern"):
+            await redis_keys(pattern="b:*", type="hash", environment="uat", cursor=first["cursor"])
+        with pytest.raises(ValueError, match="cursor"):
+            await redis_keys(environment="uat", cursor="garbage")
+    assert second["keys"] == ["k2"]
+    assert mock_rd.scan_keys.call_args.kwargs["cursor"] == 42
+    assert mock_rd.scan_keys.call_args.kwargs["type_"] == "hash"
+
+
+@pytest.mark.asyncio
+async def test_redis_keys_force_keys_refused_on_prod():
+    mock_rd = AsyncMock()
+    mock_rd.keys.return_value = ["k1"]
+    with patch("src.tools.redis.redis_clients", {"prod": mock_rd, "dev": mock_rd}):
+        with pytest.raises(ValueError, match="prod"):
+            await redis_keys(environment="prod", force_keys=True)
+        result = await redis_keys(environment="dev", pattern="k*", force_keys=True)
+    assert json.loads(result) == ["k1"]
+    mock_rd.keys.assert_called_once_with("k*")
+
+
+@pytest.mark.asyncio
+async def test_redis_inspect_keys():
+    mock_rd = AsyncMock()
+    mock_rd.inspect.return_value = {"k": {"type": "string", "value": "v"}}
+    with _patched(mock_rd):
+        result = await redis_inspect(environment="uat", keys=["k"], max_elements=5)
+    assert json.loads(result)["k"]["value"] == "v"
+    mock_rd.inspect.assert_called_once_with(["k"], 5, 4096)
+    mock_rd.scan_keys.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_redis_inspect_pattern_scans_first():
+    mock_rd = AsyncMock()
+    mock_rd.scan_keys.return_value = (["a", "b", "c"], 7, "max_keys")
+    mock_rd.inspect.return_value = {}
+    with _patched(mock_rd):
+        await redis_inspect(environment="uat", pattern="user:*", max_keys=2)
+    mock_rd.scan_keys.assert_called_once_with("user:*", max_keys=2)
+    assert mock_rd.inspect.call_args.args[0] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_redis_inspect_requires_keys_or_pattern():
+    with pytest.raises(ValueError, match="either keys or pattern"):
+        await redis_inspect(environment="uat")
+
+
+def _meta(keys):
+    return [("string", -1, 100) for _ in keys]
+
+
+@pytest.mark.asyncio
+async def test_redis_memory_report_scans_whole_keyspace():
+    mock_rd = AsyncMock()
+    mock_rd.scan_page.side_effect = [(5, ["user:1", "user:2"]), (0, ["order:1"])]
+    mock_rd.key_meta.side_effect = _meta
+    with _patched(mock_rd):
+        result = await redis_memory_report(environment="uat", depth=1)
+    data = json.loads(result)
+    assert data["complete"] is True
+    assert data["scanned_keys"] == 3
+    assert data["commands"] == 2 + 9
+    assert data["prefixes"][0] == {**data["prefixes"][0], "prefix": "user:*", "keys": 2, "bytes": 200}
+
+
+@pytest.mark.asyncio
+async def test_redis_memory_report_stops_at_key_budget():
+    mock_rd = AsyncMock()
+    mock_rd.scan_page.side_effect = [(5, ["a:1", "a:2", "a:3"]), (0, ["a:4"])]
+    mock_rd.key_meta.side_effect = _meta
+    with _patched(mock_rd):
+        result = await redis_memory_report(environment="uat", max_keys=2)
+    data = json.loads(result)
+    assert data["stopped"] == "max_keys"
+    assert data["sampled_keys"] == 2
+    mock_rd.key_meta.assert_called_once_with(["a:1", "a:2"])
+    assert mock_rd.scan_page.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_memory_report_stops_at_command_budget():
+    mock_rd = AsyncMock()
+    mock_rd.scan_page.return_value = (5, [])
+    with _patched(mock_rd):
+        result = await redis_memory_report(environment="uat", max_commands=3)
+    data = json.loads(result)
+    assert data["stopped"] == "max_commands"
+    assert mock_rd.scan_page.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_memory_report_sampling_is_deterministic():
+    keys = [f"k:{i}" for i in range(1000)]
+    sampled = []
+    for _ in range(2):
+        mock_rd = AsyncMock()
+        mock_rd.scan_page.return_value = (0, keys)
+        mock_rd.key_meta.side_effect = _meta
+        with _patched(mock_rd):
+            await redis_memory_report(environment="uat", sample_rate=0.1)
+        sampled.append(mock_rd.key_meta.call_args.args[0])
+    assert sampled[0] == sampled[1]
+    assert 50 < len(sampled[0]) < 150
+
+
+@pytest.mark.asyncio
+async def test_redis_diagnostics_all_environments_keeps_errors_apart():
+    ok = AsyncMock()
+    ok.diagnostics.return_value = {
+        None: (
+            {
+                "info": {"memory": {"used_memory": 10, "maxmemory": 100}},
+                "slowlog": [{"id": 1, "start_time": 1, "duration": 50, "command": "GET a"}],
+            },
+            {"clients": "ResponseError: unknown command"},
+        )
+    }
+    down = AsyncMock()
+    down.diagnostics.side_effect = ConnectionError("refused")
+    with patch("src.tools.redis.redis_clients", {"uat": ok, "prod": down}):
+        result = await redis_diagnostics(sections=["info", "slowlog", "clients"])
+    data = json.loads(result)
+    assert data["errors"] == {"prod": "ConnectionError: refused"}
+    uat = data["environments"]["uat"]
+    assert uat["info"]["memory"]["used_pct_of_max"] == 10.0
+    assert uat["slowlog"]["by_command"]["GET"]["count"] == 1
+    assert uat["errors"] == {"clients": "ResponseError: unknown command"}
+    ok.diagnostics.assert_called_once_with(("info", "slowlog", "clients"), ANY, 128)
+
+
+@pytest.mark.asyncio
+async def test_redis_diagnostics_rejects_unknown_section():
+    with _patched(AsyncMock()):
+        with pytest.raises(ValueError, match="sections"):
+            await redis_diagnostics(environment="uat", sections=["bogus"])
+
+
+@pytest.mark.asyncio
+async def test_redis_diagnostics_reports_cluster_per_primary():
+    mock_rd = AsyncMock()
+    mock_rd.diagnostics.return_value = {
+        "a:7000": ({"info": {"memory": {"used_memory": 1}}}, {}),
+        "b:7000": ({}, {"info.memory": "ResponseError: denied"}),
+    }
+    with _patched(mock_rd):
+        result = await redis_diagnostics(environment="uat", sections=["info"])
+    nodes = json.loads(result)["environments"]["uat"]["nodes"]
+    assert nodes["a:7000"]["info"]["memory"]["used_memory"] == 1
+    assert nodes["b:7000"] == {"errors": {"info.memory": "ResponseError: denied"}}
+
+
+@pytest.mark.asyncio
+async def test_redis_keys_cluster_cursor_round_trip():
+    mock_rd = AsyncMock()
+    mock_rd.scan_keys.return_value = (["k1"], {"a:7000": 9, "b:7000": 3}, "max_keys")
+    with _patched(mock_rd):
+        first = json.loads(await redis_keys(environment="uat", max_keys=1))
+        await redis_keys(environment="uat", cursor=first["cursor"])
+    assert mock_rd.scan_keys.call_args.kwargs["cursor"] == {"a:7000": 9, "b:7000": 3}